@@ -0,0 +1,64 @@
+"""
+`EXIF.clean_keys()` on synthetic metadata of many files with many tags, most of which are in
+its column map and some of which must be converted from ExifKeyName to exif_key_name.
+
+    PYTHONPATH=. python benchmarks/bench_clean_keys.py [--files N]
+
+To compare with an earlier revision, run the same script against a checkout of it:
+
+    git worktree add /tmp/pydoni-before <revision>
+    PYTHONPATH=/tmp/pydoni-before python benchmarks/bench_clean_keys.py
+"""
+
+import argparse
+import logging
+import pydoni
+import pydoni.sh
+import re
+import time
+
+
+def tag_names(n_mapped=250, n_unmapped=50):
+    """
+    Get tag names in the column map of `EXIF.clean_keys()`, read from its source so that the
+    same names are used in any revision, followed by names not in it.
+
+    :rtype: list
+    """
+    with open(pydoni.sh.__file__, 'r') as f:
+        src = f.read()
+
+    mapped = re.findall(r"^\s+'([A-Z][^']*)': '[^']*',?$", src, re.M)[:n_mapped]
+    unmapped = ['CustomTag{}Value'.format(i) for i in range(n_unmapped - 10)]
+    unmapped += ['XMPToolkitID{}'.format(i) for i in range(10)]
+
+    return mapped + unmapped
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n\n')[0])
+    parser.add_argument('--files', type=int, default=10000, help='number of files')
+    args = parser.parse_args()
+
+    tags = tag_names()
+    unmapped = set(tags[-50:])
+    exifd = {'/photos/IMG_{:05d}.JPG'.format(i): {tag: i for tag in tags}
+             for i in range(args.files)}
+
+    exif = pydoni.sh.EXIF.__new__(pydoni.sh.EXIF)
+    exif.logger = logging.getLogger('bench_clean_keys')
+    exif.logger.disabled = True
+
+    start = time.perf_counter()
+    cleaned = exif.clean_keys(exifd)
+    seconds = time.perf_counter() - start
+
+    unconverted = sum(1 for d in cleaned.values() if unmapped.intersection(d))
+
+    print('pydoni from: {}'.format(pydoni.__file__))
+    print('clean_keys(), {} files x {} tags: {:.2f} s'.format(args.files, len(tags), seconds))
+    print('files left with unconverted tag names: {}'.format(unconverted))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+`EXIF.clean_values()` on a synthetic dict of EXIF metadata, with DEBUG logging off and on.
+With logging off, variable logging (`ExtendedLogger.var()`/`logvars()`) should cost nothing;
+with it on, values are rendered with bounded size. Log output goes to /dev/null.
+
+    PYTHONPATH=. python benchmarks/bench_clean_values.py [--files N] [--files-debug N]
+
+To compare with an earlier revision, run the same script against a checkout of it:
+
+    git worktree add /tmp/pydoni-before <revision>
+    PYTHONPATH=/tmp/pydoni-before python benchmarks/bench_clean_values.py
+"""
+
+import argparse
+import logging
+import os
+import pydoni
+import pydoni.sh
+import time
+
+
+# Tags of each synthetic file, with values as `exiftool` prints them
+TAGS = {
+    'FileName': 'IMG_0001.JPG',
+    'Make': 'Canon',
+    'Model': 'Canon EOS 5D Mark IV',
+    'ISO': '400',
+    'FNumber': '2.8',
+    'ExposureCompensation': '+0.7',
+    'ExposureTime': '1/250',
+    'DateTimeOriginal': '2018:02:28 01:28:10',
+    'FocalLength': '35.0 mm',
+    'Flash': 'Off, Did not fire',
+}
+
+
+def run(n_files, level):
+    """
+    Time `clean_values()` on `n_files` synthetic files with the EXIF logger at `level`.
+
+    :rtype: float
+    """
+    exifd = {'/photos/IMG_{:05d}.JPG'.format(i): dict(TAGS) for i in range(n_files)}
+
+    exif = pydoni.sh.EXIF.__new__(pydoni.sh.EXIF)
+    exif.logger = pydoni.logger_setup('bench_clean_values.{}'.format(level), level)
+    for handler in exif.logger.handlers:
+        handler.setStream(open(os.devnull, 'w'))
+
+    start = time.perf_counter()
+    exif.clean_values(exifd)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n\n')[0])
+    parser.add_argument('--files', type=int, default=10000,
+                        help='number of files with logging off')
+    parser.add_argument('--files-debug', type=int, default=1000,
+                        help='number of files with DEBUG logging on')
+    args = parser.parse_args()
+
+    print('pydoni from: {}'.format(pydoni.__file__))
+    print('logging off, {} files: {:.2f} s'.format(
+        args.files, run(args.files, logging.WARNING)))
+    print('logging on,  {} files: {:.2f} s'.format(
+        args.files_debug, run(args.files_debug, logging.DEBUG)))
+
+
+if __name__ == '__main__':
+    main()
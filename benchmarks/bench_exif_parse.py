@@ -0,0 +1,131 @@
+"""
+Parse time of `exiftool` output by `EXIF.extract()`, on synthetic output for many files with
+tags in several groups. Times the parsers the running revision has: `_parse_xml()` of
+`exiftool -xmlFormat` output in revisions before JSON extraction, and `_parse_json()` of
+`exiftool -json` output, whole and in 64 KiB chunks as read from the command, after it, and
+the receiver of output streamed from an `exiftool` session where the revision has one.
+
+    PYTHONPATH=. python benchmarks/bench_exif_parse.py [--files N]
+
+To compare with an earlier revision, run the same script against a checkout of it:
+
+    git worktree add /tmp/pydoni-before <revision>
+    PYTHONPATH=/tmp/pydoni-before python benchmarks/bench_exif_parse.py
+"""
+
+import argparse
+import json
+import logging
+import pydoni
+import pydoni.sh
+import time
+
+
+GROUPS = ['System', 'File', 'EXIF', 'XMP', 'Composite', 'MakerNotes']
+TAGS_PER_GROUP = 10  # Plus 'FileName' and 'Directory' in 'System', 62 tags in total
+
+
+def records(n_files):
+    """
+    Build synthetic metadata of `n_files` files, as tuples of path and list of
+    (group, tag, value) tuples.
+
+    :rtype: list
+    """
+    out = []
+    for i in range(n_files):
+        directory, fname = '/photos/2020', 'IMG_{:05d}.JPG'.format(i)
+        tags = [('System', 'FileName', fname), ('System', 'Directory', directory)]
+        for group in GROUPS:
+            tags += [(group, '{}Tag{}'.format(group, j), 'value {} {}'.format(i, j))
+                     for j in range(TAGS_PER_GROUP)]
+
+        out.append((directory + '/' + fname, tags))
+
+    return out
+
+
+def to_xml(recs):
+    """
+    Format records as `exiftool -xmlFormat` output.
+
+    :rtype: str
+    """
+    ns = ' '.join("xmlns:{0}='http://ns.exiftool.org/{0}/1.0/'".format(g) for g in GROUPS)
+    lines = ["<?xml version='1.0' encoding='UTF-8'?>",
+             "<rdf:RDF xmlns:rdf='http://www.w3.org/1999/02/22-rdf-syntax-ns#'>"]
+
+    for path, tags in recs:
+        lines.append("<rdf:Description rdf:about='{}' {}>".format(path, ns))
+        lines += [' <{0}:{1}>{2}</{0}:{1}>'.format(g, t, v) for g, t, v in tags]
+        lines.append('</rdf:Description>')
+
+    lines.append('</rdf:RDF>')
+    return '\n'.join(lines) + '\n'
+
+
+def to_json(recs):
+    """
+    Format records as `exiftool -json` output.
+
+    :rtype: str
+    """
+    out = []
+    for path, tags in recs:
+        record = {'SourceFile': path}
+        record.update((t, v) for g, t, v in tags)
+        out.append(record)
+
+    return json.dumps(out, indent=2) + '\n'
+
+
+def timed(func, *args):
+    """
+    Time a single call.
+
+    :rtype: float
+    """
+    start = time.perf_counter()
+    result = func(*args)
+    seconds = time.perf_counter() - start
+    assert len(result) > 0
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n\n')[0])
+    parser.add_argument('--files', type=int, default=10000, help='number of files')
+    args = parser.parse_args()
+
+    recs = records(args.files)
+
+    exif = pydoni.sh.EXIF.__new__(pydoni.sh.EXIF)
+    exif.logger = pydoni.logger_setup('bench_exif_parse', logging.WARNING)
+
+    print('pydoni from: {}'.format(pydoni.__file__))
+    print('{} files, {} tags each'.format(args.files, len(recs[0][1])))
+
+    if hasattr(exif, '_parse_xml'):
+        print('_parse_xml():                 {:.2f} s'.format(timed(exif._parse_xml, to_xml(recs))))
+
+    if hasattr(exif, '_parse_json'):
+        output = to_json(recs)
+        chunks = [output[i:i + 65536] for i in range(0, len(output), 65536)]
+        print('_parse_json(), one string:    {:.2f} s'.format(timed(exif._parse_json, [output])))
+        print('_parse_json(), 64 KiB chunks: {:.2f} s'.format(timed(exif._parse_json, chunks)))
+
+    if hasattr(exif, '_json_receiver'):
+        def receive(chunks):
+            exifd, receive = exif._json_receiver()
+            for chunk in chunks:
+                receive(chunk)
+            receive(None)
+            return exifd
+
+        data = to_json(recs).encode('utf-8')
+        chunks = [data[i:i + 65536] for i in range(0, len(data), 65536)]
+        print('_json_receiver(), 64 KiB:     {:.2f} s'.format(timed(receive, chunks)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+"""
+Per-call overhead of the logger boilerplate that opens nearly every pydoni function,
+`pydoni.logger_setup(pydoni.what_is_my_name(), pydoni.modloglev)`, measured on a call of
+`pydoni.ensurelist()`, which does no other work.
+
+    PYTHONPATH=. python benchmarks/bench_logger_setup.py [--calls N]
+
+To compare with an earlier revision, run the same script against a checkout of it:
+
+    git worktree add /tmp/pydoni-before <revision>
+    PYTHONPATH=/tmp/pydoni-before python benchmarks/bench_logger_setup.py
+"""
+
+import argparse
+import pydoni
+import timeit
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n\n')[0])
+    parser.add_argument('--calls', type=int, default=20000, help='number of calls timed')
+    args = parser.parse_args()
+
+    pydoni.ensurelist('a')  # Warm up caches
+    seconds = min(timeit.repeat(lambda: pydoni.ensurelist('a'), number=args.calls, repeat=3))
+
+    print('pydoni from: {}'.format(pydoni.__file__))
+    print('ensurelist(): {:.1f} us/call ({} calls, best of 3)'.format(
+        seconds / args.calls * 1e6, args.calls))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""
+Spawn latency of a trivial command through a shell string (`pydoni.syscmd('true')`, which
+runs `/bin/sh -c`) and as an argument list without a shell (`pydoni.sh.run(['/bin/true'])`).
+
+    PYTHONPATH=. python benchmarks/bench_spawn.py [--calls N]
+"""
+
+import argparse
+import pydoni
+import pydoni.sh
+import time
+
+
+def timed(func, calls):
+    """
+    Time `calls` calls of `func`.
+
+    :return: total number of seconds
+    :rtype: float
+    """
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n\n')[0])
+    parser.add_argument('--calls', type=int, default=10000, help='number of commands run')
+    args = parser.parse_args()
+
+    paths = [
+        ("shell string via syscmd('true')", lambda: pydoni.syscmd('true')),
+        ("argv via sh.run(['/bin/true'])", lambda: pydoni.sh.run(['/bin/true'])),
+    ]
+
+    for desc, func in paths:
+        seconds = timed(func, args.calls)
+        print('{:<33} {:.2f} s, {:.0f} us/call'.format(
+            desc + ':', seconds, seconds / args.calls * 1e6))
+
+
+if __name__ == '__main__':
+    main()
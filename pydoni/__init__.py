@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 
 import pydoni
-import pydoni.vb
 import logging
 import sys
 
@@ -25,6 +24,24 @@ import sys
 
 modloglev = logging.WARN
 
+# If True, loggers created by `logger_setup()` hand records to a queue, and a background thread
+# formats and writes them to the console
+modlogqueue = False
+
+# Submodules, imported on first attribute access (i.e. `pydoni.sh`) by `__getattr__()` so that
+# `import pydoni` does not pay for importing all of them
+_submodules = (
+    'api', 'audio', 'cache', 'classes', 'db', 'governor', 'image', 'memprof', 'metrics', 'os',
+    'scripts', 'sh', 'sink', 'trace', 'vb', 'watchdog', 'web')
+
+# Caches used by `what_is_my_name()` and `logger_setup()`, which are called at the top of
+# nearly every function in the module
+_caller_name_cache = {}
+_logger_cache = {}
+
+# Queue handlers shared by all queued loggers with the same formatter, see `_queue_handler()`
+_queue_handlers = {}
+
 # Module classes -----------------------------------------------------------------------------------
 
 class ExtendedLogger(logging.Logger):
@@ -43,13 +60,42 @@ class ExtendedLogger(logging.Logger):
 
         self._count = 0
         self._countLock = threading.Lock()
+        self._samples = {}
 
         return super(ExtendedLogger, self).__init__(name, level)
 
+    # Limits applied when rendering values logged with `.var()`. Override on the class to
+    # change them for every logger, or call `.set_var_limits()` on a single logger
+    var_maxdepth = 3
+    var_maxlen = 20
+    var_maxbytes = 2048
+
+    def set_var_limits(self, maxdepth=None, maxlen=None, maxbytes=None):
+        """
+        Set the limits used to render values logged with `.var()` on this logger.
+
+        :param maxdepth: maximum nesting depth rendered for containers
+        :type maxdepth: int
+        :param maxlen: maximum number of items rendered per container
+        :type maxlen: int
+        :param maxbytes: maximum size of the rendered value in bytes
+        :type maxbytes: int
+        """
+        if maxdepth is not None:
+            self.var_maxdepth = maxdepth
+        if maxlen is not None:
+            self.var_maxlen = maxlen
+        if maxbytes is not None:
+            self.var_maxbytes = maxbytes
+
     def var(self, varname, value, include_modules=True, include_extended_logger=True):
         """
         Extend .debug() method to log variable names, dtypes and values in shorthand.
 
+        Nothing is rendered unless DEBUG is enabled for this logger, and the value is only
+        rendered once a handler actually emits the record, bounded by `var_maxdepth`,
+        `var_maxlen` and `var_maxbytes`.
+
         :param varname: name of variable to log
         :type varname: str
         :param value: variable to log
@@ -61,9 +107,10 @@ class ExtendedLogger(logging.Logger):
         :return: debug message
         :rtype: logging.logger.debug
         """
+        if not self.isEnabledFor(logging.DEBUG):
+            return None
+
         dtype = value.__class__.__name__
-        value = str(value)
-        msg = 'Var {varname} {{{dtype}}}: {value}'.format(**locals())
 
         if dtype == 'module' and not include_modules:
             return None
@@ -71,7 +118,8 @@ class ExtendedLogger(logging.Logger):
         if 'ExtendedLogger' in dtype and not include_extended_logger:
             return None
 
-        return super(ExtendedLogger, self).debug(msg)
+        value = _BoundedRepr(value, self.var_maxdepth, self.var_maxlen, self.var_maxbytes)
+        return super(ExtendedLogger, self).debug('Var %s {%s}: %s', varname, dtype, value)
 
     def logvars(self, var_dict):
         """
@@ -80,27 +128,421 @@ class ExtendedLogger(logging.Logger):
         :param var_dict: dictionary of varname: value pairs, may be output of `locals()`
         :type var_dict: dict
         """
+        if not self.isEnabledFor(logging.DEBUG):
+            return None
+
         for varname, value in var_dict.items():
             self.var(varname, value, include_modules=False, include_extended_logger=False)
 
 
+    def sample(self, msg, *args, level=logging.INFO, first=10, interval=1.0, key=None):
+        """
+        Log a message repeated once per item in a loop at a bounded rate. The first `first`
+        occurrences are logged as usual, then at most one per `interval` seconds, suffixed with
+        the number of occurrences collapsed into it and their throughput. Occurrences are
+        grouped by `key`, which defaults to the unformatted message.
+
+        :param msg: message, formatted with `args` as in `.info()`
+        :type msg: str
+        :param level: logging level
+        :type level: int
+        :param first: number of occurrences logged before sampling starts
+        :type first: int
+        :param interval: minimum number of seconds between logged occurrences once sampling
+        :type interval: float
+        :param key: [optional] key to group occurrences by
+        :type key: hashable
+        """
+        if self.isEnabledFor(level):
+            self._sampled(level, msg, args, key, first, interval, None)
+
+    def every(self, n, msg, *args, level=logging.INFO, key=None):
+        """
+        Log the first and then every `n`th occurrence of a message repeated once per item in a
+        loop, suffixed with the number of occurrences collapsed into it and their throughput.
+
+        :param n: log one in every `n` occurrences
+        :type n: int
+        :param msg: message, formatted with `args` as in `.info()`
+        :type msg: str
+        :param level: logging level
+        :type level: int
+        :param key: [optional] key to group occurrences by, defaults to the unformatted message
+        :type key: hashable
+        """
+        if self.isEnabledFor(level):
+            self._sampled(level, msg, args, key, 1, None, n)
+
+    def _sampled(self, level, msg, args, key, first, interval, n):
+        """
+        Count an occurrence for `.sample()` or `.every()` and log it if it is due.
+        """
+        import time
+
+        key = msg if key is None else key
+        now = time.monotonic()
+
+        with self._countLock:
+            state = self._samples.get(key)
+            if state is None:
+                if not self._samples:
+                    import atexit
+                    atexit.register(self.flush_samples)
+
+                # [level, msg, args, total occurrences, occurrences since last logged,
+                #  time last logged]
+                state = self._samples[key] = [level, msg, args, 0, 0, now]
+
+            state[2] = args
+            state[3] += 1
+            state[4] += 1
+            total, pending, since = state[3], state[4], now - state[5]
+
+            if total <= first:
+                due = True
+            elif n is not None:
+                due = pending >= n
+            else:
+                due = since >= interval
+
+            if not due:
+                return None
+
+            state[4] = 0
+            state[5] = now
+
+        if total <= first:
+            return self._log(level, msg, args)
+
+        return self._log(level, msg + ' [%d occurrences in %.2fs, %.1f/s, %d total]',
+                         args + (pending, since, pending / since if since else 0, total))
+
+    def flush_samples(self):
+        """
+        Log a summary for each sampled message with occurrences that have not been logged yet.
+        Called automatically at interpreter exit.
+        """
+        import time
+
+        now = time.monotonic()
+        with self._countLock:
+            pending = [(state[0], state[1], state[2], state[3], state[4], now - state[5])
+                       for state in self._samples.values() if state[4]]
+            for state in self._samples.values():
+                state[4] = 0
+                state[5] = now
+
+        for level, msg, args, total, count, since in pending:
+            summary = ' [%d more occurrences not logged in %.2fs, %.1f/s, %d total]'
+            self._log(level, msg + summary,
+                      args + (count, since, count / since if since else 0, total))
+
+
+class _BoundedRepr(object):
+    """
+    Render a value as a string of bounded size only when it is formatted, so that log records
+    that are never emitted never pay for rendering.
+
+    :param value: value to render
+    :type value: any
+    :param maxdepth: maximum nesting depth rendered for containers
+    :type maxdepth: int
+    :param maxlen: maximum number of items rendered per container
+    :type maxlen: int
+    :param maxbytes: maximum size of the rendered value in bytes
+    :type maxbytes: int
+    """
+
+    __slots__ = ('value', 'maxdepth', 'maxlen', 'maxbytes')
+
+    def __init__(self, value, maxdepth, maxlen, maxbytes):
+        self.value = value
+        self.maxdepth = maxdepth
+        self.maxlen = maxlen
+        self.maxbytes = maxbytes
+
+    def __str__(self):
+        import reprlib
+
+        if isinstance(self.value, str):
+            rendered = self.value
+        else:
+            r = reprlib.Repr()
+            r.maxlevel = self.maxdepth
+            r.maxdict = r.maxlist = r.maxtuple = r.maxset = self.maxlen
+            r.maxfrozenset = r.maxdeque = r.maxarray = self.maxlen
+            r.maxstring = r.maxother = r.maxlong = self.maxbytes
+            rendered = r.repr(self.value)
+
+        encoded = rendered.encode('utf-8', errors='replace')
+        if len(encoded) > self.maxbytes:
+            rendered = encoded[:self.maxbytes].decode('utf-8', errors='ignore') \
+                + '... [{} bytes truncated]'.format(len(encoded) - self.maxbytes)
+
+        return rendered
+
+
+class _LazyColoredFormatter(logging.Formatter):
+    """
+    Formatter that defers importing `colorlog` and building its `ColoredFormatter` until the
+    first record is actually formatted, as most pydoni loggers never emit a record.
+
+    :param fmt: format string, may contain `%(log_color)s`
+    :type fmt: str
+    """
+
+    def __init__(self, fmt):
+        super(_LazyColoredFormatter, self).__init__(fmt)
+        self._formatter = None
+
+    def format(self, record):
+        if self._formatter is None:
+            from colorlog import ColoredFormatter
+            self._formatter = ColoredFormatter(self._fmt)
+
+        return self._formatter.format(record)
+
+
+class SysCmdStream(object):
+    """
+    Run a command and iterate over its output as it is produced, without buffering all of it
+    in memory. Use through `syscmd_stream()`.
+
+    stdout, stderr and stdin are serviced together with `selectors`, so the command can never
+    block on a full pipe. The command runs in its own process group, which is killed if
+    `timeout` is exceeded or if iteration stops before the command exits.
+
+    After iteration, `returncode` holds the command's exit status and `stderr` its captured
+    standard error (unless `merge_stderr` is True, in which case it is part of the output).
+
+    :param cmd: command string run through the shell, or list of arguments run without one
+    :type cmd: str, list
+    :param mode: 'lines' to yield output line by line, 'chunks' to yield it as read
+    :type mode: str
+    :param timeout: [optional] number of seconds after which the command is killed and
+                    `subprocess.TimeoutExpired` is raised
+    :type timeout: float
+    :param merge_stderr: interleave stderr with stdout instead of capturing it separately
+    :type merge_stderr: bool
+    :param input: [optional] data written to the command's stdin, which is otherwise
+                  connected to /dev/null
+    :type input: bytes, str
+    :param encoding: [optional] decode output (and encode `input`) with this encoding
+    :type encoding: str
+    :param chunk_size: maximum number of bytes read at once
+    :type chunk_size: int
+    :param cwd: [optional] directory to run the command in
+    :type cwd: str
+    """
+
+    def __init__(self,
+                 cmd,
+                 mode='lines',
+                 timeout=None,
+                 merge_stderr=False,
+                 input=None,
+                 encoding=None,
+                 chunk_size=65536,
+                 cwd=None):
+
+        assert mode in ['lines', 'chunks']
+
+        self.cmd = cmd
+        self.mode = mode
+        self.timeout = timeout
+        self.merge_stderr = merge_stderr
+        self.input = input.encode(encoding or 'utf-8') if isinstance(input, str) else input
+        self.encoding = encoding
+        self.chunk_size = chunk_size
+        self.cwd = cwd
+
+        self.returncode = None
+        self.stderr = None
+        self.bytes_read = 0
+        self._started = False
+
+    def __iter__(self):
+        if self._started:
+            raise Exception('SysCmdStream can only be iterated over once')
+
+        self._started = True
+        return self._run()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        return False
+
+    def _run(self):
+        """
+        Start the command and yield its output.
+        """
+        import codecs
+        import os
+        import selectors
+        import subprocess
+        import time
+
+        lease = pydoni.governor.acquire(pydoni.governor.weight_of(self.cmd))
+
+        start = time.perf_counter()
+        deadline = start + self.timeout if self.timeout is not None else None
+
+        span = pydoni.trace.span('syscmd', cmd=self.cmd)
+        span.__enter__()
+
+        try:
+            p = subprocess.Popen(
+                self.cmd,
+                shell             = isinstance(self.cmd, str),
+                stdin             = subprocess.PIPE if self.input is not None else subprocess.DEVNULL,
+                stdout            = subprocess.PIPE,
+                stderr            = subprocess.STDOUT if self.merge_stderr else subprocess.PIPE,
+                close_fds         = True,
+                start_new_session = True,
+                cwd               = self.cwd)
+        except BaseException as e:
+            lease.release()
+            span.__exit__(type(e), e, e.__traceback__)
+            raise
+
+        decoder = codecs.getincrementaldecoder(self.encoding)('replace') if self.encoding else None
+        stderr_chunks = []
+        pending = b''
+
+        sel = selectors.DefaultSelector()
+        sel.register(p.stdout, selectors.EVENT_READ)
+        if not self.merge_stderr:
+            sel.register(p.stderr, selectors.EVENT_READ)
+        if self.input is not None:
+            if self.input:
+                os.set_blocking(p.stdin.fileno(), False)
+                sel.register(p.stdin, selectors.EVENT_WRITE)
+                input_view = memoryview(self.input)
+                input_offset = 0
+            else:
+                p.stdin.close()
+
+        try:
+            while sel.get_map():
+                wait = None
+                if deadline is not None:
+                    wait = deadline - time.perf_counter()
+                    if wait <= 0:
+                        raise subprocess.TimeoutExpired(self.cmd, self.timeout)
+
+                for key, events in sel.select(wait):
+                    if key.fileobj is p.stdin:
+                        try:
+                            input_offset += os.write(
+                                p.stdin.fileno(), input_view[input_offset:input_offset + 65536])
+                        except BrokenPipeError:
+                            input_offset = len(input_view)
+
+                        if input_offset >= len(input_view):
+                            sel.unregister(p.stdin)
+                            p.stdin.close()
+
+                        continue
+
+                    data = os.read(key.fd, self.chunk_size)
+                    if not data:
+                        sel.unregister(key.fileobj)
+                        continue
+
+                    if key.fileobj is p.stderr:
+                        stderr_chunks.append(data)
+                        continue
+
+                    self.bytes_read += len(data)
+
+                    if self.mode == 'chunks':
+                        yield decoder.decode(data) if decoder else data
+                        continue
+
+                    pending += data
+                    if b'\n' in pending:
+                        lines = pending.split(b'\n')
+                        pending = lines.pop()
+                        for line in lines:
+                            line += b'\n'
+                            yield decoder.decode(line) if decoder else line
+
+            if pending:
+                yield decoder.decode(pending, final=True) if decoder else pending
+            elif decoder:
+                tail = decoder.decode(b'', final=True)
+                if tail:
+                    yield tail
+
+            if deadline is not None:
+                self.returncode = p.wait(max(deadline - time.perf_counter(), 0))
+            else:
+                self.returncode = p.wait()
+
+        finally:
+            sel.close()
+
+            if p.returncode is None:
+                # Timed out, failed or abandoned by the caller before the command exited
+                _killpg(p)
+
+            lease.release()
+
+            for f in (p.stdin, p.stdout, p.stderr):
+                if f is not None:
+                    f.close()
+
+            stderr = b''.join(stderr_chunks)
+            self.stderr = stderr.decode(self.encoding, errors='replace') if self.encoding \
+                else stderr
+
+            span.set(returncode=p.returncode)
+            span.__exit__(None, None, None)
+
+            pydoni.metrics.incr('subprocess_spawned_total')
+            pydoni.metrics.incr('subprocess_seconds_total', time.perf_counter() - start)
+            pydoni.metrics.incr('subprocess_stdout_bytes_total', self.bytes_read)
+
+
 # Module functions ---------------------------------------------------------------------------------
 
+def __getattr__(name):
+    """
+    Import submodules lazily on first access (PEP 562).
+    """
+    if name in _submodules:
+        import importlib
+        return importlib.import_module('pydoni.' + name)
+
+    raise AttributeError("module 'pydoni' has no attribute '{}'".format(name))
+
+
 def what_is_my_name(classname=None, with_modname=True):
     """
     Return name of function that calls this function. If called from a
     classmethod, include classname before classmethod in output string.
 
+    The caller is looked up with `sys._getframe()` rather than `inspect.stack()`, and the
+    resulting name is cached per code object, so repeated calls from the same function
+    cost a single dictionary lookup.
+
     :param with_modname {bool} -- append module name to beginning of function name (True)
     :return: {str}
     """
-    import inspect
+    frame = sys._getframe(1)
+    key = (frame.f_code, classname, with_modname)
+
+    name = _caller_name_cache.get(key)
+    if name is not None:
+        return name
 
     lst = []
-    funcname = inspect.stack()[1][3]
+    funcname = frame.f_code.co_name
 
     if with_modname:
-        modulename = inspect.getmodule(inspect.stack()[1][0]).__name__
+        modulename = frame.f_globals.get('__name__')
         if modulename != '__main__':
             lst += [modulename]
 
@@ -108,40 +550,102 @@ def what_is_my_name(classname=None, with_modname=True):
         lst += [classname]
 
     lst += [funcname]
-    return '.'.join(lst)
+    name = '.'.join(lst)
+
+    _caller_name_cache[key] = name
+    return name
 
 
-def logger_setup(name='root', level=modloglev, colorized=True, equal_width=False):
+def logger_setup(name='root', level=modloglev, colorized=True, equal_width=False, queued=None):
     """
-    Define an identical logger object for all pydoni submodules.
+    Define an identical logger object for all pydoni submodules. Loggers are cached on
+    their setup arguments, so only the first call for a given name does any work.
+
+    :param name: name of logger
+    :type name: str
+    :param level: logging level
+    :type level: int
+    :param colorized: colorize console output
+    :type colorized: bool
+    :param equal_width: pad level names to equal width
+    :type equal_width: bool
+    :param queued: hand records to a queue consumed by a background thread, which formats and
+                   writes them to the console. Defaults to `pydoni.modlogqueue`
+    :type queued: bool
     """
     import logging
 
+    if queued is None:
+        queued = modlogqueue
+
+    key = (name, level, colorized, equal_width, queued)
+    logger = _logger_cache.get(key)
+    if logger is not None:
+        return logger
+
     logging.setLoggerClass(ExtendedLogger)
     logger = logging.getLogger(name)
 
     if not logger.handlers:
         if colorized:
-            from colorlog import ColoredFormatter
             logger_fmt = '%(log_color)s%(asctime)s : %(levelname)s : %(name)s : %(message)s'
 
             if equal_width:
                 logger_fmt = logger_fmt.replace('levelname)s', 'levelname)-8s')
 
-            formatter = ColoredFormatter(logger_fmt)
+            formatter = _LazyColoredFormatter(logger_fmt)
         else:
             logger_fmt = '%(asctime)s : %(levelname)-8s : %(name)s : %(message)s'
             formatter = logging.Formatter(logger_fmt)
 
-        handler = logging.StreamHandler()
-        handler.setFormatter(formatter)
+        if queued:
+            handler = _queue_handler((colorized, equal_width), formatter)
+        else:
+            handler = logging.StreamHandler()
+            handler.setFormatter(formatter)
 
         logger.addHandler(handler)
         logger.setLevel(level)
 
+    _logger_cache[key] = logger
     return logger
 
 
+def _queue_handler(formatter_key, formatter):
+    """
+    Get the `QueueHandler` shared by all queued loggers using the same formatter, starting its
+    `QueueListener` on first use. The listener is stopped at interpreter exit, which writes
+    out any records still in the queue.
+
+    Only merging the message with its arguments happens in the logging thread, in
+    `QueueHandler.prepare()`. Formatting with `formatter` and console I/O happen on the
+    listener's thread.
+
+    :param formatter_key: hashable description of `formatter`
+    :type formatter_key: tuple
+    :param formatter: formatter used by the console handler behind the queue
+    :type formatter: logging.Formatter
+    :rtype: logging.handlers.QueueHandler
+    """
+    import atexit
+    import queue
+    from logging.handlers import QueueHandler, QueueListener
+
+    handler = _queue_handlers.get(formatter_key)
+    if handler is None:
+        stream = logging.StreamHandler()
+        stream.setFormatter(formatter)
+
+        q = queue.SimpleQueue()
+        listener = QueueListener(q, stream, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+
+        handler = _queue_handlers[formatter_key] = QueueHandler(q)
+
+    return handler
+
+
 def colorized_logger(name='root', level='info'):
     """
     Pydoni logger with Jupyter-style colorized timestamp and logging level.
@@ -161,40 +665,31 @@ def colorized_logger(name='root', level='info'):
     log.addHandler(stream)
 
 
-def syscmd(cmd, encoding=''):
+def syscmd(cmd, encoding='', timeout=None):
     """
     Runs a command on the system, waits for the command to finish, and then
     returns the text output of the command. If the command produces no text
     output, the command's return code will be returned instead.
 
-    :param cmd: command string to execute
-    :type cmd: str
+    :param cmd: command string to execute through the shell, or list of arguments to execute
+                without one (see `pydoni.sh.run()`)
+    :type cmd: str, list
     :param encoding: [optional] name of decoding to decode output bytestring with
     :type encoding: str
+    :param timeout: [optional] number of seconds after which the command is killed and
+                    `subprocess.TimeoutExpired` is raised
+    :type timeout: float
     :return: interned system output {str}, or returncode {int}
     :rtype: str or int
     """
-
-    import subprocess
-
     logger = pydoni.logger_setup(pydoni.what_is_my_name(), pydoni.modloglev)
     logger.logvars(locals())
 
-    p = subprocess.Popen(
-        cmd,
-        shell     = True,
-        stdin     = subprocess.PIPE,
-        stdout    = subprocess.PIPE,
-        stderr    = subprocess.STDOUT,
-        close_fds = True)
-
-    logger.debug('Waiting...')
-    p.wait()
-    logger.debug('The Waiting is the hardest part')
-    output = p.stdout.read()
+    stream = syscmd_stream(cmd, mode='chunks', timeout=timeout, merge_stderr=True)
+    output = b''.join(stream)
 
     logger.var('output', output)
-    logger.var('p.returncode', p.returncode)
+    logger.var('stream.returncode', stream.returncode)
 
     if len(output) > 1:
         if encoding:
@@ -202,7 +697,334 @@ def syscmd(cmd, encoding=''):
         else:
             return output
 
-    return p.returncode
+    return stream.returncode
+
+
+async def syscmd_async(cmd, encoding='', timeout=None):
+    """
+    Coroutine equivalent of `syscmd()`, built on `pydoni.sh.run_async()`: the event loop is
+    not blocked while the command runs, cancelling the awaiting task kills the command, and
+    the number of concurrent commands is limited by `pydoni.sh.set_async_limit()`.
+
+    :param cmd: command string to execute with `/bin/sh -c`, or list of arguments to execute
+                without a shell
+    :type cmd: str, list
+    :param encoding: [optional] name of decoding to decode output bytestring with
+    :type encoding: str
+    :param timeout: [optional] number of seconds after which the command is killed and
+                    `subprocess.TimeoutExpired` is raised
+    :type timeout: float
+    :return: interned system output {str}, or returncode {int}
+    :rtype: str or int
+    """
+    argv = ['/bin/sh', '-c', cmd] if isinstance(cmd, str) else cmd
+    res = await pydoni.sh.run_async(argv, timeout=timeout, merge_stderr=True)
+
+    if len(res.stdout) > 1:
+        if encoding:
+            return res.stdout.decode(encoding)
+        else:
+            return res.stdout
+
+    return res.returncode
+
+
+def syscmd_stream(cmd,
+                  mode='lines',
+                  timeout=None,
+                  merge_stderr=False,
+                  input=None,
+                  encoding=None,
+                  chunk_size=65536,
+                  cwd=None):
+    """
+    Run a command and iterate over its output line by line (or chunk by chunk) as it is
+    produced. stderr is captured separately, the command is killed with its whole process
+    group on timeout, and no pipe can fill up and deadlock the command.
+
+    Example:
+
+        stream = pydoni.syscmd_stream(['exiftool', '-r', '-json', 'photos'], timeout=600)
+        for line in stream:
+            ...
+        stream.returncode, stream.stderr
+
+    :param cmd: command string run through the shell, or list of arguments run without one
+    :type cmd: str, list
+    :param mode: 'lines' to yield output line by line, 'chunks' to yield it as read
+    :type mode: str
+    :param timeout: [optional] number of seconds after which the command is killed and
+                    `subprocess.TimeoutExpired` is raised
+    :type timeout: float
+    :param merge_stderr: interleave stderr with stdout instead of capturing it separately
+    :type merge_stderr: bool
+    :param input: [optional] data written to the command's stdin, which is otherwise
+                  connected to /dev/null
+    :type input: bytes, str
+    :param encoding: [optional] decode output (and encode `input`) with this encoding,
+                     otherwise output is yielded as bytes
+    :type encoding: str
+    :param chunk_size: maximum number of bytes read at once
+    :type chunk_size: int
+    :param cwd: [optional] directory to run the command in
+    :type cwd: str
+    :return: iterable over output, holding `returncode` and `stderr` once exhausted
+    :rtype: SysCmdStream
+    """
+    return SysCmdStream(cmd,
+                        mode=mode,
+                        timeout=timeout,
+                        merge_stderr=merge_stderr,
+                        input=input,
+                        encoding=encoding,
+                        chunk_size=chunk_size,
+                        cwd=cwd)
+
+
+def syscmd_many(cmds,
+                workers=None,
+                timeout=None,
+                encoding=None,
+                merge_stderr=False,
+                stop_on_error=False,
+                progress=False,
+                min_free_memory=256 * 1024 ** 2):
+    """
+    Run many independent commands with a bounded number of concurrent workers, and collect
+    their results in input order.
+
+    A command fails if it exits non-zero or cannot be run at all (i.e. its binary is missing
+    or it timed out). All commands are run regardless of failures, unless `stop_on_error` is
+    True, in which case no further commands are started after the first failure (commands
+    already running are left to finish).
+
+    New commands are held back while the system's available memory is below
+    `min_free_memory`, as long as at least one command is still running, so that a batch of
+    memory-hungry commands (i.e. `ffmpeg`) does not push the machine into swap.
+
+    Example:
+
+        results = pydoni.syscmd_many([[ffmpeg, '-i', f, ...] for f in files], progress=True)
+        failed = [r for r in results if not isinstance(r, subprocess.CompletedProcess)
+                  or r.returncode != 0]
+
+    :param cmds: commands to run, each a list of arguments run without a shell (see
+                 `pydoni.sh.run()`), or a string run with `/bin/sh -c`
+    :type cmds: list
+    :param workers: [optional] maximum number of commands running at once, defaults to the
+                    number of CPUs
+    :type workers: int
+    :param timeout: [optional] number of seconds after which each command is killed
+    :type timeout: float
+    :param encoding: [optional] name of encoding to decode output with
+    :type encoding: str
+    :param merge_stderr: return standard error interleaved with standard output
+    :type merge_stderr: bool
+    :param stop_on_error: stop starting commands after the first failure
+    :type stop_on_error: bool
+    :param progress: print tqdm progress bar
+    :type progress: bool
+    :param min_free_memory: [optional] number of bytes of available memory below which new
+                            commands are held back, None to never hold them back
+    :type min_free_memory: int
+    :return: one item per command, in input order: a `subprocess.CompletedProcess` if the
+             command ran, the exception raised if it could not be run, or None if it was not
+             started because of `stop_on_error`
+    :rtype: list
+    """
+    import concurrent.futures
+    import os
+    import subprocess
+
+    logger = pydoni.logger_setup(pydoni.what_is_my_name(), pydoni.modloglev)
+    logger.logvars(locals())
+
+    cmds = list(cmds)
+    workers = workers or os.cpu_count() or 1
+    assert workers > 0
+
+    def run_one(cmd):
+        argv = ['/bin/sh', '-c', cmd] if isinstance(cmd, str) else cmd
+        return pydoni.sh.run(argv, timeout=timeout, encoding=encoding, merge_stderr=merge_stderr)
+
+    results = [None] * len(cmds)
+    running = {}
+    next_idx = 0
+    n_failed = 0
+    stopped = False
+
+    if progress:
+        from tqdm import tqdm
+        pbar = tqdm(total=len(cmds), unit='cmd')
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        while running or (next_idx < len(cmds) and not stopped):
+            throttled = False
+            while next_idx < len(cmds) and not stopped and len(running) < workers:
+                if running and _memory_below(min_free_memory):
+                    throttled = True
+                    logger.sample('Holding back commands, available memory below %s',
+                                  pydoni.human_filesize(min_free_memory), level=logging.WARNING)
+                    break
+
+                running[executor.submit(run_one, cmds[next_idx])] = next_idx
+                next_idx += 1
+
+            done, _ = concurrent.futures.wait(running,
+                                              timeout=0.25 if throttled else None,
+                                              return_when=concurrent.futures.FIRST_COMPLETED)
+
+            for future in done:
+                idx = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = e
+
+                results[idx] = result
+
+                if not isinstance(result, subprocess.CompletedProcess) or result.returncode != 0:
+                    n_failed += 1
+                    logger.error('Command failed: %s (%s)', cmds[idx],
+                                 result if isinstance(result, Exception)
+                                 else 'exit status {}'.format(result.returncode))
+                    if stop_on_error:
+                        stopped = True
+
+                if progress:
+                    pbar.update(1)
+
+    if progress:
+        pbar.close()
+
+    logger.info('Ran %s of %s commands with %s workers, %s failed',
+                next_idx, len(cmds), workers, n_failed)
+
+    return results
+
+
+def _memory_below(nbytes):
+    """
+    Check whether the system's available memory is below a number of bytes. Always False if
+    `nbytes` is None, or where available memory cannot be read, in which case a warning is
+    logged once.
+
+    :param nbytes: number of bytes
+    :type nbytes: int
+    :rtype: bool
+    """
+    if nbytes is None:
+        return False
+
+    available = _available_memory()
+    if available is None:
+        if not _memory_unknown_warned:
+            _warn_memory_unknown()
+        return False
+
+    return available < nbytes
+
+
+# Time and result of the last `_available_memory()` read on macOS, which runs `vm_stat`
+_vm_stat_last = [None, None]
+_memory_unknown_warned = False
+
+
+def _available_memory():
+    """
+    Get the system's available memory in bytes, from /proc/meminfo on Linux, or `vm_stat` on
+    macOS (at most once a second) as free, inactive and speculative pages.
+
+    :return: number of bytes, or None if it cannot be read
+    :rtype: int
+    """
+    import subprocess
+    import time
+
+    try:
+        with open('/proc/meminfo', 'r') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+
+    if sys.platform != 'darwin':
+        return None
+
+    now = time.monotonic()
+    if _vm_stat_last[0] is not None and now - _vm_stat_last[0] < 1:
+        return _vm_stat_last[1]
+
+    # Not run through `sh.run()`, so that it does not wait for governor tokens held by the
+    # commands it is throttling
+    try:
+        out = subprocess.run(['/usr/bin/vm_stat'], stdout=subprocess.PIPE,
+                             stderr=subprocess.DEVNULL, universal_newlines=True, timeout=5).stdout
+        available = _parse_vm_stat(out)
+    except (OSError, subprocess.SubprocessError):
+        available = None
+
+    _vm_stat_last[:] = [now, available]
+    return available
+
+
+def _parse_vm_stat(out):
+    """
+    Get available memory in bytes from the output of macOS `vm_stat`, i.e.
+
+        Mach Virtual Memory Statistics: (page size of 16384 bytes)
+        Pages free:                               12345.
+        Pages inactive:                          234567.
+        Pages speculative:                         3456.
+
+    :param out: output of `vm_stat`
+    :type out: str
+    :return: number of bytes, or None if the output is not recognized
+    :rtype: int
+    """
+    import re
+
+    page_size = re.search(r'page size of (\d+) bytes', out)
+    pages = dict(re.findall(r'^Pages (free|inactive|speculative):\s+(\d+)\.', out, re.MULTILINE))
+    if not page_size or 'free' not in pages:
+        return None
+
+    return sum(int(n) for n in pages.values()) * int(page_size.group(1))
+
+
+def _warn_memory_unknown():
+    """
+    Log once that `min_free_memory` of `syscmd_many()` cannot be enforced on this system.
+    """
+    global _memory_unknown_warned
+    _memory_unknown_warned = True
+
+    logger = pydoni.logger_setup(pydoni.what_is_my_name(), pydoni.modloglev)
+    logger.warning('Cannot read available memory on this system (%s), commands are not held '
+                   'back by `min_free_memory`', sys.platform)
+
+
+def _killpg(p):
+    """
+    Kill the process group of a process started with `start_new_session=True`, and reap the
+    process.
+
+    :param p: process to kill
+    :type p: subprocess.Popen
+    """
+    import os
+    import signal
+
+    try:
+        os.killpg(p.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+    except AttributeError:
+        # No process groups on this platform
+        p.kill()
+
+    p.wait()
 
 
 def listfiles(
@@ -1117,7 +1939,6 @@ def test(value, dtype, return_coerced_value=False, assertion=False):
     # Test float
     elif dtype == 'float':
         if isinstance(value, float) or isinstance(value, int):
-            import pdb; pdb.set_trace()
             coerced_value = float(value)
         elif '.' in str(value):
             try:
@@ -1518,10 +2339,21 @@ def dirsize(start_path='.'):
 def pydonicli_register(var_dict):
     """
     Register variable as a part of the 'pydoni' module to be logged to the CLI's backend.
+    Registering a `result` also registers the current `pydoni.metrics` counters as
+    `pydonicli_metrics`. A `pydoni.sink.ResultSink` registered as `result` is flushed, and its
+    summary registered as `pydonicli_result_summary`. Registered values are not modified.
     """
     for key, value in var_dict.items():
         setattr(pydoni, 'pydonicli_' + key, value)
 
+    if 'result' in var_dict:
+        result = var_dict['result']
+        if isinstance(result, pydoni.sink.ResultSink):
+            result.flush()
+            pydoni.pydonicli_result_summary = result.summary()
+
+        pydoni.pydonicli_metrics = pydoni.metrics.snapshot()
+
 
 def pydonicli_declare_args(var_dict):
     """
@@ -1534,3 +2366,18 @@ def pydonicli_declare_args(var_dict):
             vars_only[k] = v
 
     return vars_only
+
+
+def _load_from_environment():
+    """
+    Import the submodules started by environment variables, which would otherwise only be
+    loaded on first use. Each starts itself from the environment as it is imported.
+    """
+    import os
+
+    if os.environ.get('PYDONI_WATCHDOG'):
+        # Must be running before the first span to watch it
+        import pydoni.watchdog
+
+
+_load_from_environment()
@@ -1,6 +1,6 @@
 import pydoni
-import pydoni.os
-import pydoni.web
+import pydoni.memprof
+import pydoni.trace
 
 
 class Audio:
@@ -187,8 +187,10 @@ class Song(object):
         self.fname_rgx = r'^(\d+)\s*(.*?)\s*-\s*(.*?)(\.mp3)$'  # "01 Elvis Presley - Hound Dog.mp3"
         self.fname_rgx2 = r'^(\d+)\s*-?\s*(.*?)(\.mp3)$' # "01 - Hound Dog.mp3" OR "01 Hound Dog.mp3"
 
-        # Run `exiftool` on music file
-        self.exif = pydoni.sh.EXIF(fname).extract()
+        # Run `exiftool` on music file, extracting only the tags used below
+        exifd = pydoni.sh.EXIF(fname).extract(
+            tags=['Title', 'Artist', 'Album', 'Track', 'PartOfSet', 'Genre', 'Picture'])
+        self.exif = list(exifd.values())[0] if exifd else {}
 
         # Extract song-specific data
         self.title     = self.__get_song_title__()
@@ -230,7 +232,7 @@ class Song(object):
         """
 
         if 'part_of_set' in self.exif.keys():
-            return self.exif['part_of_set']
+            return str(self.exif['part_of_set'])
         else:
             return None
 
@@ -385,7 +387,7 @@ class Song(object):
 
         # First check EXIF metadata
         if 'artist' in self.exif.keys():
-            val = self.exif['artist']
+            val = str(self.exif['artist'])
         elif re.match(self.fname_rgx, self.fname):
             val = re.sub(self.fname_rgx, r'\2', self.fname).strip()
         else:
@@ -440,14 +442,16 @@ class Song(object):
         Apply general cleaning methods to any of the EXIF metadata attributes: artist,
         title, album, genre.
 
-        :param val: value to clean
-        :type val: str
+        :param val: value to clean, numeric-looking values such as '1989' are extracted as int
+        :type val: str, int, float
         :return: str
         """
 
         import re
         from titlecase import titlecase
 
+        val = str(val)
+
         # Keep words that are all uppercase, generally acronyms. Titlecase will
         # convert all letters besides the first to lowercase
         keep_capital = [i for i, item in enumerate(val.split(' ')) if \
@@ -527,6 +531,8 @@ class Album(object):
     :type valid_ext: list
     """
 
+    @pydoni.trace.traced()
+    @pydoni.memprof.profiled()
     def __init__(self, dpath, valid_ext=['.mp3', '.flac']):
 
         import os
@@ -0,0 +1,531 @@
+"""
+Memoize results of deterministic probe commands and of wrapper functions annotated as
+cacheable, keyed on their arguments plus the identity of the files they read: path, size,
+`mtime_ns`, `ctime_ns` and inode. A file that is modified, replaced, or has its metadata
+changed therefore never returns a stale result. Functions whose result depends on anything
+else, i.e. a file's access time or the Spotlight index, must not be cached.
+
+Results are kept in an in-memory LRU of `maxsize` entries, and also in a SQLite file if the
+environment variable `PYDONI_CMD_CACHE` is set to its path (or `enable(store=...)` is called),
+so that they survive across runs. The SQLite file holds at most `store_maxsize` results,
+evicting the least recently used.
+
+Example:
+
+    import pydoni.cache
+    ffmpeg = pydoni.sh.find_binary('ffmpeg')
+    version = pydoni.cache.run([ffmpeg, '-version'], files=[ffmpeg]).stdout
+
+    @pydoni.cache.cacheable(files=['fpath'])
+    def probe(fpath):
+        ...
+"""
+
+import collections
+import os
+import pydoni
+import threading
+
+
+# Module variables ---------------------------------------------------------------------------------
+
+_enabled = True
+_maxsize = 1024
+_lru = collections.OrderedDict()
+_lock = threading.Lock()
+_store = None
+_store_path = None
+_store_maxsize = 100000
+
+
+# Module classes -----------------------------------------------------------------------------------
+
+class FileCache(object):
+    """
+    Persistent cache of results computed per file (i.e. EXIF metadata) in a SQLite file,
+    keyed by path and variant, i.e. the options results were computed with. A result is only
+    returned while the file's size, `mtime_ns` and inode are those it was stored with, so that
+    only new or changed files need to be computed again.
+
+    The cache holds at most `maxsize` results, evicting the least recently used. Results are
+    stored under the identity files had before they were computed, so that a file changed
+    while its result was computed is computed again on the next lookup:
+
+        cache = pydoni.cache.FileCache('/tmp/exif.sqlite', maxsize=100000)
+        identities = cache.identify(paths)
+        found, missing = cache.get_many(paths, variant='clean', identities=identities)
+        cache.set_many({path: compute(path) for path in missing}, variant='clean',
+                       identities=identities)
+
+    :param path: path to SQLite file
+    :type path: str
+    :param maxsize: maximum number of results kept
+    :type maxsize: int
+    :param name: name of cache, labelling its hits and misses in `pydoni.metrics`
+    :type name: str
+    """
+
+    def __init__(self, path, maxsize=100000, name='file'):
+        import sqlite3
+
+        assert maxsize > 0
+
+        self.path = path
+        self.maxsize = maxsize
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+        self.db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.db.execute('create table if not exists results '
+                        '(path text, variant text, size integer, mtime_ns integer, ino integer, '
+                        'value blob, used real, primary key (path, variant))')
+        self.db.execute('create index if not exists results_used on results (used)')
+        self.db.commit()
+
+    def identify(self, paths):
+        """
+        Get the identity of files, to look up and store their results with.
+
+        :param paths: paths to files
+        :type paths: list
+        :return: absolute path, size, modification time and inode by path, or None for files
+                 that do not exist
+        :rtype: dict
+        """
+        return {path: self._identity(path) for path in paths}
+
+    def get_many(self, paths, variant='', identities=None):
+        """
+        Look up the results of files.
+
+        :param paths: paths to files
+        :type paths: list
+        :param variant: [optional] variant of results to look up
+        :type variant: str
+        :param identities: [optional] identities of files returned by `identify()`, taken now
+                           if not given
+        :type identities: dict
+        :return: tuple of results found by path, and paths of files that are new or changed
+        :rtype: tuple
+        """
+        import pickle
+        import time
+
+        if identities is None:
+            identities = self.identify(paths)
+
+        found = {}
+        missing = []
+
+        with self.lock:
+            for path in paths:
+                identity = identities.get(path)
+                row = self.db.execute(
+                    'select size, mtime_ns, ino, value from results where path = ? and variant = ?',
+                    (os.path.abspath(path), variant)).fetchone()
+
+                if identity is not None and row is not None and tuple(row[:3]) == identity[1:]:
+                    found[path] = pickle.loads(row[3])
+                else:
+                    missing.append(path)
+
+            if found:
+                now = time.time()
+                self.db.executemany('update results set used = ? where path = ? and variant = ?',
+                                    [(now, os.path.abspath(p), variant) for p in found])
+                self.db.commit()
+
+            self.hits += len(found)
+            self.misses += len(missing)
+
+        pydoni.metrics.incr('cache_hits_total', len(found), cache=self.name)
+        pydoni.metrics.incr('cache_misses_total', len(missing), cache=self.name)
+
+        return found, missing
+
+    def set_many(self, results, variant='', identities=None):
+        """
+        Store the results of files, evicting the least recently used results if the cache is
+        over `maxsize`. Results of files that no longer exist are not stored.
+
+        :param results: results by path
+        :type results: dict
+        :param variant: [optional] variant of results
+        :type variant: str
+        :param identities: [optional] identities of files returned by `identify()` before
+                           their results were computed. Otherwise they are taken now, so a
+                           file changed while its result was computed would be stored with
+                           the stale result
+        :type identities: dict
+        """
+        import pickle
+        import time
+
+        now = time.time()
+        rows = []
+        for path, value in results.items():
+            identity = identities.get(path) if identities is not None else self._identity(path)
+            if identity is not None:
+                data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+                rows.append(identity + (variant, data, now))
+
+        with self.lock:
+            self.db.executemany('insert or replace into results '
+                                '(path, size, mtime_ns, ino, variant, value, used) '
+                                'values (?, ?, ?, ?, ?, ?, ?)', rows)
+
+            excess = self.db.execute('select count(*) from results').fetchone()[0] - self.maxsize
+            if excess > 0:
+                self.db.execute('delete from results where rowid in '
+                                '(select rowid from results order by used limit ?)', (excess,))
+
+            self.db.commit()
+
+    def stats(self):
+        """
+        Get the number of hits and misses since the cache was opened, and the number of
+        results held.
+
+        :rtype: dict
+        """
+        with self.lock:
+            entries = self.db.execute('select count(*) from results').fetchone()[0]
+
+        return {'hits': self.hits, 'misses': self.misses, 'entries': entries}
+
+    def clear(self):
+        """
+        Discard all results.
+        """
+        with self.lock:
+            self.db.execute('delete from results')
+            self.db.commit()
+
+    def close(self):
+        """
+        Close the SQLite file.
+        """
+        with self.lock:
+            self.db.close()
+
+    def _identity(self, path):
+        """
+        Get the absolute path, size, modification time and inode of a file, or None if it does
+        not exist.
+        """
+        identity = file_identity(path)
+        if identity is None:
+            return None
+
+        path, size, mtime_ns, ctime_ns, ino = identity
+        return (path, size, mtime_ns, ino)
+
+
+# Module functions ---------------------------------------------------------------------------------
+
+def enable(maxsize=1024, store=None, store_maxsize=100000):
+    """
+    Turn caching on, which it is by default, optionally with a persistent store.
+
+    :param maxsize: maximum number of results kept in memory
+    :type maxsize: int
+    :param store: [optional] path to SQLite file results are also kept in
+    :type store: str
+    :param store_maxsize: maximum number of results kept in the persistent store
+    :type store_maxsize: int
+    """
+    global _enabled, _maxsize, _store, _store_path, _store_maxsize
+
+    assert maxsize > 0
+    assert store_maxsize > 0
+
+    with _lock:
+        _enabled = True
+        _maxsize = maxsize
+        _store_maxsize = store_maxsize
+        while len(_lru) > _maxsize:
+            _lru.popitem(last=False)
+
+        if store != _store_path:
+            if _store is not None:
+                _store.close()
+
+            _store = None
+            _store_path = store
+
+
+def disable():
+    """
+    Turn caching off. Cacheable functions run every time until `enable()` is called.
+    """
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    """
+    Check whether caching is on.
+
+    :rtype: bool
+    """
+    return _enabled
+
+
+def clear():
+    """
+    Discard all cached results, in memory and in the persistent store.
+    """
+    with _lock:
+        _lru.clear()
+
+        store = _open_store()
+        if store is not None:
+            store.execute('delete from cache')
+            store.commit()
+
+
+def file_identity(path):
+    """
+    Get the identity of a file: absolute path, size, modification time, change time and inode.
+
+    :param path: path to file
+    :type path: str
+    :return: identity tuple, or None if the file does not exist
+    :rtype: tuple
+    """
+    path = os.path.abspath(path)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+
+    return (path, st.st_size, st.st_mtime_ns, st.st_ctime_ns, st.st_ino)
+
+
+def cacheable(files=(), cache_if=None):
+    """
+    Decorator annotating a function (or method) as cacheable: a deterministic function of its
+    arguments and of the files named by `files`. Results are pickled, so each call receives
+    its own copy and may modify it freely. Exceptions are never cached.
+
+    :param files: names of arguments holding a path or list of paths the function reads, in
+                  which case their identity is part of the key. Attributes of an argument may
+                  be named as 'self.fpath'
+    :type files: list
+    :param cache_if: [optional] function of the result returning whether to cache it, i.e.
+                     to only cache successful commands
+    :type cache_if: function
+    """
+    import functools
+    import inspect
+
+    files = [files] if isinstance(files, str) else list(files)
+
+    def decorator(func):
+        sig = inspect.signature(func)
+        qualname = '{}.{}'.format(func.__module__, func.__qualname__)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+
+            bound = sig.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = _make_key(qualname, bound.arguments, files)
+
+            found, value = _get(key)
+            if found:
+                pydoni.metrics.incr('cache_hits_total', cache='cmd')
+                return value
+
+            pydoni.metrics.incr('cache_misses_total', cache='cmd')
+            value = func(*args, **kwargs)
+            if cache_if is None or cache_if(value):
+                _set(key, value)
+
+            return value
+
+        wrapper.uncached = func
+        return wrapper
+
+    return decorator
+
+
+def _make_key(qualname, arguments, files):
+    """
+    Build the cache key of a call from the function name, its arguments other than `self`,
+    and the identity of the files named by `files`.
+    """
+    import hashlib
+
+    identities = []
+    for name in files:
+        obj_name, _, attr = name.partition('.')
+        value = arguments.get(obj_name)
+        if attr:
+            value = getattr(value, attr, None)
+
+        if value is None:
+            continue
+
+        paths = [value] if isinstance(value, str) else value
+        identities.append((name, tuple(file_identity(p) for p in paths)))
+
+    args = [(k, v) for k, v in arguments.items() if k != 'self']
+    return hashlib.sha1(repr((qualname, args, identities)).encode('utf-8')).hexdigest()
+
+
+def _get(key):
+    """
+    Look up a cached result. A result found in the persistent store is marked as used, but
+    not one found in memory, so that hits do not write to the store.
+
+    :return: tuple of whether the key was found, and the result
+    :rtype: tuple
+    """
+    import pickle
+    import time
+
+    with _lock:
+        if key in _lru:
+            _lru.move_to_end(key)
+            return True, pickle.loads(_lru[key])
+
+        store = _open_store()
+        if store is None:
+            return False, None
+
+        row = store.execute('select value from cache where key = ?', (key,)).fetchone()
+        if row is None:
+            return False, None
+
+        store.execute('update cache set used = ? where key = ?', (time.time(), key))
+        store.commit()
+        _remember(key, row[0])
+
+    return True, pickle.loads(row[0])
+
+
+def _set(key, value):
+    """
+    Cache a result, evicting the least recently used results of the persistent store if it
+    is over `store_maxsize`.
+    """
+    import pickle
+    import time
+
+    data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+    with _lock:
+        _remember(key, data)
+
+        store = _open_store()
+        if store is not None:
+            now = time.time()
+            store.execute('insert or replace into cache (key, value, created, used) '
+                          'values (?, ?, ?, ?)', (key, data, now, now))
+
+            excess = store.execute('select count(*) from cache').fetchone()[0] - _store_maxsize
+            if excess > 0:
+                store.execute('delete from cache where rowid in '
+                              '(select rowid from cache order by used, rowid limit ?)', (excess,))
+
+            store.commit()
+
+
+def _remember(key, data):
+    """
+    Add a pickled result to the in-memory LRU, evicting the least recently used result if it
+    is full. Call with `_lock` held.
+    """
+    _lru[key] = data
+    _lru.move_to_end(key)
+    if len(_lru) > _maxsize:
+        _lru.popitem(last=False)
+
+
+def _open_store():
+    """
+    Get the connection to the persistent store, opening it on first use, or None if there is
+    no persistent store. Call with `_lock` held.
+    """
+    import sqlite3
+
+    global _store
+
+    if _store is None and _store_path:
+        _store = sqlite3.connect(_store_path, check_same_thread=False, timeout=30)
+        _store.execute('create table if not exists cache '
+                       '(key text primary key, value blob, created real, used real)')
+
+        columns = [row[1] for row in _store.execute('pragma table_info(cache)')]
+        if 'used' not in columns:
+            # Store written before results were evicted
+            _store.execute('alter table cache add column used real')
+            _store.execute('update cache set used = created')
+
+        _store.execute('create index if not exists cache_used on cache (used)')
+        _store.commit()
+
+    return _store
+
+
+@cacheable(files=['files'], cache_if=lambda res: res.returncode == 0)
+def run(argv, files=(), encoding=None, merge_stderr=False):
+    """
+    Cached `pydoni.sh.run()`. Only commands exiting zero are cached.
+
+    :param argv: program and its arguments
+    :type argv: list
+    :param files: paths of files the command's output depends on, i.e. the file it probes or
+                  the binary itself for a version probe
+    :type files: list
+    :param encoding: [optional] name of encoding to decode output with
+    :type encoding: str
+    :param merge_stderr: return standard error interleaved with standard output
+    :type merge_stderr: bool
+    :rtype: subprocess.CompletedProcess
+    """
+    return pydoni.sh.run(argv, encoding=encoding, merge_stderr=merge_stderr)
+
+
+def syscmd(cmd, files=(), encoding=''):
+    """
+    Cached `pydoni.syscmd()`. Only commands exiting zero are cached.
+
+    :param cmd: command string, or list of arguments
+    :type cmd: str, list
+    :param files: paths of files the command's output depends on
+    :type files: list
+    :param encoding: [optional] name of decoding to decode output bytestring with
+    :type encoding: str
+    :return: interned system output {str}, or returncode {int}
+    :rtype: str or int
+    """
+    returncode, output = _syscmd(cmd, files=files, encoding=encoding)
+    return output
+
+
+@cacheable(files=['files'], cache_if=lambda res: res[0] == 0)
+def _syscmd(cmd, files=(), encoding=''):
+    """
+    Run a command as `pydoni.syscmd()` does, keeping its exit status, which `syscmd()` does
+    not return if the command has output.
+
+    :return: tuple of exit status, and output or exit status as returned by `pydoni.syscmd()`
+    :rtype: tuple
+    """
+    argv = ['/bin/sh', '-c', cmd] if isinstance(cmd, str) else cmd
+    res = pydoni.sh.run(argv, merge_stderr=True)
+
+    if len(res.stdout) > 1:
+        return res.returncode, res.stdout.decode(encoding) if encoding else res.stdout
+
+    return res.returncode, res.returncode
+
+
+if os.environ.get('PYDONI_CMD_CACHE'):
+    enable(store=os.environ['PYDONI_CMD_CACHE'])
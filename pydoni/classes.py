@@ -1,6 +1,4 @@
 import pydoni
-import pydoni.os
-import pydoni.web
 
 
 class Attribute(object):
@@ -1,5 +1,6 @@
 import pydoni
-import pydoni.sh
+import pydoni.memprof
+import pydoni.trace
 
 
 class Postgres(object):
@@ -67,6 +68,7 @@ class Postgres(object):
 
             return pgpass_contents.split(':')
 
+    @pydoni.trace.traced()
     def execute(self, sql, logfile=None, log_ts=False, progress=False):
         """
         Execute list of SQL statements or a single statement, in a transaction.
@@ -106,7 +108,10 @@ class Postgres(object):
                 pbar = tqdm(total=len(sql), unit='query')
 
             for stmt in sql:
-                con.execute(sqlalchemy.text(stmt))
+                with pydoni.trace.span('sql', sql=stmt):
+                    con.execute(sqlalchemy.text(stmt))
+
+                pydoni.metrics.incr('db_round_trips_total')
 
                 if write_log:
                     with open(logfile, 'a') as f:
@@ -123,9 +128,10 @@ class Postgres(object):
         if progress:
             pbar.close()
 
-        self.logger.info("All SQL statement(s) executed successfully")
+        self.logger.sample("All SQL statement(s) executed successfully")
         return True
 
+    @pydoni.trace.traced()
     def read_sql(self, sql, simplify=True):
         """
         Execute SQL and read results using Pandas.
@@ -141,7 +147,9 @@ class Postgres(object):
 
         self.logger.logvars(locals())
         res = pd.read_sql(sql, con=self.dbcon)
-        self.logger.info('Queried data frame, shape: %s' % str(res.shape))
+        pydoni.metrics.incr('db_round_trips_total')
+        pydoni.metrics.incr('db_rows_fetched_total', len(res))
+        self.logger.sample('Queried data frame, shape: %s', str(res.shape))
 
         if res.shape[1] == 1:
             if simplify:
@@ -540,6 +548,8 @@ class Postgres(object):
 
         return dtype
 
+    @pydoni.trace.traced()
+    @pydoni.memprof.profiled()
     def read_table(self, schema, table):
         """
         Read entire SQL table.
@@ -577,16 +587,14 @@ class Postgres(object):
 
         bin = pydoni.sh.find_binary('pg_dump', abort=True)
         outfile = "{backup_dir}/{self.dbname}.sql".format(**locals())
-        cmd = '{bin} --user {self.dbuser} {self.dbname} > "{outfile}"'.format(**locals())
+        cmd = [bin, '--user', self.dbuser, '--file', outfile, self.dbname]
 
         self.logger.var('bin', bin)
         self.logger.var('cmd', cmd)
 
-        out = pydoni.syscmd(cmd)
-        if not isinstance(out, int):
-            out = out.decode('utf-8')
-            if 'FATAL' in out:
-                raise Exception(out.strip())
+        out = pydoni.sh.run(cmd, encoding='utf-8', merge_stderr=True).stdout
+        if 'FATAL' in out:
+            raise Exception(out.strip())
 
         self.logger.info("Dumped database to dir: " + backup_dir)
 
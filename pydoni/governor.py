@@ -0,0 +1,354 @@
+"""
+Token-based governor limiting how much CPU the external tools run by pydoni use at once, so
+that parallel subsystems (`ffmpeg` transcodes, `exiftool` batches, OCR, ...) do not
+oversubscribe the machine.
+
+The governor holds a number of tokens, typically one per core. Every command started by
+`pydoni.syscmd_stream()` (and so `syscmd()`, `sh.run()` and `syscmd_many()`) or
+`sh.run_async()` acquires tokens before it is spawned and releases them when it exits. The
+number of tokens a command takes is the weight of its program, declared by tool classes with
+`tool()` (i.e. 2 for `ffmpeg`) and 1 for any other program.
+
+With a lock directory configured, tokens are slot files locked with `flock()`, so the limit
+applies across all processes sharing the directory rather than within this process only.
+
+The governor is off unless a number of tokens is configured, in order of precedence:
+
+    - `configure(tokens=..., lockdir=..., weights=...)`
+    - environment variables `PYDONI_GOVERNOR_TOKENS` (a number, or 'auto' for the number of
+      CPUs), `PYDONI_GOVERNOR_LOCKDIR` and `PYDONI_GOVERNOR_WEIGHTS` (i.e. 'ffmpeg=2,tesseract=4')
+    - JSON config file at `PYDONI_GOVERNOR_CONFIG`, or `~/.pydoni/governor.json`, i.e.
+      {"tokens": 8, "lockdir": "/tmp/pydoni-governor", "weights": {"ffmpeg": 2}}
+
+Tokens are reentrant per thread: a command started by a thread already holding tokens (i.e.
+while iterating over `syscmd_stream()` or `sh.EXIF.scan()`) runs under the tokens held, rather
+than waiting for tokens that may never be released. Coroutines share their event loop's thread,
+so `acquire_async()` always takes its own tokens.
+"""
+
+import os
+import pydoni
+import threading
+
+
+# Module variables ---------------------------------------------------------------------------------
+
+_tokens = None  # None if the governor is off
+_lockdir = None
+_weights = {}  # declared by tool classes with `tool()`
+_config_weights = {}  # configured, taking precedence over declared weights
+_used = 0
+_cond = threading.Condition()
+_holders = set()  # identifiers of threads holding tokens
+
+
+# Module classes -----------------------------------------------------------------------------------
+
+class Lease(object):
+    """
+    Tokens held by a command. Use through `acquire()` rather than instantiating directly.
+
+    :param weight: number of tokens held
+    :type weight: int
+    :param slots: open slot files locked with `flock()`, if the governor has a lock directory
+    :type slots: list
+    :param thread: identifier of the thread holding the tokens, None if held by a coroutine
+    :type thread: int
+    """
+
+    __slots__ = ('weight', 'slots', 'thread')
+
+    def __init__(self, weight, slots=None, thread=None):
+        self.weight = weight
+        self.slots = slots
+        self.thread = thread
+
+    def release(self):
+        """
+        Release the tokens. Releasing more than once does nothing.
+        """
+        global _used
+
+        if self.weight == 0:
+            return None
+
+        if self.slots is not None:
+            for f in self.slots:
+                f.close()  # Closing the file releases its lock
+            self.slots = None
+        else:
+            with _cond:
+                _used -= self.weight
+                _cond.notify_all()
+
+        if self.thread is not None:
+            with _cond:
+                _holders.discard(self.thread)
+
+        self.weight = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.release()
+        return False
+
+
+_null_lease = Lease(0)
+
+
+# Module functions ---------------------------------------------------------------------------------
+
+def configure(tokens=None, lockdir=None, weights=None):
+    """
+    Configure the governor, overriding the environment and config file.
+
+    :param tokens: number of tokens, 'auto' for the number of CPUs, or None to turn the
+                   governor off
+    :type tokens: int, str
+    :param lockdir: [optional] directory holding slot files shared with other processes
+    :type lockdir: str
+    :param weights: [optional] number of tokens taken by each program, by program name
+    :type weights: dict
+    """
+    global _tokens, _lockdir, _config_weights
+
+    if tokens == 'auto':
+        tokens = os.cpu_count() or 1
+
+    assert tokens is None or int(tokens) > 0
+
+    with _cond:
+        if _used:
+            raise Exception('Cannot configure the governor while tokens are held')
+
+        _tokens = int(tokens) if tokens is not None else None
+        _lockdir = lockdir
+        _config_weights = dict(weights or {})
+
+        if _lockdir is not None and _tokens is not None:
+            os.makedirs(_lockdir, exist_ok=True)
+
+
+def is_enabled():
+    """
+    Check whether the governor is on.
+
+    :rtype: bool
+    """
+    return _tokens is not None
+
+
+def tool(name, weight=1):
+    """
+    Class decorator declaring the number of tokens taken by a single run of a tool, set as
+    the class attribute `weight`. A weight configured for the program takes precedence.
+
+        @pydoni.governor.tool('ffmpeg', weight=2)
+        class FFmpeg(object):
+            ...
+
+    :param name: name of the tool's program
+    :type name: str
+    :param weight: number of tokens taken by one run
+    :type weight: int
+    """
+    def decorator(cls):
+        cls.weight = weight
+        _weights[name] = weight
+        return cls
+
+    return decorator
+
+
+def weight_of(cmd):
+    """
+    Get the number of tokens taken by a command, from the name of its program.
+
+    :param cmd: command string or list of arguments
+    :type cmd: str, list
+    :rtype: int
+    """
+    if not isinstance(cmd, str):
+        cmd = [str(x) for x in cmd]
+        if len(cmd) == 3 and os.path.basename(cmd[0]) in ('sh', 'bash') and cmd[1] == '-c':
+            # Shell command string, i.e. as run by `pydoni.syscmd_many()`
+            cmd = cmd[2]
+
+    if isinstance(cmd, str):
+        parts = cmd.split(None, 1)
+        program = parts[0] if parts else ''
+    else:
+        program = cmd[0] if cmd else ''
+
+    program = os.path.basename(program)
+    weight = _config_weights.get(program)
+    if weight is None:
+        weight = _weights.get(program, 1)
+
+    return weight
+
+
+def acquire(weight):
+    """
+    Wait for and take tokens. A thread already holding tokens takes none, and runs the command
+    under the tokens it holds.
+
+    :param weight: number of tokens, capped at the total number of tokens
+    :type weight: int
+    :return: lease to release the tokens with, also a context manager
+    :rtype: Lease
+    """
+    import time
+
+    global _used
+
+    if _tokens is None:
+        return _null_lease
+
+    thread = threading.get_ident()
+    if thread in _holders:
+        return _null_lease
+
+    weight = min(max(int(weight), 1), _tokens)
+    start = time.perf_counter()
+
+    if _lockdir is not None:
+        delay = 0.005
+        while True:
+            lease = _try_acquire_slots(weight)
+            if lease is not None:
+                break
+
+            time.sleep(delay)
+            delay = min(delay * 2, 0.1)
+
+    else:
+        with _cond:
+            while _used + weight > _tokens:
+                _cond.wait()
+
+            _used += weight
+
+        lease = Lease(weight)
+
+    lease.thread = thread
+    with _cond:
+        _holders.add(thread)
+
+    pydoni.metrics.incr('governor_wait_seconds_total', time.perf_counter() - start)
+    return lease
+
+
+async def acquire_async(weight):
+    """
+    Coroutine equivalent of `acquire()`, polling for tokens without blocking the event loop.
+
+    :param weight: number of tokens, capped at the total number of tokens
+    :type weight: int
+    :return: lease to release the tokens with
+    :rtype: Lease
+    """
+    import asyncio
+    import time
+
+    if _tokens is None:
+        return _null_lease
+
+    weight = min(max(int(weight), 1), _tokens)
+    start = time.perf_counter()
+    delay = 0.005
+
+    while True:
+        lease = _try_acquire(weight)
+        if lease is not None:
+            break
+
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 0.1)
+
+    pydoni.metrics.incr('governor_wait_seconds_total', time.perf_counter() - start)
+    return lease
+
+
+def _try_acquire(weight):
+    """
+    Take tokens if they are available right away.
+
+    :return: lease, or None if there are not enough free tokens
+    :rtype: Lease
+    """
+    global _used
+
+    if _lockdir is not None:
+        return _try_acquire_slots(weight)
+
+    with _cond:
+        if _used + weight > _tokens:
+            return None
+
+        _used += weight
+
+    return Lease(weight)
+
+
+def _try_acquire_slots(weight):
+    """
+    Lock `weight` free slot files in the lock directory without waiting.
+
+    :return: lease, or None if there are not enough free slots
+    :rtype: Lease
+    """
+    import fcntl
+    import random
+
+    slots = []
+    offset = random.randrange(_tokens)  # Spread processes over slots to limit contention
+    for i in range(_tokens):
+        f = open(os.path.join(_lockdir, 'slot-{}'.format((offset + i) % _tokens)), 'a')
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            f.close()
+            continue
+
+        slots.append(f)
+        if len(slots) == weight:
+            return Lease(weight, slots)
+
+    for f in slots:
+        f.close()
+
+    return None
+
+
+def _load_config():
+    """
+    Configure the governor from the config file and environment.
+    """
+    import json
+
+    config = {}
+    fpath = os.environ.get('PYDONI_GOVERNOR_CONFIG',
+                           os.path.join(os.path.expanduser('~'), '.pydoni', 'governor.json'))
+    if os.path.isfile(fpath):
+        with open(fpath, 'r') as f:
+            config = json.load(f)
+
+    tokens = os.environ.get('PYDONI_GOVERNOR_TOKENS', config.get('tokens'))
+    lockdir = os.environ.get('PYDONI_GOVERNOR_LOCKDIR', config.get('lockdir'))
+
+    weights = dict(config.get('weights', {}))
+    for item in os.environ.get('PYDONI_GOVERNOR_WEIGHTS', '').split(','):
+        if '=' in item:
+            program, weight = item.split('=', 1)
+            weights[program.strip()] = int(weight)
+
+    if tokens is not None:
+        configure(tokens=tokens if tokens == 'auto' else int(tokens),
+                  lockdir=lockdir,
+                  weights=weights)
+
+
+_load_config()
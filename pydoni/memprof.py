@@ -0,0 +1,365 @@
+"""
+Memory profiling of the large in-memory builders (`EXIF.extract`, `Album`, `Postgres.read_table`)
+using `tracemalloc` and resident set size (RSS) sampling.
+
+Off by default, in which case `profile()` returns a no-op context manager and `profiled()`
+functions only check a single module flag before calling through. Turn it on with
+`pydoni.memprof.enable()`, or by setting the environment variable `PYDONI_MEMPROF`.
+
+While on, each profiled operation records:
+
+    - peak: peak memory allocated by Python during the operation, in bytes. `tracemalloc`
+      traces the whole process, so this includes allocations of other threads at the time
+    - allocated: net memory allocated by Python over the operation, in bytes
+    - rss_peak: peak RSS of the process sampled during the operation, in bytes. Read from
+      /proc on Linux, or with `psutil` if installed. Otherwise (i.e. macOS without `psutil`),
+      the peak RSS of the process so far, from `resource.getrusage()`
+    - top: top allocation sites by net size, as 'file:line: size' strings
+
+These are logged, kept per operation name in `results()`, and set as attributes of the
+enclosing `pydoni.trace` span so that they appear in trace exports.
+"""
+
+import os
+import pydoni
+import pydoni.trace
+import threading
+
+
+# Module variables ---------------------------------------------------------------------------------
+
+_enabled = False
+_top = 10
+_rss_interval = 0.05
+_results = {}
+_lock = threading.Lock()
+_open = []  # Open profiles of all threads
+_sampler = None
+_rss_reader = None  # Function reading RSS on this platform, see `_current_rss()`
+_started_tracing = False  # Whether `enable()` started `tracemalloc`, rather than its caller
+
+
+# Module classes -----------------------------------------------------------------------------------
+
+class _Profile(object):
+    """
+    Memory profile of a single operation. Use through `profile()` rather than instantiating
+    directly.
+
+    :param name: name of operation
+    :type name: str
+    :param attrs: arbitrary attributes logged with the result
+    :type attrs: dict
+    """
+
+    def __init__(self, name, attrs):
+
+        self.logger = pydoni.logger_setup(
+            name=pydoni.what_is_my_name(classname=self.__class__.__name__, with_modname=True),
+            level=pydoni.modloglev)
+
+        self.name = name
+        self.attrs = attrs
+        self.peak = 0
+        self.rss_peak = None
+        self._start_size = None
+        self._start_snapshot = None
+
+    def __enter__(self):
+        import tracemalloc
+
+        self._start_snapshot = _snapshot()
+        self.rss_peak = _current_rss()
+
+        with _lock:
+            # The peak counter is process-wide and reset below, so hand the peak reached so far
+            # to the open profiles of all threads first
+            size, peak = tracemalloc.get_traced_memory()
+            for p in _open:
+                p.peak = max(p.peak, peak)
+
+            self._start_size = size
+            tracemalloc.reset_peak()
+            _open.append(self)
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        import tracemalloc
+
+        with _lock:
+            size, peak = tracemalloc.get_traced_memory()
+            self.peak = max(self.peak, peak)
+            _open.remove(self)
+
+        if self.rss_peak is not None:
+            self.rss_peak = max(self.rss_peak, _current_rss() or 0)
+
+        stats = _snapshot().compare_to(self._start_snapshot, 'lineno')
+        self._start_snapshot = None
+        top = ['{}:{}: {}'.format(stat.traceback[0].filename, stat.traceback[0].lineno,
+                                  pydoni.human_filesize(stat.size_diff))
+               for stat in stats[:_top] if stat.size_diff > 0]
+
+        result = {
+            'peak': self.peak,
+            'allocated': size - self._start_size,
+            'rss_peak': self.rss_peak,
+            'top': top,
+        }
+        _record(self.name, result)
+
+        span = pydoni.trace.current_span()
+        if span is not None:
+            span.set(**{'mem_' + k: v for k, v in result.items()})
+
+        self.logger.info('Memory profile of %s %s: peak %s, allocated %s, RSS peak %s\n  %s',
+                         self.name, self.attrs, pydoni.human_filesize(self.peak),
+                         pydoni.human_filesize(max(result['allocated'], 0)),
+                         pydoni.human_filesize(self.rss_peak) if self.rss_peak else 'n/a',
+                         '\n  '.join(top))
+
+        return False
+
+
+class _NullProfile(object):
+    """
+    Profile returned while memory profiling is off. Does nothing.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        return False
+
+
+_null_profile = _NullProfile()
+
+
+# Module functions ---------------------------------------------------------------------------------
+
+def _snapshot():
+    """
+    Take a `tracemalloc` snapshot, excluding allocations made by `tracemalloc` itself and by
+    the import machinery.
+    """
+    import tracemalloc
+
+    return tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    ])
+
+
+def _current_rss():
+    """
+    Get the current RSS of the process in bytes, or its peak RSS so far where the current RSS
+    cannot be read, see `_find_rss_reader()`.
+    """
+    global _rss_reader
+
+    if _rss_reader is None:
+        _rss_reader = _find_rss_reader()
+
+    return _rss_reader()
+
+
+def _find_rss_reader():
+    """
+    Get a function reading the RSS of the process in bytes, the first available of:
+
+        - /proc/self/statm (Linux)
+        - `psutil`, if installed
+        - `resource.getrusage()`, whose `ru_maxrss` is the peak RSS of the process so far
+          rather than its current RSS
+
+    :return: function returning a number of bytes, or None where RSS cannot be read at all
+    :rtype: function
+    """
+    import sys
+
+    try:
+        _statm_rss()
+        return _statm_rss
+    except (OSError, ValueError):
+        pass
+
+    try:
+        import psutil
+        return lambda: psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+
+    try:
+        import resource
+    except ImportError:
+        return lambda: None
+
+    # `ru_maxrss` is in bytes on macOS, and in kilobytes elsewhere
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return lambda: resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def _statm_rss():
+    """
+    Read the current RSS of the process in bytes from /proc/self/statm.
+    """
+    with open('/proc/self/statm', 'r') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+def _sample_rss():
+    """
+    Update the RSS peak of all open profiles periodically. Run on a daemon thread.
+    """
+    import time
+
+    while _enabled:
+        time.sleep(_rss_interval)
+        if _open:
+            rss = _current_rss()
+            with _lock:
+                for p in _open:
+                    if p.rss_peak is not None:
+                        p.rss_peak = max(p.rss_peak, rss)
+
+
+def _record(name, result):
+    """
+    Merge the result of a profiled operation into `results()`.
+    """
+    with _lock:
+        entry = _results.get(name)
+        if entry is None:
+            entry = _results[name] = {
+                'calls': 0, 'peak': 0, 'allocated': 0, 'rss_peak': None, 'top': []}
+
+        entry['calls'] += 1
+        entry['allocated'] += result['allocated']
+        if result['peak'] >= entry['peak']:
+            entry['peak'] = result['peak']
+            entry['top'] = result['top']
+
+        if result['rss_peak'] is not None:
+            entry['rss_peak'] = max(entry['rss_peak'] or 0, result['rss_peak'])
+
+
+def enable(top=10, nframes=1, rss_interval=0.05):
+    """
+    Start memory profiling. Starts `tracemalloc` if it is not already tracing.
+
+    :param top: number of allocation sites reported per operation
+    :type top: int
+    :param nframes: number of frames stored per allocation by `tracemalloc`
+    :type nframes: int
+    :param rss_interval: number of seconds between RSS samples
+    :type rss_interval: float
+    """
+    import tracemalloc
+
+    global _enabled, _top, _rss_interval, _sampler, _started_tracing
+
+    _top = top
+    _rss_interval = rss_interval
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(nframes)
+        _started_tracing = True
+
+    _enabled = True
+
+    if _current_rss() is not None and (_sampler is None or not _sampler.is_alive()):
+        _sampler = threading.Thread(target=_sample_rss, name='pydoni-memprof', daemon=True)
+        _sampler.start()
+
+
+def disable():
+    """
+    Stop memory profiling, and `tracemalloc` if `enable()` started it. Results recorded so
+    far are kept until `clear()` is called.
+    """
+    import tracemalloc
+
+    global _enabled, _started_tracing
+    _enabled = False
+
+    if _started_tracing:
+        tracemalloc.stop()
+        _started_tracing = False
+
+
+def is_enabled():
+    """
+    Check whether memory profiling is on.
+
+    :rtype: bool
+    """
+    return _enabled
+
+
+def clear():
+    """
+    Discard all recorded results.
+    """
+    with _lock:
+        _results.clear()
+
+
+def results():
+    """
+    Get the results of profiled operations by operation name: number of calls, highest peak
+    with the top allocation sites of that call, total net allocation and highest RSS peak.
+
+    :rtype: dict
+    """
+    import copy
+
+    with _lock:
+        return copy.deepcopy(_results)
+
+
+def profile(name, **attrs):
+    """
+    Context manager profiling memory use of the enclosed block.
+
+    :param name: name of operation
+    :type name: str
+    :param attrs: arbitrary attributes logged with the result
+    :return: context manager
+    """
+    if not _enabled:
+        return _null_profile
+
+    return _Profile(name, attrs)
+
+
+def profiled(name=None):
+    """
+    Decorator profiling memory use of each call of the decorated function.
+
+    :param name: [optional] name of operation, defaults to the function's qualified name
+    :type name: str
+    """
+    import functools
+
+    def decorator(func):
+        profile_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+
+            with _Profile(profile_name, {}):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+if os.environ.get('PYDONI_MEMPROF'):
+    enable()
@@ -0,0 +1,149 @@
+"""
+Process-wide performance counters: subprocesses spawned and their wall time, bytes read from
+child stdout, database round trips and rows fetched, HTTP requests and cache hits.
+
+Counters are registered as `pydoni.pydonicli_metrics` along with the `result` published by
+scripts through `pydoni.pydonicli_register()`, and can be written as a Prometheus
+text-exposition file with `write_prometheus()`. Setting the environment variable
+`PYDONI_METRICS_FILE` writes that file when the interpreter exits.
+
+Example:
+
+    import pydoni.metrics
+    pydoni.metrics.incr('cache_hits_total', cache='find_binary')
+    pydoni.metrics.snapshot()
+    {'cache_hits_total{cache="find_binary"}': 1}
+"""
+
+import os
+import threading
+
+
+# Module variables ---------------------------------------------------------------------------------
+
+# Help strings for counters incremented within pydoni, written to Prometheus output
+descriptions = {
+    'subprocess_spawned_total': 'Subprocesses spawned',
+    'subprocess_seconds_total': 'Wall time spent waiting on subprocesses, in seconds',
+    'subprocess_stdout_bytes_total': 'Bytes read from subprocess stdout',
+    'db_round_trips_total': 'Statements sent to the database',
+    'db_rows_fetched_total': 'Rows fetched from the database',
+    'http_requests_total': 'HTTP requests made',
+    'cache_hits_total': 'Cache hits',
+    'cache_misses_total': 'Cache misses',
+    'governor_wait_seconds_total': 'Time spent waiting for pydoni.governor tokens, in seconds',
+    'exiftool_requests_total': 'Commands run by exiftool sessions',
+    'exiftool_restarts_total': 'exiftool sessions restarted after exiting or being killed',
+    'operation_seconds_bucket': 'Operations watched by pydoni.watchdog, by duration bucket',
+    'operation_seconds_sum': 'Total duration of operations watched by pydoni.watchdog',
+    'operation_seconds_count': 'Operations watched by pydoni.watchdog',
+    'slow_operations_total': 'Slow operations reported by pydoni.watchdog',
+}
+
+_counters = {}
+_counters_lock = threading.Lock()
+
+
+# Module functions ---------------------------------------------------------------------------------
+
+def incr(name, value=1, **labels):
+    """
+    Increment a counter.
+
+    :param name: name of counter, i.e. 'subprocess_spawned_total'
+    :type name: str
+    :param value: amount to increment counter by
+    :type value: int, float
+    :param labels: labels distinguishing series of the same counter, i.e. cache='find_binary'
+    """
+    key = (name, tuple(sorted(labels.items()))) if labels else (name, ())
+    with _counters_lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def get(name, **labels):
+    """
+    Get the current value of a counter.
+
+    :param name: name of counter
+    :type name: str
+    :param labels: labels of series to get
+    :return: value of counter, 0 if it has never been incremented
+    :rtype: int, float
+    """
+    return _counters.get((name, tuple(sorted(labels.items()))), 0)
+
+
+def reset():
+    """
+    Reset all counters.
+    """
+    with _counters_lock:
+        _counters.clear()
+
+
+def _series_name(name, labels):
+    """
+    Render counter name and labels as a Prometheus series name, i.e. 'name{label="value"}'.
+    """
+    if not labels:
+        return name
+
+    return '{}{{{}}}'.format(name, ','.join('{}="{}"'.format(k, _escape(v)) for k, v in labels))
+
+
+def _escape(value):
+    """
+    Escape a label value for the Prometheus text format.
+    """
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def snapshot():
+    """
+    Get the current value of all counters, keyed by Prometheus series name.
+
+    :rtype: dict
+    """
+    with _counters_lock:
+        items = sorted(_counters.items())
+
+    return {_series_name(name, labels): value for (name, labels), value in items}
+
+
+def write_prometheus(fpath, prefix='pydoni_'):
+    """
+    Write all counters to a file in the Prometheus text-exposition format, i.e. for the
+    node_exporter textfile collector. The file is written to a temporary file first and
+    renamed, so a scraper never reads a partial file.
+
+    :param fpath: path to output file, conventionally ending in '.prom'
+    :type fpath: str
+    :param prefix: string prepended to every counter name
+    :type prefix: str
+    """
+    with _counters_lock:
+        items = sorted(_counters.items())
+
+    lines = []
+    described = set()
+    for (name, labels), value in items:
+        if name not in described:
+            described.add(name)
+            if name in descriptions:
+                lines.append('# HELP {}{} {}'.format(prefix, name, descriptions[name]))
+
+            lines.append('# TYPE {}{} counter'.format(prefix, name))
+
+        lines.append('{}{} {}'.format(prefix, _series_name(name, labels), value))
+
+    tmpfile = fpath + '.tmp'
+    with open(tmpfile, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+
+    os.replace(tmpfile, fpath)
+
+
+if os.environ.get('PYDONI_METRICS_FILE'):
+    import atexit
+    atexit.register(write_prometheus, os.environ['PYDONI_METRICS_FILE'])
@@ -1,6 +1,4 @@
 import pydoni
-import pydoni.sh
-import pydoni.db
 
 
 class FinderMacOS(object):
@@ -46,10 +44,10 @@ class FinderMacOS(object):
 
         self.logger.info('Getting comment from file: ' + fpath)
 
-        cmd = '%s -r -nullMarker "" -n kMDItemFinderComment "%s"' % (self.bin_mdls, fpath)
+        cmd = [self.bin_mdls, '-r', '-nullMarker', '', '-n', 'kMDItemFinderComment', fpath]
         self.logger.var('cmd', cmd)
 
-        res = pydoni.syscmd(cmd, encoding='utf-8')
+        res = pydoni.sh.run(cmd, encoding='utf-8', merge_stderr=True).stdout
         self.logger.var('res', res)
 
         if 'could not find ' + os.path.basename(fpath) in res:
@@ -69,11 +67,9 @@ class FinderMacOS(object):
         :return: True if successful, False otherwise
         :rtype: bool
         """
-        import os, re
-
         self.logger.info("Setting comment '%s' on file: %s" % (comment, fpath))
 
-        cmd = '%s -e' % self.bin_osa
+        cmd = [self.bin_osa, '-e']
         self.logger.var('cmd', cmd)
 
         applescript = '\n'.join([
@@ -86,20 +82,17 @@ class FinderMacOS(object):
         applescript_clear = applescript.format(file=fpath, comment='test')
         applescript_set = applescript.format(file=fpath, comment=comment)
 
-        applescript_clear = re.sub(r'"', r'\"', applescript_clear)
-        applescript_set = re.sub(r'"', r'\"', applescript_set)
-
         self.logger.var('applescript_clear', applescript_clear)
         self.logger.var('applescript_set', applescript_set)
 
         try:
-            cmd_exec_clear = cmd + ' "' + applescript_clear + '"'
+            cmd_exec_clear = cmd + [applescript_clear]
             self.logger.var('cmd_exec_clear', cmd_exec_clear)
-            pydoni.syscmd(cmd_exec_clear)
+            pydoni.sh.run(cmd_exec_clear)
 
-            cmd_exec_set = cmd + ' "' + applescript_set + '"'
+            cmd_exec_set = cmd + [applescript_set]
             self.logger.var('cmd_exec_set', cmd_exec_set)
-            pydoni.syscmd(cmd_exec_set)
+            pydoni.sh.run(cmd_exec_set)
 
             return True
 
@@ -117,26 +110,22 @@ class FinderMacOS(object):
         :return: True if successful, False otherwise
         :rtype: bool
         """
-        import re
-        import os
-
         self.logger.info('Removing comment from file: ' + fpath)
 
-        cmd = '%s -e' % self.bin_osa
+        cmd = [self.bin_osa, '-e']
         self.logger.var('cmd', cmd)
 
         applescript = '\n'.join([
             'set filepath to POSIX file "{file}"',
             'set the_file to filepath as alias',
             'tell application "Finder" to set the comment of the_file to "{comment}"'
-        ])
-        applescript = re.sub(r'"', r'\"', applescript)
+        ]).format(file=fpath, comment='')
         self.logger.var('applescript', applescript)
 
         try:
-            cmd_exec = cmd + ' "' + applescript + '"'
+            cmd_exec = cmd + [applescript]
             self.logger.var('cmd_exec', cmd_exec)
-            os.system(cmd_exec)
+            pydoni.sh.run(cmd_exec)
 
             return True
 
@@ -156,12 +145,12 @@ class FinderMacOS(object):
         """
         self.logger.info('Getting tags from file: ' + fpath)
 
-        cmd = '%s -r -nullMarker "" -n kMDItemUserTags "%s"' % (self.bin_mdls, fpath)
+        cmd = [self.bin_mdls, '-r', '-nullMarker', '', '-n', 'kMDItemUserTags', fpath]
         self.logger.var('cmd', cmd)
 
-        tags = str(pydoni.syscmd(cmd, encoding='utf-8'))
+        tags = pydoni.sh.run(cmd, encoding='utf-8').stdout
 
-        if tags == '0':
+        if len(tags) <= 1:
             self.logger.warning('No tags found for file: ' + fpath)
             return []
 
@@ -180,7 +169,7 @@ class FinderMacOS(object):
         tag = [tag] if isinstance(tag, str) else tag
         res = []
         for tg in tag:
-            z = pydoni.syscmd('%s --add "%s" "%s"' % (self.bin_tag, tg, fpath))
+            z = pydoni.sh.run([self.bin_tag, '--add', tg, fpath]).returncode
             res.append(z)
         if len(list(set(res))) == 1:
             if list(set(res)) == [0]:
@@ -203,7 +192,7 @@ class FinderMacOS(object):
 
         res = []
         for tg in tag:
-            z = pydoni.syscmd('%s --remove "%s" "%s"' % (self.bin_tag, tg, fpath))
+            z = pydoni.sh.run([self.bin_tag, '--remove', tg, fpath]).returncode
             res.append(z)
 
         if len(list(set(res))) == 1:
@@ -236,7 +225,8 @@ class TMBackup(object):
         """
         import os
 
-        out = pydoni.syscmd('%s latestbackup' % self.bin).decode('utf-8').strip()
+        out = pydoni.sh.run([self.bin, 'latestbackup'], encoding='utf-8', merge_stderr=True)
+        out = out.stdout.strip()
 
         try:
             lastdate = os.path.basename(out)
@@ -258,14 +248,14 @@ class TMBackup(object):
         """
         Start Time Machine backup.
         """
-        pydoni.syscmd('%s startbackup' % self.bin)
+        pydoni.sh.run([self.bin, 'startbackup'])
         self.logger.info('Started TM backup')
 
     def stop(self):
         """
         Stop Time Machine backup.
         """
-        pydoni.syscmd('%s stopbackup' % self.bin)
+        pydoni.sh.run([self.bin, 'stopbackup'])
         self.logger.info('Stopped TM backup')
 
     def log_sql(self, pg_dbname, pg_user, pg_schema='code', pg_table='timemachine'):
@@ -393,38 +383,38 @@ def macos_notify(
     cl_string = []
     if title is not None:
         assert isinstance(title, str)
-        cl_string.append('-title {!r}'.format(title))
+        cl_string += ['-title', title]
 
     if subtitle is not None:
         assert isinstance(subtitle, str)
-        cl_string.append('-subtitle {!r}'.format(subtitle))
+        cl_string += ['-subtitle', subtitle]
 
     if message is not None:
         assert isinstance(message, str)
-        cl_string.append('-message {!r}'.format(message))
+        cl_string += ['-message', message]
 
     if app_icon is not None:
         assert isinstance(app_icon, str)
         assert os.path.isfile(app_icon)
-        cl_string.append('-appIcon {!r}'.format(app_icon))
+        cl_string += ['-appIcon', app_icon]
 
     if content_image is not None:
         assert isinstance(content_image, str)
         assert os.path.isfile(content_image)
-        cl_string.append('-contentImage {!r}'.format(content_image))
+        cl_string += ['-contentImage', content_image]
 
     assert isinstance(open_iterm, bool)
 
     if open_iterm:
-        cl_string.append("-execute 'open /Applications/iTerm.app'")
+        cl_string += ['-execute', 'open /Applications/iTerm.app']
 
     elif command is not None:
         assert isinstance(command, str)
-        cl_string.append('-execute {!r}'.format(command))
+        cl_string += ['-execute', command]
 
     # Build final command and execute
-    cmd = '{} {}'.format(bin, ' '.join(cl_string))
-    pydoni.syscmd(cmd)
+    cmd = [bin] + cl_string
+    pydoni.sh.run(cmd)
 
 
 def find_drives(external_only=False):
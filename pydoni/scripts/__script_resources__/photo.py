@@ -85,7 +85,11 @@ class MediaFile(Convention, Extension):
         self.mtype = self.parse_media_type()
         self.remove_flag = True if self.mtype == 'remove' else False
 
-        self.exif = pydoni.sh.EXIF(self.fpath_abs).extract()
+        # Extract only the tags used by `build_fname()`
+        self.exif = pydoni.sh.EXIF(self.fpath_abs).extract(tags=[
+            'CreateDate', 'FileModifyDate', 'ImageWidth', 'VideoSize', 'VideoAvgFrameRate',
+            'VideoFrameRate', 'CameraModelName', 'DeviceModelName', 'Model', 'Make',
+            'DeviceManufacturer', 'CompressorName'])
 
         self.logger.logvars(locals())
 
@@ -7,12 +7,20 @@ from pydoni.scripts.__script_resources__.movie import parse_omdb_ratings
 from pydoni.scripts.__script_resources__.movie import query_omdb
 
 
-def refresh_movie_imdb_table(schema, table, omdbapikey, verbose=False):
+def refresh_movie_imdb_table(schema, table, omdbapikey, verbose=False, sink=None, resume=None):
     """
     Query Postgres table containing IMDB metadata and refresh any values that need updating.
+
+    :param sink: [optional] stream per-movie results to this sink rather than collecting them
+                 in memory
+    :type sink: pydoni.sink.ResultSink
+    :param resume: [optional] skip movies already recorded in `sink`. Defaults to the sink's
+                   own `resume` mode, which it must agree with
+    :type resume: bool
     """
     pydoni.pydonicli_register({'command_name': pydoni.what_is_my_name(with_modname=True)})
-    args, result = pydoni.pydonicli_declare_args(locals()), dict()
+    args = pydoni.pydonicli_declare_args({k: v for k, v in locals().items() if k != 'sink'})
+    result = dict() if sink is None else sink
     pydoni.pydonicli_register({k: v for k, v in locals().items() if k in ['args', 'result']})
 
     result_items = ['status', 'message', 'updated_values']
@@ -75,65 +83,79 @@ def refresh_movie_imdb_table(schema, table, omdbapikey, verbose=False):
 
         return upd
 
-    pg = pydoni.db.Postgres()
-    pkey_name = 'movie_id'
-    df = pg.read_table(schema, table).sort_values(pkey_name)
-    cols = pg.colnames(schema=schema, table=table)
-
-    if verbose:
-        pbar = tqdm(total=len(df), unit='movie')
-
-    for i, row in df.iterrows():
-        movie_name = '{} ({})'.format(row['title'], str(row['release_year']))
-
-        try:
-            omdbresp = query_omdb(title=row['title'], release_year=row['release_year'], omdbapikey=omdbapikey)
-        except requests.exceptions.HTTPError as e:
-            print('Unable to query OMDBAPI!')
-            raise e
-        else:
-            tqdm.write("{} in '{}': {}".format(click.style('ERROR', fg='red'), movie_name, str(e)))
-            result[movie_name] = {k: v for k, v in zip(result_items, ['Error', str(e), None])}
-            if verbose:
-                pbar.update(1)
-
-            continue
-
-        omdbresp = {k: v for k, v in omdbresp.items() if k in cols}
-        omdbresp = {k: replace_null(v) for k, v in omdbresp.items()}
+    try:
+        resume = pydoni.sink.resume_mode(sink, resume)
 
-        color_map = {'No change': 'yellow', 'Updated': 'green', 'Not found': 'red'}
-        change = 'Not found' if not len(omdbresp) else 'No change'
+        pg = pydoni.db.Postgres()
+        pkey_name = 'movie_id'
+        df = pg.read_table(schema, table).sort_values(pkey_name)
+        cols = pg.colnames(schema=schema, table=table)
 
-        # Filter out columns and values that do not require an update
-        if change != 'Not found':
-            upd = filter_updated_values(omdbresp, row)
-            change = 'Updated' if len(upd) else change
-            upd['imdb_update_ts'] = datetime.now()
+        completed = sink.completed() if resume else set()
 
-            stmt = pg.build_update(schema,
-                                   table,
-                                   pkey_name=pkey_name,
-                                   pkey_value=row[pkey_name],
-                                   columns=[k for k, v in upd.items()],
-                                   values=[v for k, v in upd.items()],
-                                   validate=True)
-            pg.execute(stmt)
-
-            upd_backend = {k: v for k, v in upd.items() if k != 'imdb_update_ts'}
-            upd_backend = upd_backend if len(upd_backend) else None
-            result[movie_name] = {k: v for k, v in zip(result_items, [change, None, upd_backend])}
+        if verbose:
+            pbar = tqdm(total=len(df), unit='movie')
+
+        for i, row in df.iterrows():
+            movie_name = '{} ({})'.format(row['title'], str(row['release_year']))
+
+            if movie_name in completed:
+                if verbose:
+                    pbar.update(1)
+
+                continue
+
+            try:
+                omdbresp = query_omdb(title=row['title'], release_year=row['release_year'], omdbapikey=omdbapikey)
+            except requests.exceptions.HTTPError as e:
+                print('Unable to query OMDBAPI!')
+                raise e
+            else:
+                tqdm.write("{} in '{}': {}".format(click.style('ERROR', fg='red'), movie_name, str(e)))
+                result[movie_name] = {k: v for k, v in zip(result_items, ['Error', str(e), None])}
+                if verbose:
+                    pbar.update(1)
+
+                continue
+
+            omdbresp = {k: v for k, v in omdbresp.items() if k in cols}
+            omdbresp = {k: replace_null(v) for k, v in omdbresp.items()}
+
+            color_map = {'No change': 'yellow', 'Updated': 'green', 'Not found': 'red'}
+            change = 'Not found' if not len(omdbresp) else 'No change'
+
+            # Filter out columns and values that do not require an update
+            if change != 'Not found':
+                upd = filter_updated_values(omdbresp, row)
+                change = 'Updated' if len(upd) else change
+                upd['imdb_update_ts'] = datetime.now()
+
+                stmt = pg.build_update(schema,
+                                       table,
+                                       pkey_name=pkey_name,
+                                       pkey_value=row[pkey_name],
+                                       columns=[k for k, v in upd.items()],
+                                       values=[v for k, v in upd.items()],
+                                       validate=True)
+                pg.execute(stmt)
+
+                upd_backend = {k: v for k, v in upd.items() if k != 'imdb_update_ts'}
+                upd_backend = upd_backend if len(upd_backend) else None
+                result[movie_name] = {k: v for k, v in zip(result_items, [change, None, upd_backend])}
+
+            else:
+                result[movie_name] = {k: v for k, v in zip(result_items, [change, None, None])}
 
-        else:
-            result[movie_name] = {k: v for k, v in zip(result_items, [change, None, None])}
+            if verbose:
+                pbar.update(1)
+                space = '  ' if change == 'Updated' else ''
+                tqdm.write(click.style(change, fg=color_map[change]) + space + ': ' + movie_name)
 
         if verbose:
-            pbar.update(1)
-            space = '  ' if change == 'Updated' else ''
-            tqdm.write(click.style(change, fg=color_map[change]) + space + ': ' + movie_name)
-
-    if verbose:
-        pbar.close()
-        pydoni.vb.program_complete('Movie refresh complete!')
+            pbar.close()
+            pydoni.vb.program_complete('Movie refresh complete!')
+    finally:
+        if sink is not None:
+            sink.close()
 
     pydoni.pydonicli_register({k: v for k, v in locals().items() if k in ['args', 'result']})
@@ -10,7 +10,9 @@ def rename_mediafile(
         initials='AKS',
         tz_adjust=0,
         verbose=False,
-        notify=False):
+        notify=False,
+        sink=None,
+        resume=None):
     """
     Rename a photo or video file according to a specified file naming convention.
 
@@ -24,9 +26,16 @@ def rename_mediafile(
     :type tz_adjust: int
     :param verbose: print messages and progress bar to console
     :type verbose: bool
+    :param sink: [optional] stream per-file results to this sink rather than collecting them
+                 in memory
+    :type sink: pydoni.sink.ResultSink
+    :param resume: [optional] skip files already recorded in `sink`. Defaults to the sink's
+                   own `resume` mode, which it must agree with
+    :type resume: bool
     """
     pydoni.pydonicli_register({'command_name': pydoni.what_is_my_name(with_modname=True)})
-    args, result = pydoni.pydonicli_declare_args(locals()), dict()
+    args = pydoni.pydonicli_declare_args({k: v for k, v in locals().items() if k != 'sink'})
+    result = dict() if sink is None else sink
     pydoni.pydonicli_register({k: v for k, v in locals().items() if k in ['args', 'result']})
 
     import os, re, click
@@ -64,52 +73,62 @@ def rename_mediafile(
     CONV = Convention()
     EXT = Extension()
 
-    mediafiles = [os.path.abspath(x) for x in mediafiles \
-        if not re.match(CONV.photo, os.path.basename(x)) \
-        and not re.match(CONV.video, os.path.basename(x))]
+    try:
+        resume = pydoni.sink.resume_mode(sink, resume)
 
-    msg = 'Renaming %s media files' % str(len(mediafiles))
-    logger.info(msg)
-    if verbose:
-        pydoni.vb.verbose_header(msg)
-        pbar = tqdm(total=len(mediafiles), unit='mediafile')
+        mediafiles = [os.path.abspath(x) for x in mediafiles \
+            if not re.match(CONV.photo, os.path.basename(x)) \
+            and not re.match(CONV.video, os.path.basename(x))]
 
-    if not len(mediafiles):
-        if verbose:
-            echo('No files to rename!', fg='green')
+        if resume:
+            completed = sink.completed()
+            mediafiles = [x for x in mediafiles if os.path.basename(x) not in completed]
 
-    for mfile in mediafiles:
+        msg = 'Renaming %s media files' % str(len(mediafiles))
+        logger.info(msg)
         if verbose:
-            pbar.set_postfix(mediafile=pydoni.vb.stabilize_postfix(mfile, max_len=15))
+            pydoni.vb.verbose_header(msg)
+            pbar = tqdm(total=len(mediafiles), unit='mediafile')
 
-        mf = MediaFile(mfile)
-        newfname = mf.build_fname(initials=initials, tz_adjust=tz_adjust)
-        newfname = os.path.join(os.path.dirname(mfile), os.path.basename(newfname))
+        if not len(mediafiles):
+            if verbose:
+                echo('No files to rename!', fg='green')
 
-        if os.path.basename(mfile) != os.path.basename(newfname):
-            os.rename(mfile, newfname)
-            result[os.path.basename(mfile)] = os.path.basename(newfname)
+        for mfile in mediafiles:
             if verbose:
-                tqdm.write('{}: {} -> {}'.format(
-                    click.style('Renamed', fg='green'),
-                    os.path.basename(mfile),
-                    os.path.basename(newfname)))
-        else:
-            result[os.path.basename(mfile)] = '<not renamed, new filename identical>'
+                pbar.set_postfix(mediafile=pydoni.vb.stabilize_postfix(mfile, max_len=15))
+
+            mf = MediaFile(mfile)
+            newfname = mf.build_fname(initials=initials, tz_adjust=tz_adjust)
+            newfname = os.path.join(os.path.dirname(mfile), os.path.basename(newfname))
+
+            if os.path.basename(mfile) != os.path.basename(newfname):
+                os.rename(mfile, newfname)
+                result[os.path.basename(mfile)] = os.path.basename(newfname)
+                if verbose:
+                    tqdm.write('{}: {} -> {}'.format(
+                        click.style('Renamed', fg='green'),
+                        os.path.basename(mfile),
+                        os.path.basename(newfname)))
+            else:
+                result[os.path.basename(mfile)] = '<not renamed, new filename identical>'
+                if verbose:
+                    tqdm.write('{}: {}'.format(
+                        click.style('Not renamed', fg='red'),
+                        os.path.basename(mfile)))
+
             if verbose:
-                tqdm.write('{}: {}'.format(
-                    click.style('Not renamed', fg='red'),
-                    os.path.basename(mfile)))
+                pbar.update(1)
 
         if verbose:
-            pbar.update(1)
-
-    if verbose:
-        pbar.close()
-        echo('Renamed media files: %s' % str(len(mediafiles)), indent=2)
+            pbar.close()
+            echo('Renamed media files: %s' % str(len(mediafiles)), indent=2)
 
-    if verbose or notify:
-        pydoni.os.macos_notify(title='Mediafile Rename', message='Completed successfully!')
+        if verbose or notify:
+            pydoni.os.macos_notify(title='Mediafile Rename', message='Completed successfully!')
+    finally:
+        if sink is not None:
+            sink.close()
 
     pydoni.pydonicli_register({k: v for k, v in locals().items() if k in ['args', 'result']})
 
@@ -149,13 +168,13 @@ def website_extract_image_titles(website_export_dir, outfile, verbose):
     if verbose:
         echo('Files found: ' + str(len(files)))
         echo('Extracting EXIF metadata...')
-        exifd = pydoni.sh.EXIF(files).extract()
+        exifd = pydoni.sh.EXIF(files).extract(tags='Title')
         echo('EXIF metadata successfully extracted')
 
         if outfile is not None:
             echo('Writing output datafile: ' + outfile)
     else:
-        exifd = pydoni.sh.EXIF(files).extract()
+        exifd = pydoni.sh.EXIF(files).extract(tags='Title')
 
     i = 0
     tracker = pd.DataFrame(columns=['collection', 'file', 'title'])
@@ -170,7 +189,7 @@ def website_extract_image_titles(website_export_dir, outfile, verbose):
             collection += ' - ' + subcollection
 
         exif = exifd[os.path.join(website_export_dir, file)]
-        title = exif['Title'] if 'Title' in exif.keys() else ''
+        title = exif['title'] if 'title' in exif.keys() else ''
         year = fname[0:4]
         title = str(year) + ' ' + str(title)
 
@@ -1,17 +1,34 @@
+import functools
+import os
 import pydoni
-import pydoni.vb
+import pydoni.cache
+import pydoni.governor
+import pydoni.memprof
+import pydoni.trace
+import threading
+import types
 
 
+@pydoni.governor.tool('exiftool', weight=1)
 class EXIF(object):
     """
     Extract and operate on EXIF metadata from a media file or multiple files. Wrapper for
     `exiftool` by Phil Harvey system command.
 
+    Commands run in the `exiftool` sessions of the pool returned by `exiftool_pool()`, shared
+    by all instances, unless `pool` is False.
+
     :param fname: full path to target filename or list of filenames
     :type fname: str, list
+    :param pool: [optional] pool of `exiftool` sessions to run commands in, True for the shared
+                 pool, or False to start an `exiftool` process per command
+    :type pool: bool, ExifToolPool
     """
 
-    def __init__(self, fpath):
+    # Maximum number of files extracted by a single `exiftool` command
+    extract_batch_size = 500
+
+    def __init__(self, fpath, pool=True):
         import os
         import subprocess
         import pydoni
@@ -24,9 +41,20 @@ class EXIF(object):
 
         self.is_batch = len(self.fpath) > 1
         self.bin = pydoni.sh.find_binary('exiftool')
+        if not os.path.isfile(self.bin):
+            # Removed since it was found and cached, look it up again
+            pydoni.sh._forget_binary(self.bin)
+            self.bin = pydoni.sh.find_binary('exiftool')
 
         assert os.path.isfile(self.bin)
 
+        if pool is True:
+            self.pool = exiftool_pool()
+        else:
+            self.pool = pool or None
+
+        self.written = {}  # Whether each file was written by the last `write()` or `remove()`
+
         self.logger = pydoni.logger_setup(
             name=pydoni.what_is_my_name(classname=self.__class__.__name__, with_modname=True),
             level=pydoni.modloglev)
@@ -35,241 +63,408 @@ class EXIF(object):
         self.logger.var('self.is_batch', self.is_batch)
         self.logger.var('self.bin', self.bin)
 
-        self.logger.info('EXIF class initialized for file{}: {}'.format(
-            's' if self.is_batch else '', str(self.fpath)))
-
-    def extract(self, method='doni', clean=True):
+        self.logger.sample('EXIF class initialized for file%s: %s',
+                           's' if self.is_batch else '', str(self.fpath))
+
+    @pydoni.trace.traced()
+    @pydoni.memprof.profiled()
+    def extract(self,
+                method='doni',
+                clean=True,
+                numeric=False,
+                cache=True,
+                tags=None,
+                groups=None,
+                fast=None):
         """
-        Extract EXIF metadata from file or files.
+        Extract EXIF metadata from file or files. If a persistent cache is set with
+        `set_exif_cache()`, only files that are new or changed since their metadata was cached
+        are passed to `exiftool`.
+
+        Extracting only the tags or groups a caller uses saves `exiftool` from formatting every
+        tag it knows, including embedded previews and artwork.
 
         :param method: method for metadata extraction, one of 'doni' or 'pyexiftool'
         :type method: str
         :param clean: apply EXIF.clean() to EXIF output
         :type clean: bool
+        :param numeric: extract values without print conversion (`exiftool -n`), i.e. 0.004
+                        rather than '1/250' for an exposure time
+        :type numeric: bool
+        :param cache: use the persistent cache set with `set_exif_cache()`, if any
+        :type cache: bool
+        :param tags: [optional] extract only these tags, by `exiftool` tag name, i.e. 'Title'
+        :type tags: str, list
+        :param groups: [optional] extract only tags of these groups, i.e. 'EXIF' or 'ID3'.
+                       Combined with `tags`, tags of the groups are extracted as well
+        :type groups: str, list
+        :param fast: [optional] read less of each file: 1 (`-fast`) to not scan to the end of
+                     a file for trailers, 2 (`-fast2`) to also skip maker notes
+        :type fast: int
         :return: EXIF metadata
         :rtype: dict
         """
-        import re
-        import os
-        from xml.etree import ElementTree
-        from collections import defaultdict
-        import subprocess
-
         assert method in ['doni', 'pyexiftool']
 
         self.logger.var('self.method', method)
         self.logger.var('self.clean', clean)
 
-        def split_cl_filenames(files, char_limit, bin_path):
-            """
-            Determine at which point to split list of filenames to comply with command-line
-            character limit, and split list of filenames into list of lists, where each sublist
-            represents a batch of files to run `exiftool` on, where the entire call to `exiftool`
-            for that batch will be under the maximum command-line character limit. Files must
-            be broken into batches if there are too many to fit on in command-line command,
-            because the `exiftool` syntax is as follows:
-
-            exiftool filename_1 filename_2 filename_3 ... filename_n
-
-            With too many files, the raw length of the call to `exiftool` might be over the
-            character limit.
-
-            :param files: path to file or files to run exiftool on
-            :type files: list
-            :param char_limit: character limit of operating system's command-line character limit
-            :type char_limit: int
-            :param bin_path: path to exiftool binary
-            :type bin_path: str
-            :return: list of filenames to run exiftool on
-            :rtype: list
-            """
-
-            self.logger.var('files', files)
-            self.logger.var('char_limit', char_limit)
-            self.logger.var('bin_path', bin_path)
+        self.logger.info("Running with method: " + method)
 
-            split_idx = []
-            count = 0
+        if method == 'doni':
+            from concurrent.futures import ThreadPoolExecutor
 
-            # Get character length of each filename
-            str_lengths = [len(x) for x in files]
+            options = self._extract_options(numeric, tags, groups, fast)
+            cache, variant, found, files, identities = self._cache_lookup(cache, options, clean)
+            batches = self._extract_batches(files)
 
-            # Get indices to split at depending on character limit
-            for i in range(len(str_lengths)):
-                # Account for two double quotes and a space
-                val = str_lengths[i] + 3
-                count = count + val
-                if count > char_limit - len(bin_path + ' '):
-                    split_idx.append(i)
-                    count = 0
+            self.logger.info("Extracting EXIF for files: " + str(len(files)))
+            self.logger.info("Batches to run: " + str(len(batches)))
 
-            # Split list of filenames into list of lists at the indices gotten in
-            # the previous step
-            return pydoni.split_at(files, split_idx)
+            try:
+                if len(batches) > 1:
+                    workers = min(len(batches), self._extract_workers())
+                    with ThreadPoolExecutor(max_workers=workers) as executor:
+                        results = list(executor.map(
+                            lambda batch: self._extract_batch(options, batch), batches))
+                else:
+                    results = [self._extract_batch(options, batch) for batch in batches]
 
-        def etree_to_dict(t):
-            """
-            Convert XML ElementTree to dictionary.
+            except Exception as e:
+                self.logger.exception("Failed in executing `exiftool` system command")
+                raise e
 
-            Source: https://stackoverflow.com/questions/7684333/converting-xml-to-dictionary-using-elementtree
+            # Merge batches in order, so that files are in the order they were given
+            exifd = {}
+            for result in results:
+                exifd.update(result)
 
-            :param t: XML ElementTree
-            :type t: ElementTree
-            :return: dictionary
-            :rtype: dict
-            """
+            exifd = self._extract_finish(exifd, clean)
+            return self._cache_store(exifd, cache, variant, found, identities)
 
-            self.logger.var('t', t)
+        elif method == 'pyexiftool':
+            import exiftool
+            with exiftool.ExifTool() as et:
+                if self.is_batch:
+                    exifd = et.get_metadata_batch(self.fpath)
+                else:
+                    exifd = et.get_metadata(self.fpath)
 
-            d = {t.tag: {} if t.attrib else None}
-            children = list(t)
+            return exifd
 
-            if children:
-                dd = defaultdict(list)
-                for dc in map(etree_to_dict, children):
-                    for k, v in dc.items():
-                        dd[k].append(v)
-                d = {t.tag: {k: v[0] if len(v) == 1 else v
-                             for k, v in dd.items()}}
+    @classmethod
+    def scan(cls,
+             root,
+             ext=None,
+             recursive=True,
+             clean=True,
+             numeric=False,
+             tags=None,
+             groups=None,
+             fast=None,
+             progress=None):
+        """
+        Extract EXIF metadata from all files in a directory tree, yielding each file's metadata
+        as soon as `exiftool` outputs it. The tree is traversed by `exiftool` itself (`-r`,
+        `-ext`), and neither the list of files nor their metadata is held in memory, so memory
+        use stays flat however large the tree.
+
+        Unlike `extract()`, the scan runs in its own `exiftool` process rather than in a pool
+        session, and does not use the persistent cache.
+
+            for fpath, exifd in pydoni.sh.EXIF.scan('~/Pictures', ext=['jpg', 'dng']):
+                ...
+
+        :param root: path to directory to scan
+        :type root: str
+        :param ext: [optional] extract only files with these extensions, i.e. 'jpg'. Otherwise
+                    `exiftool` extracts all files of types it supports
+        :type ext: str, list
+        :param recursive: scan subdirectories
+        :type recursive: bool
+        :param clean: apply EXIF.clean() to EXIF output
+        :type clean: bool
+        :param numeric: extract values without print conversion (`exiftool -n`)
+        :type numeric: bool
+        :param tags: [optional] extract only these tags, by `exiftool` tag name
+        :type tags: str, list
+        :param groups: [optional] extract only tags of these groups
+        :type groups: str, list
+        :param fast: [optional] read less of each file, 1 (`-fast`) or 2 (`-fast2`)
+        :type fast: int
+        :param progress: [optional] True to print a tqdm progress bar, or function called with
+                         the number of files extracted so far and the path to the last one
+        :type progress: bool, function
+        :return: generator of tuples of path to file and its EXIF metadata
+        :rtype: generator
+        """
+        import os
 
-            if t.attrib:
-                d[t.tag].update(('@' + k, v)
-                                for k, v in t.attrib.items())
+        root = os.path.abspath(os.path.expanduser(root))
+        assert os.path.isdir(root)
 
-            if t.text:
-                text = t.text.strip()
-                if children or t.attrib:
-                    if text:
-                      d[t.tag]['#text'] = text
-                else:
-                    d[t.tag] = text
+        self = cls([], pool=False)
 
-            return d
+        args = self._extract_options(numeric, tags, groups, fast)
+        if recursive:
+            args.append('-r')
+        for e in pydoni.ensurelist(ext) if ext else []:
+            e = e.lstrip('.')
+            assert e and not any(c.isspace() for c in e)
+            args += ['-ext', e]
 
-        def unnest_http_keynames(d):
-            """
-            Iterate over dictionary and test for key:value pairs where `value` is a
-            dictionary with a key name in format "{http://...}". Iterate down until the
-            terminal value is retrieved, then return that value to the original key name `key`
-
-            :param d: dictionary to iterate over
-            :type d: dict
-            :returns: dictionary with simplified key:value pairs
-            :rtype: dict
-            """
-            self.logger.var('d', d)
+        self.logger.info("Scanning EXIF of files in: " + root)
 
-            tmpd = {}
+        pbar = None
+        if progress is True:
+            from tqdm import tqdm
+            pbar = tqdm(unit='file')
 
-            for k, v in d.items():
+        stream = pydoni.syscmd_stream([self.bin] + args + [root], mode='chunks', encoding='utf-8')
+        count = 0
 
-                while isinstance(v, dict) and len(v) == 1:
-                    key = list(v.keys())[0]
-                    if re.search(r'\{http:\/\/.*\}', key):
-                        v = v[key]
-                    else:
-                        break
+        try:
+            for fpath, record in self._iter_json(stream):
+                exifd = {fpath: record}
+                if clean:
+                    exifd = self.clean_values(self.clean_keys(exifd))
 
-                tmpd[k] = v
+                count += 1
+                if pbar is not None:
+                    pbar.update(1)
+                elif progress:
+                    progress(count, fpath)
 
-            return tmpd
+                yield fpath, exifd[fpath]
 
+        finally:
+            if pbar is not None:
+                pbar.close()
 
-        self.logger.info("Running with method: " + method)
+        if stream.returncode != 0:
+            self.logger.warning("`exiftool` exited with status %s scanning %s: %s"
+                                % (stream.returncode, root, stream.stderr.strip()))
 
-        if method == 'doni':
-            num_files = len(self.fpath) if self.is_batch else 1
-            self.logger.info("Extracting EXIF for files: " + str(num_files))
-            self.logger.info("Exiftool binary found: " + self.bin)
+        self.logger.info("Scanned EXIF of files: " + str(count))
 
-            char_limit = int(pydoni.syscmd("getconf ARG_MAX")) - 25000
-            self.logger.info("Using char limit: " + str(char_limit))
+    def _extract_options(self, numeric, tags=None, groups=None, fast=None):
+        """
+        Get the `exiftool` options extracting EXIF metadata as JSON, see `extract()`.
 
-            file_batches = split_cl_filenames(self.fpath, char_limit, self.bin)
-            self.logger.info("Batches to run: " + str(len(file_batches)))
+        :param numeric: extract values without print conversion
+        :type numeric: bool
+        :param tags: [optional] tag names to extract
+        :type tags: str, list
+        :param groups: [optional] group names to extract all tags of
+        :type groups: str, list
+        :param fast: [optional] `exiftool` fast level
+        :type fast: int
+        :rtype: list
+        """
+        options = ['-json', '-n'] if numeric else ['-json']
 
-            commands = []
-            for batch in file_batches:
-                cmd = self.bin + ' -xmlFormat ' + ' '.join(['"' + f + '"' for f in batch]) + ' ' + '2>/dev/null'
-                commands.append(cmd)
+        if fast:
+            assert fast in [1, 2]
+            options.append('-fast' if fast == 1 else '-fast2')
 
-            exifd = {}
+        tags = pydoni.ensurelist(tags) if tags else []
+        groups = pydoni.ensurelist(groups) if groups else []
+        for name in tags + groups:
+            # Names are passed as options, so must not be mistaken for another option
+            assert name and not name.startswith('-') and not any(c.isspace() for c in name)
 
-            for i, cmd in enumerate(commands):
-                self.logger.info("Running batch %s of %s. Total files: %s" % \
-                    (str(i+1), str(len(file_batches)), str(len(file_batches[i]))))
+        options += ['-' + tag for tag in tags]
+        options += ['-{}:all'.format(group) for group in groups]
 
-                try:
-                    # xmlstring = pydoni.syscmd(cmd).decode('utf-8')
-                    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, shell=True)
-                    xmlstring, err = proc.communicate()
-                    xmlstring = xmlstring.decode('utf-8')
-                except Exception as e:
-                    self.logger.exception("Failed in executing `exiftool` system command")
-                    raise e
+        return options
 
-                try:
-                    root = ElementTree.fromstring(xmlstring)
-                    elist = etree_to_dict(root)
-                    elist = elist['{http://www.w3.org/1999/02/22-rdf-syntax-ns#}RDF']
-                    elist = elist['{http://www.w3.org/1999/02/22-rdf-syntax-ns#}Description']
-                    if isinstance(elist, dict):
-                        elist = [elist]
+    def _extract_batches(self, files):
+        """
+        Split files into batches extracted in parallel, one per `exiftool` session or CPU,
+        of at most `extract_batch_size` files each so that work is spread evenly.
 
-                except Exception as e:
-                    self.logger.info("Failed in coercing ElementTree to dictionary")
-                    raise e
+        :param files: paths to files to extract EXIF metadata of
+        :type files: list
+        :return: list of batches, each a list of paths
+        :rtype: list
+        """
+        import math
 
-                for d in elist:
-                    tmpd = {}
+        size = math.ceil(len(files) / self._extract_workers())
+        size = min(max(size, 1), self.extract_batch_size)
 
-                    # Clean dictionary keys in format @{http://...}KeyName
-                    for k, v in d.items():
-                        new_key = re.sub(r'@?\{.*\}', '', k)
-                        tmpd[new_key] = v
+        return [files[i:i + size] for i in range(0, len(files), size)]
 
-                    # Unnest nested dictionary elements with "http://..." as the keys
-                    tmpd = unnest_http_keynames(tmpd)
+    def _extract_workers(self):
+        """
+        Get the number of batches extracted at once.
 
-                    fnamekey = os.path.join(tmpd['Directory'], tmpd['FileName'])
-                    exifd[fnamekey] = tmpd
+        :rtype: int
+        """
+        import os
 
-                del elist
+        return self.pool.size if self.pool is not None else os.cpu_count() or 1
 
-            self.logger.info("Successfully extracted EXIF metadata for named file(s)")
+    def _extract_batch(self, options, batch):
+        """
+        Extract EXIF metadata of a batch of files with a single `exiftool` command. Filenames
+        are listed in a temporary argfile (`-@`), or sent to a session which reads its arguments
+        as an argfile already, so that there is no limit on the number of files in a batch.
+        Each file's record is parsed as soon as `exiftool` outputs it.
+
+        :param options: options built by `_extract_options()`
+        :type options: list
+        :param batch: paths to files
+        :type batch: list
+        :return: EXIF metadata
+        :rtype: dict
+        """
+        import os
 
-            if clean:
-                exifd = self.clean_keys(exifd)
-                exifd = self.clean_values(exifd)
+        with pydoni.trace.span('exiftool', files=len(batch)):
+            if self.pool is not None:
+                exifd, receive = self._json_receiver()
+                self.pool.execute(options + batch, on_stdout=receive)
+                receive(None)
                 return exifd
+
+            cmd, argfile = self._argfile_command(options, batch)
+            try:
+                stream = pydoni.syscmd_stream(cmd, mode='chunks', encoding='utf-8')
+                return self._parse_json(stream)
+            finally:
+                os.remove(argfile)
+
+    def _parse_json(self, chunks):
+        """
+        Parse `exiftool -json` output into a dictionary of EXIF metadata by filename.
+
+        :param chunks: output of `exiftool -json`, in chunks
+        :type chunks: iterable
+        :return: EXIF metadata
+        :rtype: dict
+        """
+        return dict(self._iter_json(chunks))
+
+    def _iter_json(self, chunks):
+        """
+        Parse `exiftool -json` output, yielding the EXIF metadata of each file as it arrives.
+
+        :param chunks: output of `exiftool -json`, in chunks
+        :type chunks: iterable
+        :return: generator of tuples of filename and EXIF metadata
+        :rtype: generator
+        """
+        records = _JSONRecords(self.logger)
+        for chunk in chunks:
+            yield from records.feed(chunk)
+
+        records.close()
+
+    def _json_receiver(self):
+        """
+        Get a function receiving the standard output of an `exiftool -json` command run in a
+        session in chunks, passed as `on_stdout` to `ExifToolPool.execute()`, which parses each
+        file's record as soon as it is complete. Call it with None once the command is done.
+
+        :return: tuple of EXIF metadata by filename, filled in as records are parsed, and the
+                 function receiving output
+        :rtype: tuple
+        """
+        import codecs
+
+        decoder = codecs.getincrementaldecoder('utf-8')('replace')
+        records = _JSONRecords(self.logger)
+        exifd = {}
+
+        def receive(data):
+            if data is None:
+                exifd.update(records.feed(decoder.decode(b'', final=True)))
+                records.close()
             else:
-                return exifd
+                exifd.update(records.feed(decoder.decode(data)))
 
-        elif method == 'pyexiftool':
-            import exiftool
-            with exiftool.ExifTool() as et:
-                if self.is_batch:
-                    exifd = et.get_metadata_batch(self.fpath)
-                else:
-                    exifd = et.get_metadata(self.fpath)
+        return exifd, receive
+
+    def _cache_lookup(self, use_cache, options, clean):
+        """
+        Look up the cached EXIF metadata of all files, if there is a persistent cache. Results
+        are cached separately for each combination of `exiftool` options and `clean`.
+
+        :param use_cache: use the persistent cache, if any
+        :type use_cache: bool
+        :param options: options built by `_extract_options()`
+        :type options: list
+        :param clean: results are cleaned
+        :type clean: bool
+        :return: tuple of cache (None if not used), variant of results, EXIF metadata found by
+                 filename, files to extract EXIF metadata of, and identities of files taken
+                 before extraction
+        :rtype: tuple
+        """
+        cache = exif_cache() if use_cache else None
+        if cache is None:
+            return None, None, {}, self.fpath, None
+
+        variant = ' '.join(options + ['clean' if clean else 'raw'])
+        identities = cache.identify(self.fpath)
+        found, missing = cache.get_many(self.fpath, variant, identities=identities)
+        self.logger.info("EXIF cache hits: %s, misses: %s" % (len(found), len(missing)))
 
+        return cache, variant, found, missing, identities
+
+    def _cache_store(self, exifd, cache, variant, found, identities):
+        """
+        Cache extracted EXIF metadata, and merge it with the metadata found in the cache in the
+        order of `self.fpath`.
+
+        :param exifd: extracted EXIF metadata
+        :type exifd: dict
+        :param cache: cache returned by `_cache_lookup()`, or None
+        :type cache: pydoni.cache.FileCache
+        :param variant: variant of results returned by `_cache_lookup()`
+        :type variant: str
+        :param found: EXIF metadata found in the cache
+        :type found: dict
+        :param identities: identities of files returned by `_cache_lookup()`, so that metadata
+                           of a file changed during extraction is not cached as current
+        :type identities: dict
+        :return: EXIF metadata of all files
+        :rtype: dict
+        """
+        if cache is None:
             return exifd
 
+        cache.set_many(exifd, variant, identities=identities)
+        exifd.update(found)
+
+        return {file: exifd[file] for file in self.fpath if file in exifd}
+
+    def _extract_finish(self, exifd, clean):
+        """
+        Log and optionally clean extracted EXIF metadata.
+        """
+        self.logger.info("Successfully extracted EXIF metadata for named file(s)")
+
+        if clean:
+            exifd = self.clean_keys(exifd)
+            exifd = self.clean_values(exifd)
+
+        return exifd
+
     def write(self, tags, values):
         """
-        Write EXIF attribute(s) on a file or list of files.
+        Write EXIF attribute(s) on a file or list of files. All tags are written to each file
+        in a single pass, by a single `exiftool` command run on all files.
 
         :param tags: tag names to write to
         :type tags: str, list
         :param values: desired tag values
         :type values: str, list
-        :return: True
+        :return: True if all files were written. Whether each file was written is set as
+                 `self.written`, by filename
         :rtype: bool
         """
-
-        import pydoni
-        import pydoni.sh
-
         self.logger.var('tags', tags)
         self.logger.var('values', values)
 
@@ -283,58 +478,49 @@ class EXIF(object):
         self.logger.info("Tags to write: " + str(tags))
         self.logger.info("Values to write: " + str(values))
 
-        for file in self.fpath:
-            self.logger.info("File: " + file)
-
-            for tag, value in zip(tags, values):
+        res = self._execute_batch(self._write_args(tags, values))
+        self.written = self._check_batch_results(
+            res, 'Tags: %s | Values: %s' % (str(tags), str(values)))
 
-                default_cmd = '{} -overwrite_original -{}="{}" "{}"'.format(
-                    self.bin, tag, str(value), file)
+        return all(self.written.values())
 
-                if tag == 'Keywords':
-                    # Must be written in format:
-                    # exiftool -keywords=one -keywords=two -keywords=three FILE
-                    # Otherwise, comma-separated keywords will be written as a single string
-                    if isinstance(value, str):
-                        if ',' in value:
-                            value = value.split(', ')
-
-                    if isinstance(value, list):
-                        if len(value) > 1:
-                            kwd_cmd = ' '.join(['-keywords="' + str(x) + '"' for x in value])
-
-                    if 'kwd_cmd' in locals():
-                        cmd = '{} -overwrite_original {} "{}"'.format(
-                            self.bin, kwd_cmd, file)
-                    else:
-                        cmd = default_cmd
+    def _write_args(self, tags, values):
+        """
+        Build `exiftool` arguments writing tag values.
 
-                else:
-                    cmd = default_cmd
+        :param tags: tag names to write to
+        :type tags: list
+        :param values: desired tag values
+        :type values: list
+        :return: list of arguments, without filenames
+        :rtype: list
+        """
+        args = ['-overwrite_original']
 
-                try:
-                    self.logger.var('cmd', cmd)
-                    res = pydoni.syscmd(cmd, encoding='utf-8')
-                    self.logger.var('res', res)
+        for tag, value in zip(tags, values):
+            if tag == 'Keywords':
+                # Must be written in format:
+                # exiftool -keywords=one -keywords=two -keywords=three FILE
+                # Otherwise, comma-separated keywords will be written as a single string
+                if isinstance(value, str) and ',' in value:
+                    value = value.split(', ')
 
-                    if self._is_valid_tag_message(res):
-                        self.logger.info("Success. Tag: %s | Value: %s" % (tag, str(value)))
-                    else:
-                        self.logger.info("Failed. Tag: %s | Value: %s" % (tag, str(value)))
+                args += ['-keywords=' + str(x) for x in pydoni.ensurelist(value)]
 
-                except Exception as e:
-                    self.logger.exception("Failed. Tag: %s | Value: %s" % (tag, str(value)))
-                    raise e
+            else:
+                args.append('-{}={}'.format(tag, str(value)))
 
-        return True
+        return args
 
     def remove(self, tags):
         """
-        Remove EXIF attribute from a file or list of files.
+        Remove EXIF attribute from a file or list of files. All tags are removed from each
+        file in a single pass, by a single `exiftool` command run on all files.
 
         :param tags: tag names to remove
         :type tags: str, list
-        :return: True
+        :return: True if all files were written. Whether each file was written is set as
+                 `self.written`, by filename
         :rtype: bool
         """
 
@@ -347,26 +533,109 @@ class EXIF(object):
         self.logger.info("Files to remove EXIF metadata from: " + str(len(self.fpath)))
         self.logger.info("Tags to remove: " + str(tags))
 
-        for file in self.fpath:
-            self.logger.info("File: " + file)
+        res = self._execute_batch(self._remove_args(tags))
+        self.written = self._check_batch_results(res, 'Tags: %s' % str(tags))
+        return all(self.written.values())
+
+    def _remove_args(self, tags):
+        """
+        Build `exiftool` arguments removing tags.
 
-            for tag in tags:
-                cmd = '{} -overwrite_original -{}= "{}"'.format(self.bin, tag, file)
+        :param tags: tag names to remove
+        :type tags: list
+        :return: list of arguments, without filenames
+        :rtype: list
+        """
+        return ['-overwrite_original'] + ['-{}='.format(tag) for tag in tags]
+
+    def _execute_batch(self, args):
+        """
+        Run a single `exiftool` command applying `args` to all files. A session reads its
+        arguments as an argfile already, and a separate process is given the filenames in a
+        temporary argfile (`-@`), so that any number of files fits in one command.
 
-                try:
-                    self.logger.var('cmd', cmd)
-                    res = pydoni.syscmd(cmd, encoding='utf-8')
-                    self.logger.var('res', res)
+        :param args: arguments, without filenames
+        :type args: list
+        :rtype: subprocess.CompletedProcess
+        """
+        import os
 
-                    if self._is_valid_tag_message(res):
-                        self.logger.info("Success. Tag: %s" % tag)
-                    else:
-                        self.logger.error("ExifTool Error. Tag: %s" % tag)
-                        self.logger.debug('ExifTool output: %s' % str(res))
+        if self.pool is not None:
+            return self.pool.execute(args + self.fpath)
+
+        cmd, argfile = self._argfile_command(args, self.fpath)
+        try:
+            return run(cmd, encoding='utf-8')
+        finally:
+            os.remove(argfile)
+
+    def _argfile_command(self, args, files):
+        """
+        Write filenames to a temporary argfile, one per line, and build an `exiftool` command
+        applying `args` to them. Filenames an argfile would change (see `_argfile_safe()`) are
+        passed as arguments instead. The caller removes the argfile.
+
+        :param args: arguments, without filenames
+        :type args: list
+        :param files: paths to files
+        :type files: list
+        :return: command and path to argfile
+        :rtype: tuple
+        """
+        import os
+        import tempfile
+
+        listed = [f for f in files if _argfile_safe(f)]
+        inline = [f for f in files if not _argfile_safe(f)]
+
+        fd, argfile = tempfile.mkstemp(prefix='pydoni-exiftool-', suffix='.args')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(''.join(fname + '\n' for fname in listed))
 
-                except Exception as e:
-                    self.logger.exception("Failed. Tag: %s" % tag)
-                    raise e
+        return [self.bin] + args + ['-@', argfile] + inline, argfile
+
+    def _check_batch_results(self, res, desc):
+        """
+        Get whether an `exiftool` write applied to all files succeeded for each file.
+        `exiftool` reports errors per file on standard error, as 'Error: <message> - <file>',
+        and a summary of the number of files updated, unchanged and failed on standard output.
+        Error lines are matched against the paths of all files, as filenames may contain ' - '.
+
+        :param res: result of `_execute_batch()`
+        :type res: subprocess.CompletedProcess
+        :param desc: description of the write, for log messages
+        :type desc: str
+        :return: whether each file was written, by filename
+        :rtype: dict
+        """
+        import re
+
+        self.logger.var('res', res)
+
+        errors = [line.rstrip() for line in res.stderr.splitlines() if line.startswith('Error')]
+        failed = {file for file in self.fpath
+                  if any(line.endswith(' - ' + file) for line in errors)}
+
+        # `exiftool` reports 'Nothing to do.' on standard error
+        if not self._is_valid_tag_message(res.stdout + res.stderr):
+            self.logger.error("ExifTool Error. %s" % desc)
+            self.logger.debug('ExifTool output: %s' % str(res.stdout + res.stderr))
+            return {file: False for file in self.fpath}
+
+        results = {}
+        for file in self.fpath:
+            results[file] = file not in failed
+            if results[file]:
+                self.logger.info("Success. File: %s | %s" % (file, desc))
+            else:
+                self.logger.error("Failed. File: %s | %s" % (file, desc))
+
+        summary = re.search(r"(\d+) files weren't updated due to errors", res.stdout)
+        if summary and int(summary.group(1)) != len(self.fpath) - sum(results.values()):
+            self.logger.warning("ExifTool reported %s failed files, but named %s: %s"
+                                % (summary.group(1), len(failed), res.stderr.strip()))
+
+        return results
 
     def clean_values(self, exifd):
         """
@@ -380,6 +649,9 @@ class EXIF(object):
             '2018:02:29 01:28:10' -> '2018-02-29 01:28:10'
             '11.11' -> 11.11
 
+        Only strings are coerced. Numbers and lists, as decoded from `exiftool -json` output,
+        are kept as they are.
+
         :param exifd: dictionary of extracted EXIF metadata
         :type exifd: dict
         :return: dictionary with cleaned values where possible
@@ -414,6 +686,10 @@ class EXIF(object):
             newexifd[file] = {}
 
             for k, v in d.items():
+                if not isinstance(v, str):
+                    newexifd[file][k] = v
+                    continue
+
                 dtype = detect_dtype(v)
                 if dtype in ['bool', 'date', 'datetime', 'int', 'float']:
                     coerced_value = pydoni.test(v, dtype, return_coerced_value=True)
@@ -427,886 +703,33 @@ class EXIF(object):
 
     def clean_keys(self, exifd):
         """
-        Clean EXIF element names.
-        """
-        column_map = {
-            'about': 'about',
-            'About': 'about',
-            'AbsoluteAltitude': 'absolute_altitude',
-            'ActiveArea': 'active_area',
-            'AddAspectRatioInfo': 'add_aspect_ratio_info',
-            'AddIPTCInformation': 'add_iptc_information',
-            'AEBAutoCancel': 'aeb_auto_cancel',
-            'AEBBracketValue': 'aeb_bracket_value',
-            'AEBSequence': 'aeb_sequence',
-            'AEBShotCount': 'aeb_shot_count',
-            'AFAccelDecelTracking': 'af_accel_decel_tracking',
-            'AFAreaHeights': 'af_area_heights',
-            'AFAreaMode': 'af_area_mode',
-            'AFAreaModeSetting': 'af_area_mode_setting',
-            'AFAreaSelectionMethod': 'af_area_selection_method',
-            'AFAreaWidths': 'af_area_widths',
-            'AFAreaXPositions': 'af_area_x_positions',
-            'AFAreaYPositions': 'af_area_y_positions',
-            'AFAssistBeam': 'af_assist_beam',
-            'AFConfigTool': 'af_config_tool',
-            'AFImageHeight': 'af_image_height',
-            'AFImageWidth': 'af_image_width',
-            'AFMicroAdjMode': 'af_micro_adj_mode',
-            'AFMicroAdjValue': 'af_micro_adj_value',
-            'AFPointDisplayDuringFocus': 'af_point_display_during_focus',
-            'AFPointSelected': 'af_point_selected',
-            'AFPointsInFocus': 'af_points_in_focus',
-            'AFPointsSelected': 'af_points_selected',
-            'AFPointsUsed': 'af_points_used',
-            'AFPointSwitching': 'af_point_switching',
-            'AFTracking': 'af_tracking',
-            'AFTrackingSensitivity': 'af_tracking_sensitivity',
-            'AIServoFirstImage': 'ai_servo_first_image',
-            'AIServoSecondImage': 'ai_servo_second_image',
-            'AlreadyApplied': 'already_applied',
-            'AmbientTemperature': 'ambient_temperature',
-            'AnalogBalance': 'analog_balance',
-            'Anti-Blur': 'anti_blur',
-            'AntiAliasStrength': 'anti_alias_strength',
-            'Aperture': 'aperture',
-            'ApertureRange': 'aperture_range',
-            'ApertureValue': 'aperture_value',
-            'ApplicationRecordVersion': 'application_record_version',
-            'Artist': 'artist',
-            'AspectRatio': 'aspect_ratio',
-            'AsShotNeutral': 'as_shot_neutral',
-            'AutoExposureBracketing': 'auto_exposure_bracketing',
-            'AutoISO': 'auto_iso',
-            'AutoLateralCA': 'auto_lateral_ca',
-            'AutoLightingOptimizer': 'auto_lighting_optimizer',
-            'AutoPortraitFramed': 'auto_portrait_framed',
-            'AverageBlackLevel': 'average_black_level',
-            'BaseISO': 'base_iso',
-            'BaselineExposure': 'baseline_exposure',
-            'BaselineNoise': 'baseline_noise',
-            'BaselineSharpness': 'baseline_sharpness',
-            'BatteryLevel': 'battery_level',
-            'BatteryTemperature': 'battery_temperature',
-            'BatteryType': 'battery_type',
-            'BayerGreenSplit': 'bayer_green_split',
-            'BestQualityScale': 'best_quality_scale',
-            'BitDepth': 'bit_depth',
-            'BitsPerSample': 'bits_per_sample',
-            'BlackLevel': 'black_level',
-            'BlackLevelRepeatDim': 'black_level_repeat_dim',
-            'BlackMaskBottomBorder': 'black_mask_bottom_border',
-            'BlackMaskLeftBorder': 'black_mask_left_border',
-            'BlackMaskRightBorder': 'black_mask_right_border',
-            'BlackMaskTopBorder': 'black_mask_top_border',
-            'Blacks2012': 'blacks_2012',
-            'BlueBalance': 'blue_balance',
-            'BlueHue': 'blue_hue',
-            'BlueMatrixColumn': 'blue_matrix_column',
-            'BlueSaturation': 'blue_saturation',
-            'BlueTRC': 'blue_trc',
-            'BracketMode': 'bracket_mode',
-            'BracketShotNumber': 'bracket_shot_number',
-            'BracketValue': 'bracket_value',
-            'Brightness': 'brightness',
-            'BrightnessValue': 'brightness_value',
-            'BulbDuration': 'bulb_duration',
-            'By': 'by',
-            'By-line': 'by_line',
-            'CalibrationIlluminant1': 'calibration_illuminant_1',
-            'CalibrationIlluminant2': 'calibration_illuminant_2',
-            'CameraE': 'camera_e',
-            'CameraE-mountVersion': 'camera_e_mount_version',
-            'CameraISO': 'camera_iso',
-            'CameraOrientation': 'camera_orientation',
-            'CameraProfile': 'camera_profile',
-            'CameraProfileDigest': 'camera_profile_digest',
-            'CameraSerialNumber': 'camera_serial_number',
-            'CameraTemperature': 'camera_temperature',
-            'CameraType': 'camera_type',
-            'CamReverse': 'cam_reverse',
-            'CanonExposureMode': 'canon_exposure_mode',
-            'CanonFirmwareVersion': 'canon_firmware_version',
-            'CanonFlashMode': 'canon_flash_mode',
-            'CanonImageHeight': 'canon_image_height',
-            'CanonImageSize': 'canon_image_size',
-            'CanonImageType': 'canon_image_type',
-            'CanonImageWidth': 'canon_image_width',
-            'CanonModelID': 'canon_model_id',
-            'Caption': 'caption',
-            'Caption-Abstract': 'caption_abstract',
-            'CFALayout': 'cfa_layout',
-            'CFAPattern': 'cfa_pattern',
-            'CFAPattern2': 'cfa_pattern_2',
-            'CFAPlaneColor': 'cfa_plane_color',
-            'CFARepeatPatternDim': 'cfa_repeat_pattern_dim',
-            'ChromaticAberrationCorrection': 'chromatic_aberration_correction',
-            'ChromaticAberrationCorrParams': 'chromatic_aberration_corr_params',
-            'ChromaticAberrationSetting': 'chromatic_aberration_setting',
-            'CircGradBasedCorrActive': 'circ_grad_based_corr_active',
-            'CircGradBasedCorrAmount': 'circ_grad_based_corr_amount',
-            'CircGradBasedCorrClarity2012': 'circ_grad_based_corr_clarity_2012',
-            'CircGradBasedCorrContrast2012': 'circ_grad_based_corr_contrast_2012',
-            'CircGradBasedCorrCorrectionRangeMaskColorAmount': 'circ_grad_based_corr_correction_range_mask_color_amount',
-            'CircGradBasedCorrCorrectionRangeMaskLumFeather': 'circ_grad_based_corr_correction_range_mask_lum_feather',
-            'CircGradBasedCorrCorrectionRangeMaskLumMax': 'circ_grad_based_corr_correction_range_mask_lum_max',
-            'CircGradBasedCorrCorrectionRangeMaskLumMin': 'circ_grad_based_corr_correction_range_mask_lum_min',
-            'CircGradBasedCorrCorrectionRangeMaskType': 'circ_grad_based_corr_correction_range_mask_type',
-            'CircGradBasedCorrDefringe': 'circ_grad_based_corr_defringe',
-            'CircGradBasedCorrExposure2012': 'circ_grad_based_corr_exposure_2012',
-            'CircGradBasedCorrHighlights2012': 'circ_grad_based_corr_highlights_2012',
-            'CircGradBasedCorrHue': 'circ_grad_based_corr_hue',
-            'CircGradBasedCorrLuminanceNoise': 'circ_grad_based_corr_luminance_noise',
-            'CircGradBasedCorrMaskAngle': 'circ_grad_based_corr_mask_angle',
-            'CircGradBasedCorrMaskBottom': 'circ_grad_based_corr_mask_bottom',
-            'CircGradBasedCorrMaskFeather': 'circ_grad_based_corr_mask_feather',
-            'CircGradBasedCorrMaskFlipped': 'circ_grad_based_corr_mask_flipped',
-            'CircGradBasedCorrMaskLeft': 'circ_grad_based_corr_mask_left',
-            'CircGradBasedCorrMaskMidpoint': 'circ_grad_based_corr_mask_midpoint',
-            'CircGradBasedCorrMaskRight': 'circ_grad_based_corr_mask_right',
-            'CircGradBasedCorrMaskRoundness': 'circ_grad_based_corr_mask_roundness',
-            'CircGradBasedCorrMaskTop': 'circ_grad_based_corr_mask_top',
-            'CircGradBasedCorrMaskValue': 'circ_grad_based_corr_mask_value',
-            'CircGradBasedCorrMaskVersion': 'circ_grad_based_corr_mask_version',
-            'CircGradBasedCorrMaskWhat': 'circ_grad_based_corr_mask_what',
-            'CircGradBasedCorrMoire': 'circ_grad_based_corr_moire',
-            'CircGradBasedCorrSaturation': 'circ_grad_based_corr_saturation',
-            'CircGradBasedCorrShadows2012': 'circ_grad_based_corr_shadows_2012',
-            'CircGradBasedCorrSharpness': 'circ_grad_based_corr_sharpness',
-            'CircGradBasedCorrTemperature': 'circ_grad_based_corr_temperature',
-            'CircGradBasedCorrTint': 'circ_grad_based_corr_tint',
-            'CircGradBasedCorrWhat': 'circ_grad_based_corr_what',
-            'CircleOfConfusion': 'circle_of_confusion',
-            'Clarity2012': 'clarity_2012',
-            'CMMFlags': 'cmm_flags',
-            'CodedCharacterSet': 'coded_character_set',
-            'ColorCompensationFilter': 'color_compensation_filter',
-            'ColorDataVersion': 'color_data_version',
-            'ColorMatrix': 'color_matrix',
-            'ColorMatrix1': 'color_matrix_1',
-            'ColorMatrix2': 'color_matrix_2',
-            'ColorMode': 'color_mode',
-            'ColorNoiseReduction': 'color_noise_reduction',
-            'ColorNoiseReductionDetail': 'color_noise_reduction_detail',
-            'ColorNoiseReductionSmoothness': 'color_noise_reduction_smoothness',
-            'ColorSpace': 'color_space',
-            'ColorSpaceData': 'color_space_data',
-            'ColorTempAsShot': 'color_temp_as_shot',
-            'ColorTempAuto': 'color_temp_auto',
-            'ColorTempCloudy': 'color_temp_cloudy',
-            'ColorTempDaylight': 'color_temp_daylight',
-            'ColorTemperature': 'color_temperature',
-            'ColorTempFlash': 'color_temp_flash',
-            'ColorTempFluorescent': 'color_temp_fluorescent',
-            'ColorTempKelvin': 'color_temp_kelvin',
-            'ColorTempMeasured': 'color_temp_measured',
-            'ColorTempShade': 'color_temp_shade',
-            'ColorTempTungsten': 'color_temp_tungsten',
-            'ColorTone': 'color_tone',
-            'ComponentsConfiguration': 'components_configuration',
-            'CompressedBitsPerPixel': 'compressed_bits_per_pixel',
-            'Compression': 'compression',
-            'ConnectionSpaceIlluminant': 'connection_space_illuminant',
-            'ContinuousDrive': 'continuous_drive',
-            'Contrast': 'contrast',
-            'Contrast2012': 'contrast_2012',
-            'ControlMode': 'control_mode',
-            'ConvertToGrayscale': 'convert_to_grayscale',
-            'Copyright': 'copyright',
-            'CR2CFAPattern': 'cr2_cfa_pattern',
-            'CreateDate': 'create_date',
-            'CreativeStyle': 'creative_style',
-            'Creator': 'creator',
-            'CreatorTool': 'creator_tool',
-            'CropAngle': 'crop_angle',
-            'CropBottom': 'crop_bottom',
-            'CropBottomMargin': 'crop_bottom_margin',
-            'CropConstrainToWarp': 'crop_constrain_to_warp',
-            'CropLeft': 'crop_left',
-            'CropLeftMargin': 'crop_left_margin',
-            'CroppedImageHeight': 'cropped_image_height',
-            'CroppedImageLeft': 'cropped_image_left',
-            'CroppedImageTop': 'cropped_image_top',
-            'CroppedImageWidth': 'cropped_image_width',
-            'CropRight': 'crop_right',
-            'CropRightMargin': 'crop_right_margin',
-            'CropTop': 'crop_top',
-            'CropTopMargin': 'crop_top_margin',
-            'CurrentIPTCDigest': 'current_iptc_digest',
-            'CustomControls': 'custom_controls',
-            'CustomPictureStyleFileName': 'custom_picture_style_file_name',
-            'CustomRendered': 'custom_rendered',
-            'DateCreated': 'date_created',
-            'DateTimeCreated': 'date_time_created',
-            'DateTimeOriginal': 'date_time_original',
-            'DaylightSavings': 'daylight_savings',
-            'DefaultCropOrigin': 'default_crop_origin',
-            'DefaultCropSize': 'default_crop_size',
-            'DefaultEraseOption': 'default_erase_option',
-            'DefaultScale': 'default_scale',
-            'DefaultUserCrop': 'default_user_crop',
-            'DefringeGreenAmount': 'defringe_green_amount',
-            'DefringeGreenHueHi': 'defringe_green_hue_hi',
-            'DefringeGreenHueLo': 'defringe_green_hue_lo',
-            'DefringePurpleAmount': 'defringe_purple_amount',
-            'DefringePurpleHueHi': 'defringe_purple_hue_hi',
-            'DefringePurpleHueLo': 'defringe_purple_hue_lo',
-            'Dehaze': 'dehaze',
-            'DerivedFromDocumentID': 'derived_from_document_id',
-            'DerivedFromInstanceID': 'derived_from_instance_id',
-            'DerivedFromOriginalDocumentID': 'derived_from_original_document_id',
-            'Description': 'description',
-            'DeviceAttributes': 'device_attributes',
-            'DeviceManufacturer': 'device_manufacturer',
-            'DeviceMfgDesc': 'device_mfg_desc',
-            'DeviceModel': 'device_model',
-            'DeviceModelDesc': 'device_model_desc',
-            'DialDirectionTvAv': 'dial_direction_tv_av',
-            'DigitalGain': 'digital_gain',
-            'DigitalZoom': 'digital_zoom',
-            'DigitalZoomRatio': 'digital_zoom_ratio',
-            'Directory': 'directory',
-            'DisplayedUnitsX': 'displayed_units_x',
-            'DisplayedUnitsY': 'displayed_units_y',
-            'DistortionCorrection': 'distortion_correction',
-            'DistortionCorrectionSetting': 'distortion_correction_setting',
-            'DistortionCorrParams': 'distortion_corr_params',
-            'DistortionCorrParamsNumber': 'distortion_corr_params_number',
-            'DistortionCorrParamsPresent': 'distortion_corr_params_present',
-            'DNGBackwardVersion': 'dng_backward_version',
-            'DNGPrivateData': 'dng_private_data',
-            'DNGVersion': 'dng_version',
-            'DocumentID': 'document_id',
-            'DriveMode': 'drive_mode',
-            'DustRemovalData': 'dust_removal_data',
-            'DynamicRangeOptimizer': 'dynamic_range_optimizer',
-            'EasyMode': 'easy_mode',
-            'ElectronicFrontCurtainShutter': 'electronic_front_curtain_shutter',
-            'ExifByteOrder': 'exif_byte_order',
-            'ExifImageHeight': 'exif_image_height',
-            'ExifImageWidth': 'exif_image_width',
-            'ExifToolVersion': 'exiftool_version',
-            'ExifVersion': 'exif_version',
-            'Exposure2012': 'exposure_2012',
-            'ExposureCompensation': 'exposure_compensation',
-            'ExposureLevelIncrements': 'exposure_level_increments',
-            'ExposureMode': 'exposure_mode',
-            'ExposureProgram': 'exposure_program',
-            'ExposureStandardAdjustment': 'exposure_standard_adjustment',
-            'ExposureTime': 'exposure_time',
-            'FaceInfoLength': 'face_info_length',
-            'FaceInfoOffset': 'face_info_offset',
-            'FacesDetected': 'faces_detected',
-            'FileAccessDate': 'file_access_date',
-            'FileFormat': 'file_format',
-            'FileInodeChangeDate': 'file_inode_change_date',
-            'FileModifyDate': 'file_modify_date',
-            'FileName': 'filename',
-            'FilePermissions': 'file_permissions',
-            'FileSize': 'file_size',
-            'FileSource': 'file_source',
-            'FileType': 'file_type',
-            'FileTypeExtension': 'file_type_extension',
-            'Flash': 'flash',
-            'FlashAction': 'flash_action',
-            'FlashActivity': 'flash_activity',
-            'FlashBits': 'flash_bits',
-            'FlashExposureComp': 'flash_exposure_comp',
-            'FlashExposureLock': 'flash_exposure_lock',
-            'FlashGuideNumber': 'flash_guide_number',
-            'FlashLevel': 'flash_level',
-            'FlashMode': 'flash_mode',
-            'FlashpixVersion': 'flashpix_version',
-            'FlashStatus': 'flash_status',
-            'FlexibleSpotPosition': 'flexible_spot_position',
-            'FlightPitchDegree': 'flight_pitch_degree',
-            'FlightRollDegree': 'flight_roll_degree',
-            'FlightYawDegree': 'flight_yaw_degree',
-            'FNumber': 'f_number',
-            'FocalLength': 'focal_length',
-            'FocalLength35efl': 'focal_length_35_efl',
-            'FocalLengthIn35mmFormat': 'focal_length_in_35mm_format',
-            'FocalPlaneAFPointsUsed': 'focal_plane_af_points_used',
-            'FocalPlaneResolutionUnit': 'focal_plane_resolution_unit',
-            'FocalPlaneXResolution': 'focal_plane_x_resolution',
-            'FocalPlaneYResolution': 'focal_plane_y_resolution',
-            'FocalUnits': 'focal_units',
-            'FocusDistance2': 'focus_distance2',
-            'FocusLocation': 'focus_location',
-            'FocusMode': 'focus_mode',
-            'FocusPosition2': 'focus_position2',
-            'FocusRange': 'focus_range',
-            'Format': 'format',
-            'FOV': 'field_of_view',
-            'FullImageSize': 'full_image_size',
-            'GainControl': 'gain_control',
-            'GimbalPitchDegree': 'gimbal_pitch_degree',
-            'GimbalReverse': 'gimbal_reverse',
-            'GimbalRollDegree': 'gimbal_roll_degree',
-            'GimbalYawDegree': 'gimbal_yaw_degree',
-            'GlobalAltitude': 'global_altitude',
-            'GlobalAngle': 'global_angle',
-            'GPSAltitude': 'gps_altitude',
-            'GPSAltitudeRef': 'gps_altitude_ref',
-            'GPSLatitude': 'gps_latitude',
-            'GPSLatitudeRef': 'gps_latitude_ref',
-            'GPSLongitude': 'gps_longitude',
-            'GPSLongitudeRef': 'gps_longitude_ref',
-            'GPSMapDatum': 'gps_map_datum',
-            'GPSPosition': 'gps_position',
-            'GPSSatellites': 'gps_satellites',
-            'GPSStatus': 'gps_status',
-            'GPSVersionID': 'gps_version_id',
-            'GradientBasedCorrActive': 'gradient_based_corr_active',
-            'GradientBasedCorrAmount': 'gradient_based_corr_amount',
-            'GradientBasedCorrClarity2012': 'gradient_based_corr_clarity_2012',
-            'GradientBasedCorrContrast': 'gradient_based_corr_contrast',
-            'GradientBasedCorrCorrectionRangeMaskColorAmount': 'gradient_based_corr_correction_range_mask_color_amount',
-            'GradientBasedCorrCorrectionRangeMaskLumFeather': 'gradient_based_corr_correction_range_mask_lum_feather',
-            'GradientBasedCorrCorrectionRangeMaskLumMax': 'gradient_based_corr_correction_range_mask_lum_max',
-            'GradientBasedCorrCorrectionRangeMaskLumMin': 'gradient_based_corr_correction_range_mask_lum_min',
-            'GradientBasedCorrCorrectionRangeMaskType': 'gradient_based_corr_correction_range_mask_type',
-            'GradientBasedCorrDefringe': 'gradient_based_corr_defringe',
-            'GradientBasedCorrExposure2012': 'gradient_based_corr_exposure_2012',
-            'GradientBasedCorrHighlights2012': 'gradient_based_corr_highlights_2012',
-            'GradientBasedCorrHue': 'gradient_based_corr_hue',
-            'GradientBasedCorrLuminanceNoise': 'gradient_based_corr_luminance_noise',
-            'GradientBasedCorrMaskFullX': 'gradient_based_corr_mask_full_x',
-            'GradientBasedCorrMaskFullY': 'gradient_based_corr_mask_full_y',
-            'GradientBasedCorrMaskValue': 'gradient_based_corr_mask_value',
-            'GradientBasedCorrMaskWhat': 'gradient_based_corr_mask_what',
-            'GradientBasedCorrMaskZeroX': 'gradient_based_corr_mask_zero_x',
-            'GradientBasedCorrMaskZeroY': 'gradient_based_corr_mask_zero_y',
-            'GradientBasedCorrMoire': 'gradient_based_corr_moire',
-            'GradientBasedCorrSaturation': 'gradient_based_corr_saturation',
-            'GradientBasedCorrShadows2012': 'gradient_based_corr_shadows_2012',
-            'GradientBasedCorrSharpness': 'gradient_based_corr_sharpness',
-            'GradientBasedCorrTemperature': 'gradient_based_corr_temperature',
-            'GradientBasedCorrTint': 'gradient_based_corr_tint',
-            'GradientBasedCorrWhat': 'gradient_based_corr_what',
-            'GrainAmount': 'grain_amount',
-            'GreenHue': 'green_hue',
-            'GreenMatrixColumn': 'green_matrix_column',
-            'GreenSaturation': 'green_saturation',
-            'GreenTRC': 'green_trc',
-            'HasCrop': 'has_crop',
-            'HasRealMergedData': 'has_real_merged_data',
-            'HasSettings': 'has_settings',
-            'HDR': 'hdr',
-            'HDREffect': 'hdr_effect',
-            'HDRSetting': 'hdr_setting',
-            'Height': 'height',
-            'HighISONoiseReduction': 'high_iso_noise_reduction',
-            'HighISONoiseReduction2': 'high_iso_noise_reduction_2',
-            'Highlights2012': 'highlights_2012',
-            'HighlightTonePriority': 'highlight_tone_priority',
-            'HistoryAction': 'history_action',
-            'HistoryChanged': 'history_changed',
-            'HistoryInstanceID': 'history_instance_id',
-            'HistoryParameters': 'history_parameters',
-            'HistorySoftwareAgent': 'history_software_agent',
-            'HistoryWhen': 'history_when',
-            'HueAdjustmentAqua': 'hue_adjustment_aqua',
-            'HueAdjustmentBlue': 'hue_adjustment_blue',
-            'HueAdjustmentGreen': 'hue_adjustment_green',
-            'HueAdjustmentMagenta': 'hue_adjustment_magenta',
-            'HueAdjustmentOrange': 'hue_adjustment_orange',
-            'HueAdjustmentPurple': 'hue_adjustment_purple',
-            'HueAdjustmentRed': 'hue_adjustment_red',
-            'HueAdjustmentYellow': 'hue_adjustment_yellow',
-            'HyperfocalDistance': 'hyperfocal_distance',
-            'ImageDescription': 'image_description',
-            'ImageHeight': 'image_height',
-            'ImageSize': 'image_size',
-            'ImageStabilization': 'image_stabilization',
-            'ImageWidth': 'image_width',
-            'IncrementalTemperature': 'incremental_temperature',
-            'IncrementalTint': 'incremental_tint',
-            'InstanceID': 'instance_id',
-            'IntelligentAuto': 'intelligent_auto',
-            'InternalSerialNumber': 'internal_serial_number',
-            'InteropIndex': 'interop_index',
-            'InteropVersion': 'interop_version',
-            'IPTCDigest': 'iptc_digest',
-            'ISO': 'iso',
-            'Iso': 'iso',
-            'ISOAutoMax': 'iso_auto_max',
-            'ISOAutoMin': 'iso_auto_min',
-            'ISOSetting': 'iso_setting',
-            'ISOSpeedIncrements': 'iso_speed_increments',
-            'Label': 'label',
-            'LateralChromaticAberration': 'lateral_chromatic_aberration',
-            'LayerCount': 'layer_count',
-            'Lens': 'lens',
-            'Lens35efl': 'lens35efl',
-            'LensDriveWhenAFImpossible': 'lens_drive_when_af_impossible',
-            'LensE': 'lens_e',
-            'LensE-mountVersion': 'lens_e_mount_version',
-            'LensFirmwareVersion': 'lens_firmware_version',
-            'LensFormat': 'lens_format',
-            'LensID': 'lens_id',
-            'LensInfo': 'lens_info',
-            'LensManualDistortionAmount': 'lens_manual_distortion_amount',
-            'LensModel': 'lens_model',
-            'LensMount': 'lens_mount',
-            'LensMount2': 'lens_mount2',
-            'LensProfileChromaticAberrationScale': 'lens_profile_chromatic_aberration_scale',
-            'LensProfileDigest': 'lens_profile_digest',
-            'LensProfileDistortionScale': 'lens_profile_distortion_scale',
-            'LensProfileEnable': 'lens_profile_enable',
-            'LensProfileFilename': 'lens_profile_filename',
-            'LensProfileName': 'lens_profile_name',
-            'LensProfileSetup': 'lens_profile_setup',
-            'LensProfileVignettingScale': 'lens_profile_vignetting_scale',
-            'LensSerialNumber': 'lens_serial_number',
-            'LensSpec': 'lens_spec',
-            'LensSpecFeatures': 'lens_spec_features',
-            'LensType': 'lens_type',
-            'LensType2': 'lens_type2',
-            'LensType3': 'lens_type3',
-            'LensZoomPosition': 'lens_zoom_position',
-            'LightSource': 'light_source',
-            'LightValue': 'light_value',
-            'LinearityUpperMargin': 'linearity_upper_margin',
-            'LinearResponseLimit': 'linear_response_limit',
-            'LiveViewShooting': 'live_view_shooting',
-            'LongExposureNoiseReduction': 'long_exposure_noise_reduction',
-            'LuminanceAdjustmentAqua': 'luminance_adjustment_aqua',
-            'LuminanceAdjustmentBlue': 'luminance_adjustment_blue',
-            'LuminanceAdjustmentGreen': 'luminance_adjustment_green',
-            'LuminanceAdjustmentMagenta': 'luminance_adjustment_magenta',
-            'LuminanceAdjustmentOrange': 'luminance_adjustment_orange',
-            'LuminanceAdjustmentPurple': 'luminance_adjustment_purple',
-            'LuminanceAdjustmentRed': 'luminance_adjustment_red',
-            'LuminanceAdjustmentYellow': 'luminance_adjustment_yellow',
-            'LuminanceSmoothing': 'luminance_smoothing',
-            'LVShootingAreaDisplay': 'lv_shooting_area_display',
-            'MacroMode': 'macro_mode',
-            'Make': 'make',
-            'MakeAndModel': 'make_and_model',
-            'ManualAFPointSelPattern': 'manual_af_point_sel_pattern',
-            'ManualFlashOutput': 'manual_flash_output',
-            'MaxAperture': 'max_aperture',
-            'MaxApertureValue': 'max_aperture_value',
-            'MaxFocalLength': 'max_focal_length',
-            'MeasuredEV': 'measured_ev',
-            'MeasuredEV2': 'measured_ev2',
-            'MeasuredRGGB': 'measured_rggb',
-            'MediaWhitePoint': 'media_white_point',
-            'Megapixels': 'megapixels',
-            'MetadataDate': 'metadata_date',
-            'MetaVersion': 'meta_version',
-            'MeteringMode': 'metering_mode',
-            'MeteringMode2': 'metering_mode_2',
-            'MIMEType': 'mime_type',
-            'MinAperture': 'min_aperture',
-            'MinFocalLength': 'min_focal_length',
-            'Model': 'model',
-            'ModelReleaseYear': 'model_release_year',
-            'ModifyDate': 'modify_date',
-            'MultiExposure': 'multi_exposure',
-            'MultiExposureControl': 'multi_exposure_control',
-            'MultiExposureShots': 'multi_exposure_shots',
-            'MultiFrameNoiseReduction': 'multi_frame_noise_reduction',
-            'MultiFrameNREffect': 'multi_frame_n_r_effect',
-            'NDFilter': 'nd_filter',
-            'NoiseProfile': 'noise_profile',
-            'NormalWhiteLevel': 'normal_white_level',
-            'NumAFPoints': 'num_af_points',
-            'NumChannels': 'num_channels',
-            'NumSlices': 'num_slices',
-            'ObjectName': 'object_name',
-            'OffsetTime': 'offset_time',
-            'OffsetTimeDigitized': 'offset_time_digitized',
-            'OffsetTimeOriginal': 'offset_time_original',
-            'OneShotAFRelease': 'one_shot_af_release',
-            'OpcodeList3': 'opcode_list_3',
-            'OpticalZoomCode': 'optical_zoom_code',
-            'Orientation': 'orientation',
-            'OrientationLinkedAF': 'orientation_linked_af',
-            'OriginalBestQualitySize': 'original_best_quality_size',
-            'OriginalDefaultCropSize': 'original_default_crop_size',
-            'OriginalDefaultFinalSize': 'original_default_final_size',
-            'OriginalDocumentID': 'original_document_id',
-            'OwnerName': 'owner_name',
-            'PaintCorrectionActive': 'paint_correction_active',
-            'PaintCorrectionAmount': 'paint_correction_amount',
-            'PaintCorrectionBrightness': 'paint_correction_brightness',
-            'PaintCorrectionClarity': 'paint_correction_clarity',
-            'PaintCorrectionClarity2012': 'paint_correction_clarity2012',
-            'PaintCorrectionContrast': 'paint_correction_contrast',
-            'PaintCorrectionContrast2012': 'paint_correction_contrast2012',
-            'PaintCorrectionCorrectionRangeMaskColorAmount': 'paint_correction_correction_range_mask_color_amount',
-            'PaintCorrectionCorrectionRangeMaskLumFeather': 'paint_correction_correction_range_mask_lum_feather',
-            'PaintCorrectionCorrectionRangeMaskLumMax': 'paint_correction_correction_range_mask_lum_max',
-            'PaintCorrectionCorrectionRangeMaskLumMin': 'paint_correction_correction_range_mask_lum_min',
-            'PaintCorrectionCorrectionRangeMaskType': 'paint_correction_correction_range_mask_type',
-            'PaintCorrectionDefringe': 'paint_correction_defringe',
-            'PaintCorrectionExposure': 'paint_correction_exposure',
-            'PaintCorrectionExposure2012': 'paint_correction_exposure2012',
-            'PaintCorrectionHighlights2012': 'paint_correction_highlights2012',
-            'PaintCorrectionHue': 'paint_correction_hue',
-            'PaintCorrectionLocalBlacks2012': 'paint_correction_local_blacks2012',
-            'PaintCorrectionLocalDehaze': 'paint_correction_local_dehaze',
-            'PaintCorrectionLocalWhites2012': 'paint_correction_local_whites2012',
-            'PaintCorrectionLuminanceNoise': 'paint_correction_luminance_noise',
-            'PaintCorrectionMaskCenterWeight': 'paint_correction_mask_center_weight',
-            'PaintCorrectionMaskDabs': 'paint_correction_mask_dabs',
-            'PaintCorrectionMaskFlow': 'paint_correction_mask_flow',
-            'PaintCorrectionMaskRadius': 'paint_correction_mask_radius',
-            'PaintCorrectionMaskValue': 'paint_correction_mask_value',
-            'PaintCorrectionMaskWhat': 'paint_correction_mask_what',
-            'PaintCorrectionMoire': 'paint_correction_moire',
-            'PaintCorrectionSaturation': 'paint_correction_saturation',
-            'PaintCorrectionShadows2012': 'paint_correction_shadows2012',
-            'PaintCorrectionSharpness': 'paint_correction_sharpness',
-            'PaintCorrectionTemperature': 'paint_correction_temperature',
-            'PaintCorrectionTint': 'paint_correction_tint',
-            'PaintCorrectionWhat': 'paint_correction_what',
-            'ParametricDarks': 'parametric_darks',
-            'ParametricHighlights': 'parametric_highlights',
-            'ParametricHighlightSplit': 'parametric_highlight_split',
-            'ParametricLights': 'parametric_lights',
-            'ParametricMidtoneSplit': 'parametric_midtone_split',
-            'ParametricShadows': 'parametric_shadows',
-            'ParametricShadowSplit': 'parametric_shadow_split',
-            'PerChannelBlackLevel': 'per_channel_black_level',
-            'PeripheralIlluminationCorr': 'peripheral_illumination_corr',
-            'PeripheralLightingSetting': 'peripheral_lighting_setting',
-            'PerspectiveAspect': 'perspective_aspect',
-            'PerspectiveHorizontal': 'perspective_horizontal',
-            'PerspectiveRotate': 'perspective_rotate',
-            'PerspectiveScale': 'perspective_scale',
-            'PerspectiveUpright': 'perspective_upright',
-            'PerspectiveVertical': 'perspective_vertical',
-            'PerspectiveX': 'perspective_x',
-            'PerspectiveY': 'perspective_y',
-            'PhotometricInterpretation': 'photometric_interpretation',
-            'PhotoshopThumbnail': 'photoshop_thumbnail',
-            'PictureEffect': 'picture_effect',
-            'PictureEffect2': 'picture_effect_2',
-            'PictureProfile': 'picture_profile',
-            'PictureStyle': 'picture_style',
-            'PictureStylePC': 'picture_style_pc',
-            'PictureStyleUserDef': 'picture_style_user_def',
-            'PixelAspectRatio': 'pixel_aspect_ratio',
-            'PlanarConfiguration': 'planar_configuration',
-            'PostCropVignetteAmount': 'post_crop_vignette_amount',
-            'PreviewImage': 'preview_image',
-            'PreviewImageLength': 'preview_image_length',
-            'PreviewImageSize': 'preview_image_size',
-            'PreviewImageStart': 'preview_image_start',
-            'PrimaryPlatform': 'primary_platform',
-            'PrintIMVersion': 'print_i_m_version',
-            'PrintPosition': 'print_position',
-            'PrintScale': 'print_scale',
-            'PrintStyle': 'print_style',
-            'PrioritySetInAWB': 'priority_set_in_awb',
-            'ProcessVersion': 'process_version',
-            'ProfileClass': 'profile_class',
-            'ProfileCMMType': 'profile_cmm_type',
-            'ProfileConnectionSpace': 'profile_connection_space',
-            'ProfileCopyright': 'profile_copyright',
-            'ProfileCreator': 'profile_creator',
-            'ProfileDateTime': 'profile_date_time',
-            'ProfileDescription': 'profile_description',
-            'ProfileEmbedPolicy': 'profile_embed_policy',
-            'ProfileFileSignature': 'profile_file_signature',
-            'ProfileHueSatMapData1': 'profile_hue_sat_map_data_1',
-            'ProfileHueSatMapData2': 'profile_hue_sat_map_data_2',
-            'ProfileHueSatMapDims': 'profile_hue_sat_map_dims',
-            'ProfileID': 'profile_id',
-            'ProfileName': 'profile_name',
-            'ProfileVersion': 'profile_version',
-            'Quality': 'quality',
-            'Quality2': 'quality_2',
-            'Rating': 'rating',
-            'RawFileName': 'raw_file_name',
-            'RAWFileType': 'raw_file_type',
-            'RawImageSegmentation': 'raw_image_segmentation',
-            'RawJpgSize': 'raw_jpg_size',
-            'ReaderName': 'reader_name',
-            'RecommendedExposureIndex': 'recommended_exposure_index',
-            'RecordMode': 'record_mode',
-            'RedBalance': 'red_balance',
-            'RedHue': 'red_hue',
-            'RedMatrixColumn': 'red_matrix_column',
-            'RedSaturation': 'red_saturation',
-            'RedTRC': 'red_trc',
-            'ReferenceBlackWhite': 'reference_black_white',
-            'RelativeAltitude': 'relative_altitude',
-            'ReleaseMode': 'release_mode',
-            'ReleaseMode2': 'release_mode_2',
-            'ReleaseMode3': 'release_mode_3',
-            'RenderingIntent': 'rendering_intent',
-            'ResolutionUnit': 'resolution_unit',
-            'RetractLensOnPowerOff': 'retract_lens_on_power_off',
-            'RowsPerStrip': 'rows_per_strip',
-            'SafetyShift': 'safety_shift',
-            'SameExposureForNewAperture': 'same_exposure_for_new_aperture',
-            'SamplesPerPixel': 'samples_per_pixel',
-            'Saturation': 'saturation',
-            'SaturationAdjustmentAqua': 'saturation_adjustment_aqua',
-            'SaturationAdjustmentBlue': 'saturation_adjustment_blue',
-            'SaturationAdjustmentGreen': 'saturation_adjustment_green',
-            'SaturationAdjustmentMagenta': 'saturation_adjustment_magenta',
-            'SaturationAdjustmentOrange': 'saturation_adjustment_orange',
-            'SaturationAdjustmentPurple': 'saturation_adjustment_purple',
-            'SaturationAdjustmentRed': 'saturation_adjustment_red',
-            'SaturationAdjustmentYellow': 'saturation_adjustment_yellow',
-            'ScaleFactor35efl': 'scale_factor_35_efl',
-            'SceneCaptureType': 'scene_capture_type',
-            'SceneMode': 'scene_mode',
-            'SceneType': 'scene_type',
-            'SelectAFAreaSelectionMode': 'select_af_area_selection_mode',
-            'SelfData': 'self_data',
-            'SelfTimer': 'self_timer',
-            'SensitivityType': 'sensitivity_type',
-            'SensorBlueLevel': 'sensor_blue_level',
-            'SensorBottomBorder': 'sensor_bottom_border',
-            'SensorHeight': 'sensor_height',
-            'SensorLeftBorder': 'sensor_left_border',
-            'SensorRedLevel': 'sensor_red_level',
-            'SensorRightBorder': 'sensor_right_border',
-            'SensorTopBorder': 'sensor_top_border',
-            'SensorWidth': 'sensor_width',
-            'SequenceFileNumber': 'sequence_file_number',
-            'SequenceImageNumber': 'sequence_image_number',
-            'SequenceLength': 'sequence_length',
-            'SequenceNumber': 'sequence_number',
-            'SerialNumber': 'serial_number',
-            'Shadows2012': 'shadows_2012',
-            'ShadowScale': 'shadow_scale',
-            'ShadowTint': 'shadow_tint',
-            'SharpenDetail': 'sharpen_detail',
-            'SharpenEdgeMasking': 'sharpen_edge_masking',
-            'SharpenRadius': 'sharpen_radius',
-            'Sharpness': 'sharpness',
-            'SharpnessFrequency': 'sharpness_frequency',
-            'ShootingMode': 'shooting_mode',
-            'ShotNumberSincePowerUp': 'shot_number_since_power_up',
-            'Shutter': 'shutter',
-            'ShutterCount': 'shutter_count',
-            'ShutterCount2': 'shutter_count2',
-            'ShutterCount3': 'shutter_count3',
-            'ShutterSpeed': 'shutter_speed',
-            'ShutterSpeedRange': 'shutter_speed_range',
-            'ShutterSpeedValue': 'shutter_speed_value',
-            'SlicesGroupName': 'slices_group_name',
-            'SlowShutter': 'slow_shutter',
-            'SoftSkinEffect': 'soft_skin_effect',
-            'Software': 'software',
-            'SonyDateTime': 'sony_date_time',
-            'SonyExposureTime': 'sony_exposure_time',
-            'SonyExposureTime2': 'sony_exposure_time_2',
-            'SonyFNumber': 'sony_f_number',
-            'SonyImageHeight': 'sony_image_height',
-            'SonyImageHeightMax': 'sony_image_height_max',
-            'SonyImageWidth': 'sony_image_width',
-            'SonyImageWidthMax': 'sony_image_width_max',
-            'SonyISO': 'sony_iso',
-            'SonyMaxApertureValue': 'sony_max_aperture_value',
-            'SonyModelID': 'sony_model_id',
-            'SonyRawFileType': 'sony_raw_file_type',
-            'SonyTimeMinSec': 'sony_time_min_sec',
-            'SonyToneCurve': 'sony_tone_curve',
-            'SpecularWhiteLevel': 'specular_white_level',
-            'SplitToningBalance': 'split_toning_balance',
-            'SplitToningHighlightHue': 'split_toning_highlight_hue',
-            'SplitToningHighlightSaturation': 'split_toning_highlight_saturation',
-            'SplitToningShadowHue': 'split_toning_shadow_hue',
-            'SplitToningShadowSaturation': 'split_toning_shadow_saturation',
-            'SR2SubIFDKey': 'sr2_sub_ifd_key',
-            'SR2SubIFDLength': 'sr2_sub_ifd_length',
-            'SR2SubIFDOffset': 'sr2_sub_ifd_offset',
-            'SRAWQuality': 's_raw_quality',
-            'SRawType': 's_raw_type',
-            'StopsAboveBaseISO': 'stops_above_base_iso',
-            'StripByteCounts': 'strip_byte_counts',
-            'StripOffsets': 'strip_offsets',
-            'SubfileType': 'subfile_type',
-            'SubSecCreateDate': 'sub_sec_create_date',
-            'SubSecDateTimeOriginal': 'sub_sec_date_time_original',
-            'SubSecModifyDate': 'sub_sec_modify_date',
-            'SubSecTime': 'sub_sec_time',
-            'SubSecTimeDigitized': 'sub_sec_time_digitized',
-            'SubSecTimeOriginal': 'sub_sec_time_original',
-            'TargetAperture': 'target_aperture',
-            'TargetExposureTime': 'target_exposure_time',
-            'ThumbnailImage': 'thumbnail_image',
-            'ThumbnailImageValidArea': 'thumbnail_image_valid_area',
-            'ThumbnailLength': 'thumbnail_length',
-            'ThumbnailOffset': 'thumbnail_offset',
-            'TiffMeteringImage': 'tiff_metering_image',
-            'TiffMeteringImageHeight': 'tiff_metering_image_height',
-            'TiffMeteringImageWidth': 'tiff_metering_image_width',
-            'TimeCreated': 'time_created',
-            'TimeZone': 'time_zone',
-            'TimeZoneCity': 'time_zone_city',
-            'Tint': 'tint',
-            'Title': 'title',
-            'ToneCurve': 'tone_curve',
-            'ToneCurveBlue': 'tone_curve_blue',
-            'ToneCurveGreen': 'tone_curve_green',
-            'ToneCurveName': 'tone_curve_name',
-            'ToneCurveName2012': 'tone_curve_name_2012',
-            'ToneCurvePV2012': 'tone_curve_pv_2012',
-            'ToneCurvePV2012Blue': 'tone_curve_pv_2012_blue',
-            'ToneCurvePV2012Green': 'tone_curve_pv_2012_green',
-            'ToneCurvePV2012Red': 'tone_curve_pv_2012_red',
-            'ToneCurveRed': 'tone_curve_red',
-            'toolkit': 'toolkit',
-            'Transformation': 'transformation',
-            'UniqueCameraModel': 'unique_camera_model',
-            'UprightCenterMode': 'upright_center_mode',
-            'UprightCenterNormX': 'upright_center_norm_x',
-            'UprightCenterNormY': 'upright_center_norm_y',
-            'UprightFocalLength35mm': 'upright_focal_length_35mm',
-            'UprightFocalMode': 'upright_focal_mode',
-            'UprightFourSegmentsCount': 'upright_four_segments_count',
-            'UprightPreview': 'upright_preview',
-            'UprightTransformCount': 'upright_transform_count',
-            'UprightVersion': 'upright_version',
-            'URL_List': 'url_list',
-            'UserComment': 'user_comment',
-            'USMLensElectronicMF': 'usm_lens_electronic_mf',
-            'ValidAFPoints': 'valid_af_points',
-            'VariableLowPassFilter': 'variable_low_pass_filter',
-            'Version': 'version',
-            'VFDisplayIllumination': 'vf_display_illumination',
-            'Vibrance': 'vibrance',
-            'ViewfinderWarnings': 'viewfinder_warnings',
-            'VignetteAmount': 'vignette_amount',
-            'VignettingCorrection': 'vignetting_correction',
-            'VignettingCorrParams': 'vignetting_corr_params',
-            'VignettingCorrVersion': 'vignetting_corr_version',
-            'VirtualFocalLength': 'virtual_focal_length',
-            'VirtualImageXCenter': 'virtual_image_x_center',
-            'VirtualImageYCenter': 'virtual_image_y_center',
-            'VRDOffset': 'vrd_offset',
-            'WB_RGBLevels': 'wb_rgb_levels',
-            'WB_RGBLevels2500K': 'wb_rgb_levels_2500k',
-            'WB_RGBLevels3200K': 'wb_rgb_levels_3200k',
-            'WB_RGBLevels4500K': 'wb_rgb_levels_4500k',
-            'WB_RGBLevels6000K': 'wb_rgb_levels_6000k',
-            'WB_RGBLevels8500K': 'wb_rgb_levels_8500k',
-            'WB_RGBLevelsCloudy': 'wb_rgb_levels_cloudy',
-            'WB_RGBLevelsDaylight': 'wb_rgb_levels_daylight',
-            'WB_RGBLevelsFlash': 'wb_rgb_levels_flash',
-            'WB_RGBLevelsFluorescent': 'wb_rgb_levels_fluorescent',
-            'WB_RGBLevelsFluorescentM1': 'wb_rgb_levels_fluorescent_m1',
-            'WB_RGBLevelsFluorescentP1': 'wb_rgb_levels_fluorescent_p1',
-            'WB_RGBLevelsFluorescentP2': 'wb_rgb_levels_fluorescent_p2',
-            'WB_RGBLevelsShade': 'wb_rgb_levels_shade',
-            'WB_RGBLevelsTungsten': 'wb_rgb_levels_tungsten',
-            'WB_RGGBLevels': 'wb_rggb_levels',
-            'WB_RGGBLevelsAsShot': 'wb_rggb_levels_as_shot',
-            'WB_RGGBLevelsAuto': 'wb_rggb_levels_auto',
-            'WB_RGGBLevelsCloudy': 'wb_rggb_levels_cloudy',
-            'WB_RGGBLevelsDaylight': 'wb_rggb_levels_daylight',
-            'WB_RGGBLevelsFlash': 'wb_rggb_levels_flash',
-            'WB_RGGBLevelsFluorescent': 'wb_rggb_levels_fluorescent',
-            'WB_RGGBLevelsKelvin': 'wb_rggb_levels_kelvin',
-            'WB_RGGBLevelsMeasured': 'wb_rggb_levels_measured',
-            'WB_RGGBLevelsShade': 'wb_rggb_levels_shade',
-            'WB_RGGBLevelsTungsten': 'wb_rggb_levels_tungsten',
-            'WBBracketMode': 'wb_bracket_mode',
-            'WBBracketValueAB': 'wb_bracket_value_ab',
-            'WBBracketValueGM': 'wb_bracket_value_gm',
-            'WBShiftAB': 'wb_shift_ab',
-            'WBShiftAB_GM': 'wb_shift_ab_gm',
-            'WBShiftAB_GM_Precise': 'wb_shift_ab_gm_precise',
-            'WBShiftGM': 'wb_shift_gm',
-            'WhiteBalance': 'white_balance',
-            'WhiteBalanceBlue': 'white_balance_blue',
-            'WhiteBalanceFineTune': 'white_balance_fine_tune',
-            'WhiteBalanceRed': 'white_balance_red',
-            'WhiteLevel': 'white_level',
-            'Whites2012': 'whites_2012',
-            'Width': 'width',
-            'WriterName': 'writer_name',
-            'XMPToolkit': 'xmp_toolkit',
-            'XResolution': 'x_resolution',
-            'YCbCrCoefficients': 'y_cb_cr_coefficients',
-            'YCbCrPositioning': 'y_cb_cr_positioning',
-            'YCbCrSubSampling': 'y_cb_cr_sub_sampling',
-            'YResolution': 'y_resolution',
-            'ZoneMatching': 'zone_matching',
-            'ZoomSourceWidth': 'zoom_source_width',
-            'ZoomTargetWidth': 'zoom_target_width',
-            'MajorBrand': 'major_brand',
-            'MinorVersion': 'minor_version',
-            'CompatibleBrands': 'compatible_brands',
-            'MovieDataSize': 'movie_data_size',
-            'MovieDataOffset': 'movie_data_offset',
-            'MovieHeaderVersion': 'movie_header_version',
-            'TimeScale': 'time_scale',
-            'Duration': 'duration',
-            'PreferredRate': 'preferred_rate',
-            'PreferredVolume': 'preferred_volume',
-            'MatrixStructure': 'matrix_structure',
-            'PreviewTime': 'preview_time',
-            'PreviewDuration': 'preview_duration',
-            'PosterTime': 'poster_time',
-            'SelectionTime': 'selection_time',
-            'SelectionDuration': 'selection_duration',
-            'CurrentTime': 'current_time',
-            'NextTrackID': 'next_track_id',
-            'HandlerType': 'handler_type',
-            'HandlerVendorID': 'handler_vendor_id',
-            'Encoder': 'encoder',
-            'TrackHeaderVersion': 'track_header_version',
-            'TrackCreateDate': 'track_create_date',
-            'TrackModifyDate': 'track_modify_date',
-            'TrackID': 'track_id',
-            'TrackDuration': 'track_duration',
-            'TrackLayer': 'track_layer',
-            'TrackVolume': 'track_volume',
-            'MediaHeaderVersion': 'media_header_version',
-            'MediaCreateDate': 'media_create_date',
-            'MediaModifyDate': 'media_modify_date',
-            'MediaTimeScale': 'media_time_scale',
-            'MediaDuration': 'media_duration',
-            'MediaLanguageCode': 'media_language_code',
-            'HandlerDescription': 'handler_description',
-            'GraphicsMode': 'graphics_mode',
-            'OpColor': 'op_color',
-            'CompressorID': 'compressor_id',
-            'SourceImageWidth': 'source_image_width',
-            'SourceImageHeight': 'source_image_height',
-            'VideoFrameRate': 'video_frame_rate',
-            'AvgBitrate': 'avg_bitrate',
-            'Rotation': 'rotation',
-        }
+        Clean EXIF element names, i.e. 'ExposureTime' -> 'exposure_time'. Names are renamed by
+        `_exif_column_map`, and names not in it are converted from ExifKeyName to
+        exif_key_name.
 
+        :param exifd: dictionary of extracted EXIF metadata
+        :type exifd: dict
+        :return: dictionary with cleaned element names
+        :rtype: dict
+        """
         newd = {}
-        not_found_keys = []
         for filename, dct in exifd.items():
-            newd[filename] = pydoni.rename_dict_keys(dct, column_map)
-            for exif_key in newd[filename].keys():
-                if exif_key not in column_map.keys() and exif_key not in column_map.values():
-                    self.logger.warn("Key not found in `column_map`: '%s'" % str(exif_key))
-                    not_found_keys.append(exif_key)
-
-        if not_found_keys:
-            # Key(s) not in above column map, this means we must rename them manually from
-            # ExifKeyName to exif_key_name.
-            new_keynames = []
-            for key in not_found_keys:
-                new_key = ''
-                for i, char in enumerate(key):
-                    if char == char.upper() and not char.isdigit() and i > 0:
-                        new_key += '_' + char
+            newdct = {}
+            for exif_key, value in dct.items():
+                new_key = _exif_column_map.get(exif_key)
+                if new_key is None:
+                    if exif_key in _exif_column_names:
+                        new_key = exif_key
                     else:
-                        new_key += char
+                        if exif_key not in _exif_unmapped_keys:
+                            _exif_unmapped_keys.add(exif_key)
+                            self.logger.warn("Key not found in `column_map`: '%s'" % str(exif_key))
 
-                # Corrections
-                new_key = new_key.lower()
-                new_key = new_key.replace('i_d', 'id')
+                        new_key = _exif_snake_case(exif_key)
 
-                new_keynames.append(new_key)
+                newdct[new_key] = value
 
-            newd[filename] = pydoni.rename_dict_keys(newd[filename], dict(zip(not_found_keys, new_keynames)))
+            newd[filename] = newdct
 
         return newd
 
@@ -1347,6 +770,76 @@ class EXIF(object):
             return True
 
 
+class _JSONRecords(object):
+    """
+    Incremental parser of `exiftool -json` output, a JSON array with one object per file.
+    Objects are decoded one at a time with `json.JSONDecoder.raw_decode()` as chunks of output
+    are fed, skipping the brackets and commas of the enclosing array. Tag names are keys of the
+    objects as they are, and the path of each file is its 'SourceFile'.
+
+    :param logger: logger to report unparseable output to
+    :type logger: logging.Logger
+    """
+
+    separators = ' \t\r\n[],'
+
+    def __init__(self, logger):
+        import json
+
+        self.logger = logger
+        self.decoder = json.JSONDecoder()
+        self.buf = ''
+        self.pos = 0
+
+    def feed(self, chunk):
+        """
+        Parse a chunk of output.
+
+        :param chunk: next chunk of output
+        :type chunk: str
+        :return: list of tuples of filename and EXIF metadata of files completed by the chunk
+        :rtype: list
+        """
+        import json
+
+        buf = self.buf[self.pos:] + chunk
+        pos = 0
+        records = []
+
+        while True:
+            while pos < len(buf) and buf[pos] in self.separators:
+                pos += 1
+
+            if pos == len(buf):
+                break
+
+            try:
+                record, pos_end = self.decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                # Record is incomplete, wait for the next chunk
+                break
+
+            pos = pos_end
+            fnamekey = record.pop('SourceFile')
+            record['about'] = fnamekey  # As output by `exiftool -xmlFormat`
+            records.append((fnamekey, record))
+
+        self.buf = buf
+        self.pos = pos
+        return records
+
+    def close(self):
+        """
+        Check that all output was parsed, once the command is done.
+        """
+        rest = self.buf[self.pos:]
+        if rest.strip(self.separators):
+            msg = 'Failed in parsing `exiftool -json` output: ' + rest[:200]
+            self.logger.error(msg)
+            raise Exception(msg)
+
+
+@pydoni.governor.tool('ffmpeg', weight=2)
 class FFmpeg(object):
     """
     Wrapper for FFmpeg BASH commands.
@@ -1357,6 +850,11 @@ class FFmpeg(object):
         import pydoni.sh
 
         self.bin = pydoni.sh.find_binary('ffmpeg')
+        if not os.path.isfile(self.bin):
+            # Removed since it was found and cached, look it up again
+            pydoni.sh._forget_binary(self.bin)
+            self.bin = pydoni.sh.find_binary('ffmpeg')
+
         assert os.path.isfile(self.bin)
 
         self.logger = pydoni.logger_setup(
@@ -1365,6 +863,7 @@ class FFmpeg(object):
 
         self.logger.logvars(locals())
 
+    @pydoni.trace.traced()
     def compress(self, file, outfile=None):
         """
         Compress audiofile on system by exporting it at 32K.
@@ -1375,10 +874,24 @@ class FFmpeg(object):
                         as `file`. If None (default), outfile name will be generated for each file.
         :type outfile: str, list or None
         """
-        import os
-
         self.logger.logvars(locals())
 
+        files, outfiles, cmds = self._compress_commands(file, outfile)
+
+        # Files are compressed in parallel, stopping at the first failure
+        results = pydoni.syscmd_many(cmds, stop_on_error=True)
+        self._check_compress_results(files, outfiles, results)
+
+    def _compress_commands(self, file, outfile):
+        """
+        Validate arguments of `compress()`, remove existing output files and build one `ffmpeg`
+        command per file.
+
+        :return: tuple of input files, output files and commands
+        :rtype: tuple
+        """
+        import os
+
         files = pydoni.ensurelist(file)
         for f in files:
             if not os.path.isfile(f):
@@ -1391,25 +904,44 @@ class FFmpeg(object):
                 self.logger.error("Specified input and output filepaths are of different lengths")
                 assert len(files) == len(outfiles)
 
-        for i, f in enumerate(files):
-            tmpoutfile = pydoni.append_filename_suffix(f, '-COMPRESSED') if outfile is None else outfiles[i]
+        if outfile is None:
+            outfiles = [pydoni.append_filename_suffix(f, '-COMPRESSED') for f in files]
+
+        cmds = []
+        for f, tmpoutfile in zip(files, outfiles):
             if os.path.isfile(tmpoutfile):
                 os.remove(tmpoutfile)
 
-            try:
-                cmd = '{} -i "{}" -map 0:a:0 -b:a 32k "{}"'.format(self.bin, f, tmpoutfile)
-                self.logger.debug(cmd)
+            cmds.append([self.bin, '-i', f, '-map', '0:a:0', '-b:a', '32k', tmpoutfile])
+            self.logger.debug(cmds[-1])
 
-                pydoni.syscmd(cmd)
-                self.logger.info("Compressed '%s' to '%s'" % (f, tmpoutfile))
+        return files, outfiles, cmds
 
-            except Exception as e:
+    def _check_compress_results(self, files, outfiles, results):
+        """
+        Log the outcome of compressing each file, removing partial output of failed commands,
+        and raise if any command failed.
+        """
+        import os
+        import subprocess
+
+        failed = []
+        for f, tmpoutfile, res in zip(files, outfiles, results):
+            if isinstance(res, subprocess.CompletedProcess) and res.returncode == 0:
+                self.logger.info("Compressed '%s' to '%s'" % (f, tmpoutfile))
+            else:
                 if os.path.isfile(tmpoutfile):
                     os.remove(tmpoutfile)
 
-                self.logger.exception('Failed to run FFMpeg to compress audiofile')
-                raise e
+                if res is not None:
+                    failed.append(f)
 
+        if failed:
+            msg = 'Failed to run FFMpeg to compress audiofile: ' + str(failed)
+            self.logger.error(msg)
+            raise Exception(msg)
+
+    @pydoni.trace.traced()
     def join(self, audiofiles, outfile):
         """
         Join multiple audio files into a single audio file using a direct call to FFMpeg.
@@ -1419,10 +951,23 @@ class FFmpeg(object):
         :param outfile: name of file to create from joined audio files
         :type outfile: str
         """
+        self.logger.logvars(locals())
 
-        import os
+        cmd, fname_map, tmpfile = self._join_prepare(audiofiles, outfile)
+        try:
+            run(cmd)
+        finally:
+            self._join_cleanup(fname_map, tmpfile)
 
-        self.logger.logvars(locals())
+    def _join_prepare(self, audiofiles, outfile):
+        """
+        Write the list of files to join to a temporary file, renaming files with characters
+        that cannot be listed, and build the `ffmpeg` command joining them.
+
+        :return: tuple of command, map of original to temporary filenames, and path to list file
+        :rtype: tuple
+        """
+        import os
 
         assert isinstance(audiofiles, list)
         assert len(audiofiles) > 1
@@ -1455,9 +1000,16 @@ class FFmpeg(object):
         # Old command 2020-01-30 15:59:04
         # cmd = 'ffmpeg -i "concat:{}" -acodec copy "{}"'.format('|'.join(audiofiles), outfile)
 
-        cmd = '{} -f concat -safe 0 -i "{}" -c copy "{}"'.format(self.bin, tmpfile, outfile)
+        cmd = [self.bin, '-f', 'concat', '-safe', '0', '-i', tmpfile, '-c', 'copy', outfile]
         self.logger.var('cmd', cmd)
-        pydoni.syscmd(cmd)
+
+        return cmd, fname_map, tmpfile
+
+    def _join_cleanup(self, fname_map, tmpfile):
+        """
+        Restore filenames changed by `_join_prepare()` and remove its list file.
+        """
+        import os
 
         for f, nf in fname_map.items():
             os.rename(nf, f)
@@ -1465,6 +1017,7 @@ class FFmpeg(object):
         if os.path.isfile(tmpfile):
             os.remove(tmpfile)
 
+    @pydoni.trace.traced()
     def split(self, audiofile, segment_time):
         """
         Split audiofile into `segment_time` second size chunks.
@@ -1474,21 +1027,21 @@ class FFmpeg(object):
         :param segment_time: desired number of seconds of each chunk
         :type segment_time: int
         """
+        cmd = self._split_command(audiofile, segment_time)
+        self.logger.logvars(locals())
+        run(cmd)
 
+    def _split_command(self, audiofile, segment_time):
+        """
+        Build the `ffmpeg` command of `split()`.
+        """
         import os
 
         audiofile = os.path.abspath(audiofile)
-        cmd = '{} -i "{}" -f segment -segment_time {} -c copy "{}-ffmpeg-%03d{}"'.format(
-            self.bin,
-            audiofile,
-            segment_time,
-            os.path.splitext(audiofile)[0],
-            os.path.splitext(audiofile)[1])
-
-        self.logger.logvars(locals())
-
-        pydoni.syscmd(cmd)
+        return [self.bin, '-i', audiofile, '-f', 'segment', '-segment_time', str(segment_time),
+                '-c', 'copy', '{}-ffmpeg-%03d{}'.format(*os.path.splitext(audiofile))]
 
+    @pydoni.trace.traced()
     def m4a_to_mp3(self, m4a_file):
         """
         Use ffmpeg to convert a .m4a file to .mp3.
@@ -1496,16 +1049,21 @@ class FFmpeg(object):
         :param m4a_file: path to file to convert to .mp3
         :type m4a_file: str
         """
+        cmd = self._m4a_to_mp3_command(m4a_file)
+        self.logger.logvars(locals())
+        run(cmd)
+
+    def _m4a_to_mp3_command(self, m4a_file):
+        """
+        Build the `ffmpeg` command of `m4a_to_mp3()`.
+        """
         import os
 
         m4a_file = os.path.abspath(m4a_file)
-        cmd = '{} -i "{}" -codec:v copy -codec:a libmp3lame -q:a 2 "{}.mp3"'.format(
-            self.bin, m4a_file, os.path.splitext(m4a_file)[0])
-
-        self.logger.logvars(locals())
-
-        pydoni.syscmd(cmd)
+        return [self.bin, '-i', m4a_file, '-codec:v', 'copy', '-codec:a', 'libmp3lame', '-q:a',
+                '2', os.path.splitext(m4a_file)[0] + '.mp3']
 
+    @pydoni.trace.traced()
     def to_gif(self, moviefile, giffile=None, fps=10):
         """
         Convert movie file to gif.
@@ -1518,17 +1076,23 @@ class FFmpeg(object):
         :param fps: desired frames per second of output gif
         :type fps: int
         """
+        cmd = self._to_gif_command(moviefile, giffile, fps)
+        self.logger.logvars(locals())
+        run(cmd)
+
+    def _to_gif_command(self, moviefile, giffile, fps):
+        """
+        Build the `ffmpeg` command of `to_gif()`, removing an existing output file.
+        """
         import os
 
         outfile = giffile if giffile is not None else os.path.splitext(moviefile)[0] + '.gif'
         moviefile = os.path.abspath(moviefile)
-        cmd = '{} -i "{}" -r {} "{}"'.format(self.bin, moviefile, str(fps), outfile)
 
         if os.path.isfile(outfile):
             os.remove(outfile)
 
-        self.logger.logvars(locals())
-        pydoni.syscmd(cmd)
+        return [self.bin, '-i', moviefile, '-r', str(fps), outfile]
 
 
 class Git(object):
@@ -1575,21 +1139,18 @@ class Git(object):
         :return: bool
         """
 
-        import os
-
-        owd = os.getcwd()
-        if dir != owd:
-            os.chdir(dir)
-
         self.logger.logvars(locals())
 
-        out = pydoni.syscmd('git status').decode()
+        out = run(['git', 'status'], encoding='utf-8', merge_stderr=True, cwd=dir).stdout
+        return self._parse_status(out)
+
+    def _parse_status(self, out):
+        """
+        Interpret the output of 'git status', see `status()`.
+        """
         working_tree_clean = "On branch masterYour branch is up to date with 'origin/master'.nothing to commit, working tree clean"
         not_git_repo = 'fatal: not a git repository (or any of the parent directories): .git'
 
-        if dir != owd:
-            os.chdir(owd)
-
         if out.replace('\n', '') == working_tree_clean:
             self.logger.info('Status: Working tree clean')
             return True
@@ -1612,15 +1173,23 @@ class Git(object):
         self.logger.var('fpath', fpath)
         self.logger.var('all', all)
 
+        cmd = self._add_command(fpath, all)
+        if cmd is not None:
+            run(cmd)
+
+    def _add_command(self, fpath, all):
+        """
+        Build the 'git add' command of `add()`, or None if the options are nonsensical.
+        """
         if all == True and fpath is None:
-            pydoni.syscmd('git add .;', encoding='utf-8')
+            return ['git', 'add', '.']
         elif isinstance(fpath, str):
-            pydoni.syscmd('git add "%s";' % fpath, encoding='utf-8')
+            return ['git', 'add', fpath]
         elif isinstance(fpath, list):
-            for f in fpath:
-                pydoni.syscmd('git add "%s";' % f, encoding='utf-8')
+            return ['git', 'add', '--'] + fpath
         else:
             self.logger.error('Nonsensical `fpath` and `all` options! Nothing done.')
+            return None
 
     def commit(self, msg):
         """
@@ -1629,32 +1198,33 @@ class Git(object):
         :param msg: commit message
         :type msg: str
         """
-        import subprocess
-
         self.logger.var('msg', msg)
-        cmd = "git commit -m '{}';".format(msg)
-        self.logger.var('cmd', cmd)
-        subprocess.call(cmd, shell=True)
+        self._run(['git', 'commit', '-m', msg])
 
     def push(self):
         """
         Execute 'git push'.
         """
-        import subprocess
-
-        cmd = "git push;"
-        self.logger.var('cmd', cmd)
-        subprocess.call(cmd, shell=True)
+        self._run(['git', 'push'])
 
     def pull(self):
         """
         Execute 'git pull'.
         """
-        import subprocess
+        self._run(['git', 'pull'])
 
-        cmd = "git pull;"
+    def _run(self, cmd):
+        """
+        Run a git command through `run()`, logging its output and any non-zero exit status.
+        """
         self.logger.var('cmd', cmd)
-        subprocess.call(cmd, shell=True)
+
+        res = run(cmd, encoding='utf-8', merge_stderr=True)
+        if res.stdout.strip():
+            self.logger.info(res.stdout.strip())
+
+        if res.returncode != 0:
+            self.logger.error("'%s' exited with status %s" % (' '.join(cmd[:2]), res.returncode))
 
 
 class AppleScript(object):
@@ -1723,11 +1293,1961 @@ class AppleScript(object):
         self.execute(applescript)
 
 
-def find_binary(bin_name, bin_paths=['/usr/bin', '/usr/local/bin'], abort=False, return_first=False):
+def _argfile_safe(arg):
+    """
+    Check whether an `exiftool` argument passes through an argfile (`-@`), or the standard
+    input of a session (`-@ -`), unchanged. `exiftool` reads such arguments one per line,
+    removes leading whitespace and the line ending, removes whitespace before and a single
+    space after the '=' of a '-TAG=VALUE' argument, and ignores blank lines and lines starting
+    with '#'. Arguments that may be changed are passed on the command line instead.
+
+    :param arg: argument, i.e. a filename or '-TAG=VALUE'
+    :type arg: str
+    :rtype: bool
+    """
+    if not arg or arg != arg.strip() or arg.startswith('#') or '\n' in arg or '\r' in arg:
+        return False
+
+    if arg.startswith('-') and '=' in arg:
+        name, _, value = arg.partition('=')
+        if name != name.rstrip() or value != value.strip() or value.startswith('#'):
+            return False
+
+    return True
+
+
+class ExifToolSession(object):
+    """
+    Long-lived `exiftool -stay_open True -@ -` process running any number of `exiftool`
+    commands, so that the Perl interpreter (~200 ms) starts once rather than once per command.
+
+    Arguments of a command are written to the process' standard input one per line, followed
+    by `-execute{N}`, so they must pass through an argfile unchanged (see `_argfile_safe()`).
+    `exiftool` writes `{readyN}` to standard output when the command is done, and
+    `-echo4 {readyN}` has it write the same marker to standard error, so that the output of
+    each command is read up to its markers.
+
+    A session runs one command at a time. Use `ExifToolPool` to share sessions between threads.
+    If the process exits, or is killed by `abort()`, it is restarted on the next command.
+
+    :param bin: [optional] path to `exiftool` binary
+    :type bin: str
+    :param timeout: [optional] number of seconds after which a command is abandoned and the
+                    process killed
+    :type timeout: float
+    """
+
+    def __init__(self, bin=None, timeout=None):
+        import threading
+
+        self.logger = pydoni.logger_setup(
+            name=pydoni.what_is_my_name(classname=self.__class__.__name__, with_modname=True),
+            level=pydoni.modloglev)
+
+        self.bin = bin or find_binary('exiftool', abort=True)
+        self.timeout = timeout
+        self.proc = None
+        self.started = False
+        self.seq = 0
+        self.running = None  # Number of the command running, if any
+        self.lock = threading.Lock()
+        self.abort_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+        return False
+
+    def is_alive(self):
+        """
+        Check whether the `exiftool` process is running.
+
+        :rtype: bool
+        """
+        return self.proc is not None and self.proc.poll() is None
+
+    def _start(self):
+        """
+        Start the `exiftool` process, restarting it if it exited.
+        """
+        import subprocess
+
+        if self.started:
+            # Exited or was killed, outside of `close()`
+            self.logger.warning('Restarting exiftool session')
+            self._kill()
+            pydoni.metrics.incr('exiftool_restarts_total')
+
+        try:
+            self.proc = subprocess.Popen(
+                [self.bin, '-stay_open', 'True', '-@', '-'],
+                stdin             = subprocess.PIPE,
+                stdout            = subprocess.PIPE,
+                stderr            = subprocess.PIPE,
+                close_fds         = True,
+                start_new_session = True)
+        except FileNotFoundError:
+            _forget_binary(self.bin)
+            raise
+
+        self.started = True
+        pydoni.metrics.incr('subprocess_spawned_total')
+
+    def execute(self, args, encoding='utf-8', on_start=None, on_stdout=None):
+        """
+        Run an `exiftool` command in the session.
+
+        :param args: arguments to `exiftool`, all of which must pass `_argfile_safe()`
+        :type args: list
+        :param encoding: [optional] name of encoding to decode output with, returned as bytes
+                         if None
+        :type encoding: str
+        :param on_start: [optional] function called with the session and the number of the
+                         command before it is sent, i.e. to `abort()` it from another thread.
+                         If it raises, the command is not run
+        :type on_start: function
+        :param on_stdout: [optional] function called with each chunk of standard output, as
+                          bytes, as `exiftool` writes it. Standard output is then not kept, and
+                          is returned empty. If it raises, the process is killed
+        :type on_stdout: function
+        :return: completed process with the output of the command. `exiftool` does not report
+                 an exit status per command, so `returncode` is 1 if it wrote an error message
+                 and 0 otherwise
+        :rtype: subprocess.CompletedProcess
+        """
+        import subprocess
+        import time
+
+        args = [str(x) for x in args]
+        assert all(_argfile_safe(x) for x in args), 'Arguments would be changed in an argfile'
+
+        with self.lock, pydoni.governor.acquire(pydoni.governor.weight_of([self.bin])):
+            if not self.is_alive():
+                self._start()
+
+            self.seq += 1
+            marker = '{ready%d}' % self.seq
+            request = args + ['-echo4', marker, '-execute%d' % self.seq]
+
+            if on_start is not None:
+                on_start(self, self.seq)
+
+            with self.abort_lock:
+                self.running = self.seq
+
+            start = time.perf_counter()
+            nbytes = []
+            try:
+                self.proc.stdin.write(('\n'.join(request) + '\n').encode('utf-8'))
+                self.proc.stdin.flush()
+                stdout, stderr = self._read(marker.encode('utf-8'), on_stdout, nbytes)
+
+            except BaseException:
+                # The process may be left mid-command, so it cannot be reused
+                self._kill()
+                raise
+
+            finally:
+                with self.abort_lock:
+                    self.running = None
+
+                pydoni.metrics.incr('exiftool_requests_total')
+                pydoni.metrics.incr('subprocess_seconds_total', time.perf_counter() - start)
+
+        pydoni.metrics.incr('subprocess_stdout_bytes_total', sum(nbytes))
+
+        returncode = 1 if any(line.startswith(b'Error') for line in stderr.splitlines()) else 0
+        if encoding:
+            stdout = stdout.decode(encoding, 'replace')
+            stderr = stderr.decode(encoding, 'replace')
+
+        return subprocess.CompletedProcess([self.bin] + args, returncode, stdout, stderr)
+
+    def _read(self, marker, on_stdout=None, nbytes=None):
+        """
+        Read standard output and standard error of the running command up to its `{readyN}`
+        markers, reading both at once so that neither pipe fills up. Only the end of each
+        buffer, which may hold the marker, is searched for it.
+
+        :param marker: marker written by `exiftool` when the command is done
+        :type marker: bytes
+        :param on_stdout: [optional] function standard output is passed to as it is read, but
+                          for the end that may hold the marker, rather than kept
+        :type on_stdout: function
+        :param nbytes: [optional] list the number of bytes of each read of standard output is
+                       appended to
+        :type nbytes: list
+        :return: standard output and standard error, without markers
+        :rtype: tuple
+        """
+        import os
+        import selectors
+        import subprocess
+        import time
+
+        deadline = time.monotonic() + self.timeout if self.timeout is not None else None
+        buffers = {self.proc.stdout: bytearray(), self.proc.stderr: bytearray()}
+        tail = len(marker) + 16  # Marker and the whitespace around it
+        done = set()
+
+        with selectors.DefaultSelector() as sel:
+            for pipe in buffers:
+                sel.register(pipe, selectors.EVENT_READ)
+
+            while len(done) < len(buffers):
+                wait = None
+                if deadline is not None:
+                    wait = deadline - time.monotonic()
+                    if wait <= 0:
+                        raise subprocess.TimeoutExpired([self.bin, '-stay_open'], self.timeout)
+
+                for key, _ in sel.select(wait):
+                    data = os.read(key.fd, 65536)
+                    if not data:
+                        msg = 'exiftool session exited while running a command'
+                        self.logger.error(msg)
+                        raise Exception(msg)
+
+                    buf = buffers[key.fileobj]
+                    buf += data
+                    if key.fileobj is self.proc.stdout and nbytes is not None:
+                        nbytes.append(len(data))
+
+                    if bytes(buf[-tail:]).rstrip().endswith(marker):
+                        sel.unregister(key.fileobj)
+                        done.add(key.fileobj)
+                    elif key.fileobj is self.proc.stdout and on_stdout and len(buf) > tail:
+                        on_stdout(bytes(buf[:-tail]))
+                        del buf[:-tail]
+
+        stdout, stderr = [bytes(buf.rstrip()[:-len(marker)]) for buf in buffers.values()]
+        if on_stdout is not None:
+            if stdout:
+                on_stdout(stdout)
+            stdout = b''
+
+        return stdout, stderr
+
+    def abort(self, seq):
+        """
+        Kill the `exiftool` process if it is running command number `seq`, so that the command
+        fails rather than running to completion. Safe to call from any thread, and does nothing
+        once the command is done.
+
+        :param seq: number of the command, as passed to `on_start` by `execute()`
+        :type seq: int
+        """
+        with self.abort_lock:
+            if self.running == seq and self.proc is not None:
+                self.logger.warning('Aborting exiftool command %s' % seq)
+                pydoni._killpg(self.proc)
+
+    def close(self):
+        """
+        Stop the `exiftool` process, waiting briefly for it to exit before killing it.
+        """
+        import subprocess
+
+        with self.lock:
+            if self.proc is None:
+                return None
+
+            try:
+                self.proc.stdin.write(b'-stay_open\nFalse\n')
+                self.proc.stdin.flush()
+                self.proc.wait(timeout=5)
+            except (OSError, ValueError, subprocess.TimeoutExpired):
+                pass
+
+            self._kill()
+            self.started = False
+
+    def _kill(self):
+        """
+        Kill the `exiftool` process if it is running, and close its pipes.
+        """
+        if self.proc is None:
+            return None
+
+        if self.proc.poll() is None:
+            pydoni._killpg(self.proc)
+
+        for pipe in (self.proc.stdin, self.proc.stdout, self.proc.stderr):
+            try:
+                pipe.close()
+            except OSError:
+                pass
+
+        self.proc = None
+
+
+class ExifToolPool(object):
+    """
+    Pool of `ExifToolSession` processes shared by threads. Each command runs in the first idle
+    session, and sessions are started as they are first needed.
+
+    `EXIF` runs its commands in the pool returned by `exiftool_pool()` by default.
+
+    :param size: [optional] maximum number of sessions, defaults to the number of CPUs
+    :type size: int
+    :param bin: [optional] path to `exiftool` binary
+    :type bin: str
+    :param timeout: [optional] number of seconds after which a command is abandoned and its
+                    session restarted
+    :type timeout: float
+    """
+
+    def __init__(self, size=None, bin=None, timeout=None):
+        import os
+        import queue
+
+        self.size = size or os.cpu_count() or 1
+        assert self.size > 0
+
+        self.bin = bin or find_binary('exiftool', abort=True)
+        self.sessions = [ExifToolSession(self.bin, timeout=timeout) for _ in range(self.size)]
+        self.idle = queue.LifoQueue()  # Most recently used first, so that few processes start
+        for session in reversed(self.sessions):
+            self.idle.put(session)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+        return False
+
+    def execute(self, args, encoding='utf-8', on_start=None, on_stdout=None):
+        """
+        Run an `exiftool` command in an idle session, waiting for one if all are busy. A
+        command with an argument a session would receive changed (see `_argfile_safe()`), i.e.
+        a tag value starting with a space, is run in its own `exiftool` process.
+
+        :param args: arguments to `exiftool`
+        :type args: list
+        :param encoding: [optional] name of encoding to decode output with
+        :type encoding: str
+        :param on_start: [optional] function called with the session and the number of the
+                         command before it is sent, see `ExifToolSession.execute()`. Not called
+                         for a command run in its own process
+        :type on_start: function
+        :param on_stdout: [optional] function called with each chunk of standard output as it
+                          is written, see `ExifToolSession.execute()`. Called once with all of
+                          it for a command run in its own process
+        :type on_stdout: function
+        :rtype: subprocess.CompletedProcess
+        """
+        import subprocess
+
+        args = [str(x) for x in args]
+        if not all(_argfile_safe(x) for x in args):
+            if on_stdout is None:
+                return run([self.bin] + args, encoding=encoding)
+
+            res = run([self.bin] + args)
+            on_stdout(res.stdout)
+            return subprocess.CompletedProcess(
+                res.args, res.returncode, '' if encoding else b'',
+                res.stderr.decode(encoding, 'replace') if encoding else res.stderr)
+
+        session = self.idle.get()
+        try:
+            return session.execute(args, encoding=encoding, on_start=on_start, on_stdout=on_stdout)
+        finally:
+            self.idle.put(session)
+
+    def execute_many(self, arglists, encoding='utf-8'):
+        """
+        Run `exiftool` commands in all sessions at once.
+
+        :param arglists: arguments of each command
+        :type arglists: list
+        :param encoding: [optional] name of encoding to decode output with
+        :type encoding: str
+        :return: result of each command in input order, either a `subprocess.CompletedProcess`
+                 or the exception raised running it
+        :rtype: list
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        arglists = list(arglists)
+        workers = min(self.size, len(arglists))
+
+        def execute(args):
+            try:
+                return self.execute(args, encoding=encoding)
+            except Exception as e:
+                return e
+
+        if workers <= 1:
+            return [execute(args) for args in arglists]
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(execute, arglists))
+
+    def close(self):
+        """
+        Stop all sessions. Sessions are started again if the pool is used afterwards.
+        """
+        for session in self.sessions:
+            session.close()
+
+
+class AsyncEXIF(EXIF):
+    """
+    `EXIF` with coroutine `extract()`, `write()` and `remove()` methods that never block an
+    asyncio event loop. Commands run in the session pool on the loop's default executor or,
+    without a pool, with `run_async()`, concurrently, subject to the limit set with
+    `set_async_limit()`. If the awaiting task is cancelled, running commands are killed, along
+    with their sessions, which restart on their next command.
+
+    :param fname: full path to target filename or list of filenames
+    :type fname: str, list
+    :param pool: [optional] pool of `exiftool` sessions to run commands in, True for the shared
+                 pool, or False to start an `exiftool` process per command
+    :type pool: bool, ExifToolPool
+    """
+
+    async def extract(self,
+                      method='doni',
+                      clean=True,
+                      numeric=False,
+                      cache=True,
+                      tags=None,
+                      groups=None,
+                      fast=None):
+        """
+        Extract EXIF metadata from file or files, see `EXIF.extract()`.
+
+        :param method: method for metadata extraction, only 'doni' is supported
+        :type method: str
+        :param clean: apply EXIF.clean() to EXIF output
+        :type clean: bool
+        :param numeric: extract values without print conversion (`exiftool -n`)
+        :type numeric: bool
+        :param cache: use the persistent cache set with `set_exif_cache()`, if any
+        :type cache: bool
+        :param tags: [optional] extract only these tags, by `exiftool` tag name
+        :type tags: str, list
+        :param groups: [optional] extract only tags of these groups
+        :type groups: str, list
+        :param fast: [optional] read less of each file, 1 (`-fast`) or 2 (`-fast2`)
+        :type fast: int
+        :return: EXIF metadata
+        :rtype: dict
+        """
+        assert method == 'doni'
+
+        options = self._extract_options(numeric, tags, groups, fast)
+        cache, variant, found, files, identities = self._cache_lookup(cache, options, clean)
+        batches = self._extract_batches(files)
+
+        results = await _gather(self._extract_batch_async(options, b) for b in batches)
+
+        exifd = {}
+        for result in results:
+            exifd.update(result)
+
+        exifd = self._extract_finish(exifd, clean)
+        return self._cache_store(exifd, cache, variant, found, identities)
+
+    async def write(self, tags, values):
+        """
+        Write EXIF attribute(s) on a file or list of files, see `EXIF.write()`.
+
+        :param tags: tag names to write to
+        :type tags: str, list
+        :param values: desired tag values
+        :type values: str, list
+        :return: True if all files were written. Whether each file was written is set as
+                 `self.written`, by filename
+        :rtype: bool
+        """
+        tags = [tags] if isinstance(tags, str) else tags
+        values = [values] if isinstance(values, str) or isinstance(values, int) else values
+        assert len(tags) == len(values)
+
+        self._is_valid_tag_name(tags)
+
+        res = await self._execute_batch_async(self._write_args(tags, values))
+        self.written = self._check_batch_results(
+            res, 'Tags: %s | Values: %s' % (str(tags), str(values)))
+
+        return all(self.written.values())
+
+    async def remove(self, tags):
+        """
+        Remove EXIF attribute from a file or list of files, see `EXIF.remove()`.
+
+        :param tags: tag names to remove
+        :type tags: str, list
+        :return: True if all files were written. Whether each file was written is set as
+                 `self.written`, by filename
+        :rtype: bool
+        """
+        tags = [tags] if isinstance(tags, str) else tags
+
+        self._is_valid_tag_name(tags)
+
+        res = await self._execute_batch_async(self._remove_args(tags))
+        self.written = self._check_batch_results(res, 'Tags: %s' % str(tags))
+        return all(self.written.values())
+
+    async def _extract_batch_async(self, options, batch):
+        """
+        Coroutine equivalent of `EXIF._extract_batch()`.
+        """
+        import os
+
+        if self.pool is not None and all(_argfile_safe(x) for x in options + batch):
+            exifd, receive = self._json_receiver()
+            await self._pool_execute_async(options + batch, on_stdout=receive)
+            receive(None)
+            return exifd
+
+        cmd, argfile = self._argfile_command(options, batch)
+        try:
+            res = await run_async(cmd, encoding='utf-8')
+        finally:
+            os.remove(argfile)
+
+        return self._parse_json([res.stdout])
+
+    async def _execute_batch_async(self, args):
+        """
+        Coroutine equivalent of `EXIF._execute_batch()`.
+        """
+        import os
+
+        if self.pool is not None and all(_argfile_safe(x) for x in args + self.fpath):
+            return await self._pool_execute_async(args + self.fpath)
+
+        cmd, argfile = self._argfile_command(args, self.fpath)
+        try:
+            return await run_async(cmd, encoding='utf-8')
+        finally:
+            os.remove(argfile)
+
+    async def _pool_execute_async(self, args, on_stdout=None):
+        """
+        Run an `exiftool` command in a session of the pool on the event loop's default executor,
+        holding a slot of the limit set with `set_async_limit()`. If the awaiting task is
+        cancelled, the command is abandoned: it is never sent if it has not started, and its
+        session's process is killed otherwise.
+
+        :param args: arguments to `exiftool`, all of which must pass `_argfile_safe()`
+        :type args: list
+        :param on_stdout: [optional] function called on the executor's thread with each chunk
+                          of standard output, see `ExifToolSession.execute()`
+        :type on_stdout: function
+        :rtype: subprocess.CompletedProcess
+        """
+        import asyncio
+        import threading
+
+        lock = threading.Lock()
+        started = []  # Session and number of the command, once it is sent
+        cancelled = []
+
+        def on_start(session, seq):
+            with lock:
+                if cancelled:
+                    raise Exception('exiftool command cancelled')
+
+                started.append((session, seq))
+
+        async with _async_semaphore():
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(
+                None, lambda: self.pool.execute(
+                    args, encoding='utf-8', on_start=on_start, on_stdout=on_stdout))
+
+            try:
+                return await asyncio.shield(future)
+
+            except asyncio.CancelledError:
+                with lock:
+                    cancelled.append(True)
+                    for session, seq in started:
+                        session.abort(seq)
+
+                if started:
+                    # Wait for the session to be killed and returned to the pool
+                    await asyncio.gather(future, return_exceptions=True)
+
+                raise
+
+
+class AsyncFFmpeg(FFmpeg):
+    """
+    `FFmpeg` with coroutine methods, running `ffmpeg` with `run_async()` so that an asyncio
+    event loop is never blocked.
+    """
+
+    async def compress(self, file, outfile=None):
+        """
+        Compress audiofile on system by exporting it at 32K, see `FFmpeg.compress()`. Files
+        are compressed concurrently, subject to the limit set with `set_async_limit()`.
+
+        :param file: paths to file or files to compress
+        :type file: str, list
+        :param outfile: paths to file or files to write to
+        :type outfile: str, list or None
+        """
+        import asyncio
+
+        files, outfiles, cmds = self._compress_commands(file, outfile)
+        results = await asyncio.gather(*[run_async(cmd) for cmd in cmds], return_exceptions=True)
+        self._check_compress_results(files, outfiles, results)
+
+    async def join(self, audiofiles, outfile):
+        """
+        Join multiple audio files into a single audio file, see `FFmpeg.join()`.
+
+        :param audiofiles: list of audio filenames to join together
+        :type audiofiles: list
+        :param outfile: name of file to create from joined audio files
+        :type outfile: str
+        """
+        cmd, fname_map, tmpfile = self._join_prepare(audiofiles, outfile)
+        try:
+            await run_async(cmd)
+        finally:
+            self._join_cleanup(fname_map, tmpfile)
+
+    async def split(self, audiofile, segment_time):
+        """
+        Split audiofile into `segment_time` second size chunks, see `FFmpeg.split()`.
+
+        :param audiofile: audiofile to split
+        :type audiofile: str
+        :param segment_time: desired number of seconds of each chunk
+        :type segment_time: int
+        """
+        await run_async(self._split_command(audiofile, segment_time))
+
+    async def m4a_to_mp3(self, m4a_file):
+        """
+        Use ffmpeg to convert a .m4a file to .mp3, see `FFmpeg.m4a_to_mp3()`.
+
+        :param m4a_file: path to file to convert to .mp3
+        :type m4a_file: str
+        """
+        await run_async(self._m4a_to_mp3_command(m4a_file))
+
+    async def to_gif(self, moviefile, giffile=None, fps=10):
+        """
+        Convert movie file to gif, see `FFmpeg.to_gif()`.
+
+        :param moviefile: path to movie file
+        :type moviefile: str
+        :param giffile: path to output gif file
+        :type giffile: str, None
+        :param fps: desired frames per second of output gif
+        :type fps: int
+        """
+        await run_async(self._to_gif_command(moviefile, giffile, fps))
+
+
+class AsyncGit(Git):
+    """
+    `Git` with coroutine methods, running `git` with `run_async()` so that an asyncio event
+    loop is never blocked. Output of `commit()`, `push()` and `pull()` is logged rather than
+    written to the terminal.
+    """
+
+    async def status(self, dir=None):
+        """
+        Return boolean based on output of 'git status' command, see `Git.status()`.
+
+        :param dir: [optional] directory to run 'git status' in, defaults to working directory
+        :type dir: str
+        :return: bool
+        """
+        res = await run_async(['git', 'status'], encoding='utf-8', merge_stderr=True, cwd=dir)
+        return self._parse_status(res.stdout)
+
+    async def add(self, fpath=None, all=False):
+        """
+        Add files to commit, see `Git.add()`.
+
+        :param fpath: file(s) to add
+        :type fpath: str, list
+        :param all: execute 'git add .'
+        :type all: bool
+        """
+        cmd = self._add_command(fpath, all)
+        if cmd is not None:
+            await run_async(cmd)
+
+    async def commit(self, msg):
+        """
+        Execute 'git commit -m {}' where {} is commit message.
+
+        :param msg: commit message
+        :type msg: str
+        :return: exit status of 'git commit'
+        :rtype: int
+        """
+        return await self._run_logged(['git', 'commit', '-m', msg])
+
+    async def push(self):
+        """
+        Execute 'git push'.
+
+        :return: exit status of 'git push'
+        :rtype: int
+        """
+        return await self._run_logged(['git', 'push'])
+
+    async def pull(self):
+        """
+        Execute 'git pull'.
+
+        :return: exit status of 'git pull'
+        :rtype: int
+        """
+        return await self._run_logged(['git', 'pull'])
+
+    async def _run_logged(self, cmd):
+        """
+        Run a command and log its output.
+        """
+        self.logger.var('cmd', cmd)
+        res = await run_async(cmd, encoding='utf-8', merge_stderr=True)
+        self.logger.info('%s: %s', ' '.join(cmd[:2]), res.stdout.strip())
+        return res.returncode
+
+
+def run(argv, check=False, input=None, timeout=None, encoding=None, merge_stderr=False, cwd=None):
+    """
+    Run a command given as a list of arguments, without going through a shell. Arguments are
+    passed to the program as they are, so filenames containing quotes, spaces, `$` or other
+    shell metacharacters need no quoting, and no `/bin/sh` process is spawned per call. All
+    wrappers in `pydoni.sh` run their commands through this function.
+
+    Built on `pydoni.syscmd_stream()`, so commands are traced, counted in `pydoni.metrics`,
+    and killed along with their children on timeout.
+
+    Ex: run(['exiftool', '-overwrite_original', '-Title=Don\'t "quote" me', fpath])
+
+    :param argv: program and its arguments, non-string arguments are converted with `str()`
+    :type argv: list
+    :param check: raise `subprocess.CalledProcessError` if the command exits non-zero
+    :type check: bool
+    :param input: [optional] bytes written to the command's standard input
+    :type input: bytes
+    :param timeout: [optional] number of seconds after which the command is killed and
+                    `subprocess.TimeoutExpired` is raised
+    :type timeout: float
+    :param encoding: [optional] name of encoding to decode standard output and error with,
+                     returned as bytes if not specified
+    :type encoding: str
+    :param merge_stderr: return standard error interleaved with standard output
+    :type merge_stderr: bool
+    :param cwd: [optional] directory to run the command in
+    :type cwd: str
+    :return: completed process with `args`, `returncode`, `stdout` and `stderr`
+    :rtype: subprocess.CompletedProcess
+    """
+    import subprocess
+
+    assert isinstance(argv, (list, tuple)) and len(argv) > 0
+
+    argv = [str(x) for x in argv]
+    stream = pydoni.syscmd_stream(argv, mode='chunks', timeout=timeout,
+                                  merge_stderr=merge_stderr, input=input, cwd=cwd)
+    try:
+        stdout = b''.join(stream)
+    except FileNotFoundError:
+        _forget_binary(argv[0])
+        raise
+
+    stderr = stream.stderr
+
+    if encoding:
+        stdout = stdout.decode(encoding)
+        stderr = stderr.decode(encoding) if stderr is not None else None
+
+    if check and stream.returncode != 0:
+        raise subprocess.CalledProcessError(stream.returncode, argv, stdout, stderr)
+
+    return subprocess.CompletedProcess(argv, stream.returncode, stdout, stderr)
+
+
+async def run_async(argv,
+                    check=False,
+                    input=None,
+                    timeout=None,
+                    encoding=None,
+                    merge_stderr=False,
+                    cwd=None):
+    """
+    Coroutine equivalent of `run()`, built on `asyncio.create_subprocess_exec` so that the
+    event loop is not blocked while the command runs.
+
+    At most `set_async_limit()` commands run at once across all callers on the same event loop
+    (`AsyncEXIF`, `AsyncFFmpeg`, `AsyncGit`, `pydoni.syscmd_async()`, ...), further calls wait
+    for a slot. If the awaiting task is cancelled, or the timeout passes, the command is killed
+    along with its whole process group.
+
+    Commands are counted in `pydoni.metrics`, but not traced: spans nest per thread, and the
+    commands of concurrent tasks all run on the event loop's thread.
+
+    :param argv: program and its arguments, non-string arguments are converted with `str()`
+    :type argv: list
+    :param check: raise `subprocess.CalledProcessError` if the command exits non-zero
+    :type check: bool
+    :param input: [optional] data written to the command's standard input
+    :type input: bytes, str
+    :param timeout: [optional] number of seconds after which the command is killed and
+                    `subprocess.TimeoutExpired` is raised
+    :type timeout: float
+    :param encoding: [optional] name of encoding to decode standard output and error with,
+                     returned as bytes if not specified
+    :type encoding: str
+    :param merge_stderr: return standard error interleaved with standard output
+    :type merge_stderr: bool
+    :param cwd: [optional] directory to run the command in
+    :type cwd: str
+    :return: completed process with `args`, `returncode`, `stdout` and `stderr`
+    :rtype: subprocess.CompletedProcess
+    """
+    import asyncio
+    import subprocess
+    import time
+
+    assert isinstance(argv, (list, tuple)) and len(argv) > 0
+
+    argv = [str(x) for x in argv]
+    if isinstance(input, str):
+        input = input.encode(encoding or 'utf-8')
+
+    async with _async_semaphore():
+        with await pydoni.governor.acquire_async(pydoni.governor.weight_of(argv)):
+            return await _run_async(argv, check, input, timeout, encoding, merge_stderr, cwd)
+
+
+async def _run_async(argv, check, input, timeout, encoding, merge_stderr, cwd):
+    """
+    Run a command for `run_async()` once it holds a concurrency slot and governor tokens.
+    """
+    import asyncio
+    import subprocess
+    import time
+
+    start = time.perf_counter()
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *argv,
+            stdin=asyncio.subprocess.PIPE if input is not None else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT if merge_stderr else asyncio.subprocess.PIPE,
+            cwd=cwd,
+            start_new_session=True)
+    except FileNotFoundError:
+        _forget_binary(argv[0])
+        raise
+
+    stdout = b''
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(input), timeout)
+    except asyncio.TimeoutError:
+        raise subprocess.TimeoutExpired(argv, timeout)
+    finally:
+        if proc.returncode is None:
+            # Cancelled or timed out before the command exited
+            _killpg_async(proc)
+            await proc.wait()
+
+        pydoni.metrics.incr('subprocess_spawned_total')
+        pydoni.metrics.incr('subprocess_seconds_total', time.perf_counter() - start)
+        pydoni.metrics.incr('subprocess_stdout_bytes_total', len(stdout))
+
+    stderr = stderr if stderr is not None else b''
+    if encoding:
+        stdout = stdout.decode(encoding)
+        stderr = stderr.decode(encoding)
+
+    if check and proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, argv, stdout, stderr)
+
+    return subprocess.CompletedProcess(argv, proc.returncode, stdout, stderr)
+
+
+def _killpg_async(proc):
+    """
+    Kill the process group of a process started by `run_async()`. The caller must still await
+    `proc.wait()` to reap it.
+
+    :param proc: process to kill
+    :type proc: asyncio.subprocess.Process
+    """
+    import os
+    import signal
+
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+    except AttributeError:
+        # No process groups on this platform
+        proc.kill()
+
+
+def set_async_limit(limit):
+    """
+    Set the maximum number of commands run at once by `run_async()` on each event loop.
+
+    :param limit: maximum number of concurrent commands, None for the number of CPUs
+    :type limit: int
+    """
+    global _async_limit
+
+    assert limit is None or limit > 0
+    _async_limit = limit
+    _async_semaphores.clear()
+
+
+_async_limit = None
+_async_semaphores = {}
+
+
+def _async_semaphore():
+    """
+    Get the semaphore limiting concurrent commands on the running event loop.
+
+    :rtype: asyncio.Semaphore
+    """
+    import asyncio
+    import os
+
+    loop = asyncio.get_running_loop()
+    sem = _async_semaphores.get(loop)
+    if sem is None:
+        # Drop semaphores of closed loops rather than keeping them forever
+        for closed in [l for l in _async_semaphores if l.is_closed()]:
+            del _async_semaphores[closed]
+
+        sem = _async_semaphores[loop] = asyncio.Semaphore(_async_limit or os.cpu_count() or 1)
+
+    return sem
+
+
+async def _gather(coros):
+    """
+    Run coroutines concurrently and return their results in order. If one raises, the others
+    are cancelled (killing their commands) before the exception is raised.
+
+    :param coros: coroutines to run
+    :type coros: iterable
+    :rtype: list
+    """
+    import asyncio
+
+    tasks = [asyncio.ensure_future(c) for c in coros]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+def exiftool_pool():
+    """
+    Get the pool of `exiftool` sessions shared by all `EXIF` instances, created on first use.
+    Its size is set with `set_exiftool_workers()` or the environment variable
+    `PYDONI_EXIFTOOL_WORKERS`, and defaults to the number of CPUs.
+
+    :return: shared pool, or None if sessions are turned off
+    :rtype: ExifToolPool
+    """
+    import atexit
+
+    global _exiftool_pool
+
+    if _exiftool_workers == 0:
+        return None
+
+    if _exiftool_pool is None:
+        with _exiftool_pool_lock:
+            if _exiftool_pool is None:
+                _exiftool_pool = ExifToolPool(size=_exiftool_workers)
+                atexit.register(_exiftool_pool.close)
+
+    return _exiftool_pool
+
+
+def set_exiftool_workers(workers):
+    """
+    Set the number of sessions in the pool returned by `exiftool_pool()`, stopping the sessions
+    of the current pool.
+
+    :param workers: number of sessions, None for the number of CPUs, or 0 to turn sessions off
+                    so that `EXIF` starts an `exiftool` process per command
+    :type workers: int
+    """
+    global _exiftool_pool, _exiftool_workers
+
+    assert workers is None or workers >= 0
+
+    with _exiftool_pool_lock:
+        if _exiftool_pool is not None:
+            _exiftool_pool.close()
+
+        _exiftool_pool = None
+        _exiftool_workers = workers
+
+
+def exif_cache():
+    """
+    Get the persistent cache of `EXIF.extract()` results, opened on first use. Its path is set
+    with `set_exif_cache()` or the environment variable `PYDONI_EXIF_CACHE`.
+
+    :return: cache, or None if results are not cached
+    :rtype: pydoni.cache.FileCache
+    """
+    global _exif_cache
+
+    if _exif_cache_path is None:
+        return None
+
+    if _exif_cache is None:
+        with _exif_cache_lock:
+            if _exif_cache is None:
+                _exif_cache = pydoni.cache.FileCache(
+                    _exif_cache_path, maxsize=_exif_cache_maxsize, name='exif')
+
+    return _exif_cache
+
+
+def set_exif_cache(path, maxsize=100000):
+    """
+    Cache `EXIF.extract()` results of each file in a SQLite file, so that files that have not
+    changed since their metadata was extracted are not passed to `exiftool` again.
+
+    :param path: path to SQLite file, or None to stop caching
+    :type path: str
+    :param maxsize: maximum number of results kept, evicting the least recently used
+    :type maxsize: int
+    """
+    global _exif_cache, _exif_cache_path, _exif_cache_maxsize
+
+    with _exif_cache_lock:
+        if _exif_cache is not None:
+            _exif_cache.close()
+
+        _exif_cache = None
+        _exif_cache_path = path
+        _exif_cache_maxsize = maxsize
+
+
+_exiftool_pool = None
+_exiftool_pool_lock = threading.Lock()
+_exiftool_workers = None
+if os.environ.get('PYDONI_EXIFTOOL_WORKERS'):
+    _exiftool_workers = int(os.environ['PYDONI_EXIFTOOL_WORKERS'])
+
+_exif_cache = None
+_exif_cache_lock = threading.Lock()
+_exif_cache_path = os.environ.get('PYDONI_EXIF_CACHE') or None
+_exif_cache_maxsize = 100000
+
+
+# Names of EXIF elements as output by `exiftool`, and the names `EXIF.clean_keys()` renames them to
+_exif_column_map = types.MappingProxyType({
+    'about': 'about',
+    'About': 'about',
+    'AbsoluteAltitude': 'absolute_altitude',
+    'ActiveArea': 'active_area',
+    'AddAspectRatioInfo': 'add_aspect_ratio_info',
+    'AddIPTCInformation': 'add_iptc_information',
+    'AEBAutoCancel': 'aeb_auto_cancel',
+    'AEBBracketValue': 'aeb_bracket_value',
+    'AEBSequence': 'aeb_sequence',
+    'AEBShotCount': 'aeb_shot_count',
+    'AFAccelDecelTracking': 'af_accel_decel_tracking',
+    'AFAreaHeights': 'af_area_heights',
+    'AFAreaMode': 'af_area_mode',
+    'AFAreaModeSetting': 'af_area_mode_setting',
+    'AFAreaSelectionMethod': 'af_area_selection_method',
+    'AFAreaWidths': 'af_area_widths',
+    'AFAreaXPositions': 'af_area_x_positions',
+    'AFAreaYPositions': 'af_area_y_positions',
+    'AFAssistBeam': 'af_assist_beam',
+    'AFConfigTool': 'af_config_tool',
+    'AFImageHeight': 'af_image_height',
+    'AFImageWidth': 'af_image_width',
+    'AFMicroAdjMode': 'af_micro_adj_mode',
+    'AFMicroAdjValue': 'af_micro_adj_value',
+    'AFPointDisplayDuringFocus': 'af_point_display_during_focus',
+    'AFPointSelected': 'af_point_selected',
+    'AFPointsInFocus': 'af_points_in_focus',
+    'AFPointsSelected': 'af_points_selected',
+    'AFPointsUsed': 'af_points_used',
+    'AFPointSwitching': 'af_point_switching',
+    'AFTracking': 'af_tracking',
+    'AFTrackingSensitivity': 'af_tracking_sensitivity',
+    'AIServoFirstImage': 'ai_servo_first_image',
+    'AIServoSecondImage': 'ai_servo_second_image',
+    'AlreadyApplied': 'already_applied',
+    'AmbientTemperature': 'ambient_temperature',
+    'AnalogBalance': 'analog_balance',
+    'Anti-Blur': 'anti_blur',
+    'AntiAliasStrength': 'anti_alias_strength',
+    'Aperture': 'aperture',
+    'ApertureRange': 'aperture_range',
+    'ApertureValue': 'aperture_value',
+    'ApplicationRecordVersion': 'application_record_version',
+    'Artist': 'artist',
+    'AspectRatio': 'aspect_ratio',
+    'AsShotNeutral': 'as_shot_neutral',
+    'AutoExposureBracketing': 'auto_exposure_bracketing',
+    'AutoISO': 'auto_iso',
+    'AutoLateralCA': 'auto_lateral_ca',
+    'AutoLightingOptimizer': 'auto_lighting_optimizer',
+    'AutoPortraitFramed': 'auto_portrait_framed',
+    'AverageBlackLevel': 'average_black_level',
+    'BaseISO': 'base_iso',
+    'BaselineExposure': 'baseline_exposure',
+    'BaselineNoise': 'baseline_noise',
+    'BaselineSharpness': 'baseline_sharpness',
+    'BatteryLevel': 'battery_level',
+    'BatteryTemperature': 'battery_temperature',
+    'BatteryType': 'battery_type',
+    'BayerGreenSplit': 'bayer_green_split',
+    'BestQualityScale': 'best_quality_scale',
+    'BitDepth': 'bit_depth',
+    'BitsPerSample': 'bits_per_sample',
+    'BlackLevel': 'black_level',
+    'BlackLevelRepeatDim': 'black_level_repeat_dim',
+    'BlackMaskBottomBorder': 'black_mask_bottom_border',
+    'BlackMaskLeftBorder': 'black_mask_left_border',
+    'BlackMaskRightBorder': 'black_mask_right_border',
+    'BlackMaskTopBorder': 'black_mask_top_border',
+    'Blacks2012': 'blacks_2012',
+    'BlueBalance': 'blue_balance',
+    'BlueHue': 'blue_hue',
+    'BlueMatrixColumn': 'blue_matrix_column',
+    'BlueSaturation': 'blue_saturation',
+    'BlueTRC': 'blue_trc',
+    'BracketMode': 'bracket_mode',
+    'BracketShotNumber': 'bracket_shot_number',
+    'BracketValue': 'bracket_value',
+    'Brightness': 'brightness',
+    'BrightnessValue': 'brightness_value',
+    'BulbDuration': 'bulb_duration',
+    'By': 'by',
+    'By-line': 'by_line',
+    'CalibrationIlluminant1': 'calibration_illuminant_1',
+    'CalibrationIlluminant2': 'calibration_illuminant_2',
+    'CameraE': 'camera_e',
+    'CameraE-mountVersion': 'camera_e_mount_version',
+    'CameraISO': 'camera_iso',
+    'CameraOrientation': 'camera_orientation',
+    'CameraProfile': 'camera_profile',
+    'CameraProfileDigest': 'camera_profile_digest',
+    'CameraSerialNumber': 'camera_serial_number',
+    'CameraTemperature': 'camera_temperature',
+    'CameraType': 'camera_type',
+    'CamReverse': 'cam_reverse',
+    'CanonExposureMode': 'canon_exposure_mode',
+    'CanonFirmwareVersion': 'canon_firmware_version',
+    'CanonFlashMode': 'canon_flash_mode',
+    'CanonImageHeight': 'canon_image_height',
+    'CanonImageSize': 'canon_image_size',
+    'CanonImageType': 'canon_image_type',
+    'CanonImageWidth': 'canon_image_width',
+    'CanonModelID': 'canon_model_id',
+    'Caption': 'caption',
+    'Caption-Abstract': 'caption_abstract',
+    'CFALayout': 'cfa_layout',
+    'CFAPattern': 'cfa_pattern',
+    'CFAPattern2': 'cfa_pattern_2',
+    'CFAPlaneColor': 'cfa_plane_color',
+    'CFARepeatPatternDim': 'cfa_repeat_pattern_dim',
+    'ChromaticAberrationCorrection': 'chromatic_aberration_correction',
+    'ChromaticAberrationCorrParams': 'chromatic_aberration_corr_params',
+    'ChromaticAberrationSetting': 'chromatic_aberration_setting',
+    'CircGradBasedCorrActive': 'circ_grad_based_corr_active',
+    'CircGradBasedCorrAmount': 'circ_grad_based_corr_amount',
+    'CircGradBasedCorrClarity2012': 'circ_grad_based_corr_clarity_2012',
+    'CircGradBasedCorrContrast2012': 'circ_grad_based_corr_contrast_2012',
+    'CircGradBasedCorrCorrectionRangeMaskColorAmount': 'circ_grad_based_corr_correction_range_mask_color_amount',
+    'CircGradBasedCorrCorrectionRangeMaskLumFeather': 'circ_grad_based_corr_correction_range_mask_lum_feather',
+    'CircGradBasedCorrCorrectionRangeMaskLumMax': 'circ_grad_based_corr_correction_range_mask_lum_max',
+    'CircGradBasedCorrCorrectionRangeMaskLumMin': 'circ_grad_based_corr_correction_range_mask_lum_min',
+    'CircGradBasedCorrCorrectionRangeMaskType': 'circ_grad_based_corr_correction_range_mask_type',
+    'CircGradBasedCorrDefringe': 'circ_grad_based_corr_defringe',
+    'CircGradBasedCorrExposure2012': 'circ_grad_based_corr_exposure_2012',
+    'CircGradBasedCorrHighlights2012': 'circ_grad_based_corr_highlights_2012',
+    'CircGradBasedCorrHue': 'circ_grad_based_corr_hue',
+    'CircGradBasedCorrLuminanceNoise': 'circ_grad_based_corr_luminance_noise',
+    'CircGradBasedCorrMaskAngle': 'circ_grad_based_corr_mask_angle',
+    'CircGradBasedCorrMaskBottom': 'circ_grad_based_corr_mask_bottom',
+    'CircGradBasedCorrMaskFeather': 'circ_grad_based_corr_mask_feather',
+    'CircGradBasedCorrMaskFlipped': 'circ_grad_based_corr_mask_flipped',
+    'CircGradBasedCorrMaskLeft': 'circ_grad_based_corr_mask_left',
+    'CircGradBasedCorrMaskMidpoint': 'circ_grad_based_corr_mask_midpoint',
+    'CircGradBasedCorrMaskRight': 'circ_grad_based_corr_mask_right',
+    'CircGradBasedCorrMaskRoundness': 'circ_grad_based_corr_mask_roundness',
+    'CircGradBasedCorrMaskTop': 'circ_grad_based_corr_mask_top',
+    'CircGradBasedCorrMaskValue': 'circ_grad_based_corr_mask_value',
+    'CircGradBasedCorrMaskVersion': 'circ_grad_based_corr_mask_version',
+    'CircGradBasedCorrMaskWhat': 'circ_grad_based_corr_mask_what',
+    'CircGradBasedCorrMoire': 'circ_grad_based_corr_moire',
+    'CircGradBasedCorrSaturation': 'circ_grad_based_corr_saturation',
+    'CircGradBasedCorrShadows2012': 'circ_grad_based_corr_shadows_2012',
+    'CircGradBasedCorrSharpness': 'circ_grad_based_corr_sharpness',
+    'CircGradBasedCorrTemperature': 'circ_grad_based_corr_temperature',
+    'CircGradBasedCorrTint': 'circ_grad_based_corr_tint',
+    'CircGradBasedCorrWhat': 'circ_grad_based_corr_what',
+    'CircleOfConfusion': 'circle_of_confusion',
+    'Clarity2012': 'clarity_2012',
+    'CMMFlags': 'cmm_flags',
+    'CodedCharacterSet': 'coded_character_set',
+    'ColorCompensationFilter': 'color_compensation_filter',
+    'ColorDataVersion': 'color_data_version',
+    'ColorMatrix': 'color_matrix',
+    'ColorMatrix1': 'color_matrix_1',
+    'ColorMatrix2': 'color_matrix_2',
+    'ColorMode': 'color_mode',
+    'ColorNoiseReduction': 'color_noise_reduction',
+    'ColorNoiseReductionDetail': 'color_noise_reduction_detail',
+    'ColorNoiseReductionSmoothness': 'color_noise_reduction_smoothness',
+    'ColorSpace': 'color_space',
+    'ColorSpaceData': 'color_space_data',
+    'ColorTempAsShot': 'color_temp_as_shot',
+    'ColorTempAuto': 'color_temp_auto',
+    'ColorTempCloudy': 'color_temp_cloudy',
+    'ColorTempDaylight': 'color_temp_daylight',
+    'ColorTemperature': 'color_temperature',
+    'ColorTempFlash': 'color_temp_flash',
+    'ColorTempFluorescent': 'color_temp_fluorescent',
+    'ColorTempKelvin': 'color_temp_kelvin',
+    'ColorTempMeasured': 'color_temp_measured',
+    'ColorTempShade': 'color_temp_shade',
+    'ColorTempTungsten': 'color_temp_tungsten',
+    'ColorTone': 'color_tone',
+    'ComponentsConfiguration': 'components_configuration',
+    'CompressedBitsPerPixel': 'compressed_bits_per_pixel',
+    'Compression': 'compression',
+    'ConnectionSpaceIlluminant': 'connection_space_illuminant',
+    'ContinuousDrive': 'continuous_drive',
+    'Contrast': 'contrast',
+    'Contrast2012': 'contrast_2012',
+    'ControlMode': 'control_mode',
+    'ConvertToGrayscale': 'convert_to_grayscale',
+    'Copyright': 'copyright',
+    'CR2CFAPattern': 'cr2_cfa_pattern',
+    'CreateDate': 'create_date',
+    'CreativeStyle': 'creative_style',
+    'Creator': 'creator',
+    'CreatorTool': 'creator_tool',
+    'CropAngle': 'crop_angle',
+    'CropBottom': 'crop_bottom',
+    'CropBottomMargin': 'crop_bottom_margin',
+    'CropConstrainToWarp': 'crop_constrain_to_warp',
+    'CropLeft': 'crop_left',
+    'CropLeftMargin': 'crop_left_margin',
+    'CroppedImageHeight': 'cropped_image_height',
+    'CroppedImageLeft': 'cropped_image_left',
+    'CroppedImageTop': 'cropped_image_top',
+    'CroppedImageWidth': 'cropped_image_width',
+    'CropRight': 'crop_right',
+    'CropRightMargin': 'crop_right_margin',
+    'CropTop': 'crop_top',
+    'CropTopMargin': 'crop_top_margin',
+    'CurrentIPTCDigest': 'current_iptc_digest',
+    'CustomControls': 'custom_controls',
+    'CustomPictureStyleFileName': 'custom_picture_style_file_name',
+    'CustomRendered': 'custom_rendered',
+    'DateCreated': 'date_created',
+    'DateTimeCreated': 'date_time_created',
+    'DateTimeOriginal': 'date_time_original',
+    'DaylightSavings': 'daylight_savings',
+    'DefaultCropOrigin': 'default_crop_origin',
+    'DefaultCropSize': 'default_crop_size',
+    'DefaultEraseOption': 'default_erase_option',
+    'DefaultScale': 'default_scale',
+    'DefaultUserCrop': 'default_user_crop',
+    'DefringeGreenAmount': 'defringe_green_amount',
+    'DefringeGreenHueHi': 'defringe_green_hue_hi',
+    'DefringeGreenHueLo': 'defringe_green_hue_lo',
+    'DefringePurpleAmount': 'defringe_purple_amount',
+    'DefringePurpleHueHi': 'defringe_purple_hue_hi',
+    'DefringePurpleHueLo': 'defringe_purple_hue_lo',
+    'Dehaze': 'dehaze',
+    'DerivedFromDocumentID': 'derived_from_document_id',
+    'DerivedFromInstanceID': 'derived_from_instance_id',
+    'DerivedFromOriginalDocumentID': 'derived_from_original_document_id',
+    'Description': 'description',
+    'DeviceAttributes': 'device_attributes',
+    'DeviceManufacturer': 'device_manufacturer',
+    'DeviceMfgDesc': 'device_mfg_desc',
+    'DeviceModel': 'device_model',
+    'DeviceModelDesc': 'device_model_desc',
+    'DialDirectionTvAv': 'dial_direction_tv_av',
+    'DigitalGain': 'digital_gain',
+    'DigitalZoom': 'digital_zoom',
+    'DigitalZoomRatio': 'digital_zoom_ratio',
+    'Directory': 'directory',
+    'DisplayedUnitsX': 'displayed_units_x',
+    'DisplayedUnitsY': 'displayed_units_y',
+    'DistortionCorrection': 'distortion_correction',
+    'DistortionCorrectionSetting': 'distortion_correction_setting',
+    'DistortionCorrParams': 'distortion_corr_params',
+    'DistortionCorrParamsNumber': 'distortion_corr_params_number',
+    'DistortionCorrParamsPresent': 'distortion_corr_params_present',
+    'DNGBackwardVersion': 'dng_backward_version',
+    'DNGPrivateData': 'dng_private_data',
+    'DNGVersion': 'dng_version',
+    'DocumentID': 'document_id',
+    'DriveMode': 'drive_mode',
+    'DustRemovalData': 'dust_removal_data',
+    'DynamicRangeOptimizer': 'dynamic_range_optimizer',
+    'EasyMode': 'easy_mode',
+    'ElectronicFrontCurtainShutter': 'electronic_front_curtain_shutter',
+    'ExifByteOrder': 'exif_byte_order',
+    'ExifImageHeight': 'exif_image_height',
+    'ExifImageWidth': 'exif_image_width',
+    'ExifToolVersion': 'exiftool_version',
+    'ExifVersion': 'exif_version',
+    'Exposure2012': 'exposure_2012',
+    'ExposureCompensation': 'exposure_compensation',
+    'ExposureLevelIncrements': 'exposure_level_increments',
+    'ExposureMode': 'exposure_mode',
+    'ExposureProgram': 'exposure_program',
+    'ExposureStandardAdjustment': 'exposure_standard_adjustment',
+    'ExposureTime': 'exposure_time',
+    'FaceInfoLength': 'face_info_length',
+    'FaceInfoOffset': 'face_info_offset',
+    'FacesDetected': 'faces_detected',
+    'FileAccessDate': 'file_access_date',
+    'FileFormat': 'file_format',
+    'FileInodeChangeDate': 'file_inode_change_date',
+    'FileModifyDate': 'file_modify_date',
+    'FileName': 'filename',
+    'FilePermissions': 'file_permissions',
+    'FileSize': 'file_size',
+    'FileSource': 'file_source',
+    'FileType': 'file_type',
+    'FileTypeExtension': 'file_type_extension',
+    'Flash': 'flash',
+    'FlashAction': 'flash_action',
+    'FlashActivity': 'flash_activity',
+    'FlashBits': 'flash_bits',
+    'FlashExposureComp': 'flash_exposure_comp',
+    'FlashExposureLock': 'flash_exposure_lock',
+    'FlashGuideNumber': 'flash_guide_number',
+    'FlashLevel': 'flash_level',
+    'FlashMode': 'flash_mode',
+    'FlashpixVersion': 'flashpix_version',
+    'FlashStatus': 'flash_status',
+    'FlexibleSpotPosition': 'flexible_spot_position',
+    'FlightPitchDegree': 'flight_pitch_degree',
+    'FlightRollDegree': 'flight_roll_degree',
+    'FlightYawDegree': 'flight_yaw_degree',
+    'FNumber': 'f_number',
+    'FocalLength': 'focal_length',
+    'FocalLength35efl': 'focal_length_35_efl',
+    'FocalLengthIn35mmFormat': 'focal_length_in_35mm_format',
+    'FocalPlaneAFPointsUsed': 'focal_plane_af_points_used',
+    'FocalPlaneResolutionUnit': 'focal_plane_resolution_unit',
+    'FocalPlaneXResolution': 'focal_plane_x_resolution',
+    'FocalPlaneYResolution': 'focal_plane_y_resolution',
+    'FocalUnits': 'focal_units',
+    'FocusDistance2': 'focus_distance2',
+    'FocusLocation': 'focus_location',
+    'FocusMode': 'focus_mode',
+    'FocusPosition2': 'focus_position2',
+    'FocusRange': 'focus_range',
+    'Format': 'format',
+    'FOV': 'field_of_view',
+    'FullImageSize': 'full_image_size',
+    'GainControl': 'gain_control',
+    'GimbalPitchDegree': 'gimbal_pitch_degree',
+    'GimbalReverse': 'gimbal_reverse',
+    'GimbalRollDegree': 'gimbal_roll_degree',
+    'GimbalYawDegree': 'gimbal_yaw_degree',
+    'GlobalAltitude': 'global_altitude',
+    'GlobalAngle': 'global_angle',
+    'GPSAltitude': 'gps_altitude',
+    'GPSAltitudeRef': 'gps_altitude_ref',
+    'GPSLatitude': 'gps_latitude',
+    'GPSLatitudeRef': 'gps_latitude_ref',
+    'GPSLongitude': 'gps_longitude',
+    'GPSLongitudeRef': 'gps_longitude_ref',
+    'GPSMapDatum': 'gps_map_datum',
+    'GPSPosition': 'gps_position',
+    'GPSSatellites': 'gps_satellites',
+    'GPSStatus': 'gps_status',
+    'GPSVersionID': 'gps_version_id',
+    'GradientBasedCorrActive': 'gradient_based_corr_active',
+    'GradientBasedCorrAmount': 'gradient_based_corr_amount',
+    'GradientBasedCorrClarity2012': 'gradient_based_corr_clarity_2012',
+    'GradientBasedCorrContrast': 'gradient_based_corr_contrast',
+    'GradientBasedCorrCorrectionRangeMaskColorAmount': 'gradient_based_corr_correction_range_mask_color_amount',
+    'GradientBasedCorrCorrectionRangeMaskLumFeather': 'gradient_based_corr_correction_range_mask_lum_feather',
+    'GradientBasedCorrCorrectionRangeMaskLumMax': 'gradient_based_corr_correction_range_mask_lum_max',
+    'GradientBasedCorrCorrectionRangeMaskLumMin': 'gradient_based_corr_correction_range_mask_lum_min',
+    'GradientBasedCorrCorrectionRangeMaskType': 'gradient_based_corr_correction_range_mask_type',
+    'GradientBasedCorrDefringe': 'gradient_based_corr_defringe',
+    'GradientBasedCorrExposure2012': 'gradient_based_corr_exposure_2012',
+    'GradientBasedCorrHighlights2012': 'gradient_based_corr_highlights_2012',
+    'GradientBasedCorrHue': 'gradient_based_corr_hue',
+    'GradientBasedCorrLuminanceNoise': 'gradient_based_corr_luminance_noise',
+    'GradientBasedCorrMaskFullX': 'gradient_based_corr_mask_full_x',
+    'GradientBasedCorrMaskFullY': 'gradient_based_corr_mask_full_y',
+    'GradientBasedCorrMaskValue': 'gradient_based_corr_mask_value',
+    'GradientBasedCorrMaskWhat': 'gradient_based_corr_mask_what',
+    'GradientBasedCorrMaskZeroX': 'gradient_based_corr_mask_zero_x',
+    'GradientBasedCorrMaskZeroY': 'gradient_based_corr_mask_zero_y',
+    'GradientBasedCorrMoire': 'gradient_based_corr_moire',
+    'GradientBasedCorrSaturation': 'gradient_based_corr_saturation',
+    'GradientBasedCorrShadows2012': 'gradient_based_corr_shadows_2012',
+    'GradientBasedCorrSharpness': 'gradient_based_corr_sharpness',
+    'GradientBasedCorrTemperature': 'gradient_based_corr_temperature',
+    'GradientBasedCorrTint': 'gradient_based_corr_tint',
+    'GradientBasedCorrWhat': 'gradient_based_corr_what',
+    'GrainAmount': 'grain_amount',
+    'GreenHue': 'green_hue',
+    'GreenMatrixColumn': 'green_matrix_column',
+    'GreenSaturation': 'green_saturation',
+    'GreenTRC': 'green_trc',
+    'HasCrop': 'has_crop',
+    'HasRealMergedData': 'has_real_merged_data',
+    'HasSettings': 'has_settings',
+    'HDR': 'hdr',
+    'HDREffect': 'hdr_effect',
+    'HDRSetting': 'hdr_setting',
+    'Height': 'height',
+    'HighISONoiseReduction': 'high_iso_noise_reduction',
+    'HighISONoiseReduction2': 'high_iso_noise_reduction_2',
+    'Highlights2012': 'highlights_2012',
+    'HighlightTonePriority': 'highlight_tone_priority',
+    'HistoryAction': 'history_action',
+    'HistoryChanged': 'history_changed',
+    'HistoryInstanceID': 'history_instance_id',
+    'HistoryParameters': 'history_parameters',
+    'HistorySoftwareAgent': 'history_software_agent',
+    'HistoryWhen': 'history_when',
+    'HueAdjustmentAqua': 'hue_adjustment_aqua',
+    'HueAdjustmentBlue': 'hue_adjustment_blue',
+    'HueAdjustmentGreen': 'hue_adjustment_green',
+    'HueAdjustmentMagenta': 'hue_adjustment_magenta',
+    'HueAdjustmentOrange': 'hue_adjustment_orange',
+    'HueAdjustmentPurple': 'hue_adjustment_purple',
+    'HueAdjustmentRed': 'hue_adjustment_red',
+    'HueAdjustmentYellow': 'hue_adjustment_yellow',
+    'HyperfocalDistance': 'hyperfocal_distance',
+    'ImageDescription': 'image_description',
+    'ImageHeight': 'image_height',
+    'ImageSize': 'image_size',
+    'ImageStabilization': 'image_stabilization',
+    'ImageWidth': 'image_width',
+    'IncrementalTemperature': 'incremental_temperature',
+    'IncrementalTint': 'incremental_tint',
+    'InstanceID': 'instance_id',
+    'IntelligentAuto': 'intelligent_auto',
+    'InternalSerialNumber': 'internal_serial_number',
+    'InteropIndex': 'interop_index',
+    'InteropVersion': 'interop_version',
+    'IPTCDigest': 'iptc_digest',
+    'ISO': 'iso',
+    'Iso': 'iso',
+    'ISOAutoMax': 'iso_auto_max',
+    'ISOAutoMin': 'iso_auto_min',
+    'ISOSetting': 'iso_setting',
+    'ISOSpeedIncrements': 'iso_speed_increments',
+    'Label': 'label',
+    'LateralChromaticAberration': 'lateral_chromatic_aberration',
+    'LayerCount': 'layer_count',
+    'Lens': 'lens',
+    'Lens35efl': 'lens35efl',
+    'LensDriveWhenAFImpossible': 'lens_drive_when_af_impossible',
+    'LensE': 'lens_e',
+    'LensE-mountVersion': 'lens_e_mount_version',
+    'LensFirmwareVersion': 'lens_firmware_version',
+    'LensFormat': 'lens_format',
+    'LensID': 'lens_id',
+    'LensInfo': 'lens_info',
+    'LensManualDistortionAmount': 'lens_manual_distortion_amount',
+    'LensModel': 'lens_model',
+    'LensMount': 'lens_mount',
+    'LensMount2': 'lens_mount2',
+    'LensProfileChromaticAberrationScale': 'lens_profile_chromatic_aberration_scale',
+    'LensProfileDigest': 'lens_profile_digest',
+    'LensProfileDistortionScale': 'lens_profile_distortion_scale',
+    'LensProfileEnable': 'lens_profile_enable',
+    'LensProfileFilename': 'lens_profile_filename',
+    'LensProfileName': 'lens_profile_name',
+    'LensProfileSetup': 'lens_profile_setup',
+    'LensProfileVignettingScale': 'lens_profile_vignetting_scale',
+    'LensSerialNumber': 'lens_serial_number',
+    'LensSpec': 'lens_spec',
+    'LensSpecFeatures': 'lens_spec_features',
+    'LensType': 'lens_type',
+    'LensType2': 'lens_type2',
+    'LensType3': 'lens_type3',
+    'LensZoomPosition': 'lens_zoom_position',
+    'LightSource': 'light_source',
+    'LightValue': 'light_value',
+    'LinearityUpperMargin': 'linearity_upper_margin',
+    'LinearResponseLimit': 'linear_response_limit',
+    'LiveViewShooting': 'live_view_shooting',
+    'LongExposureNoiseReduction': 'long_exposure_noise_reduction',
+    'LuminanceAdjustmentAqua': 'luminance_adjustment_aqua',
+    'LuminanceAdjustmentBlue': 'luminance_adjustment_blue',
+    'LuminanceAdjustmentGreen': 'luminance_adjustment_green',
+    'LuminanceAdjustmentMagenta': 'luminance_adjustment_magenta',
+    'LuminanceAdjustmentOrange': 'luminance_adjustment_orange',
+    'LuminanceAdjustmentPurple': 'luminance_adjustment_purple',
+    'LuminanceAdjustmentRed': 'luminance_adjustment_red',
+    'LuminanceAdjustmentYellow': 'luminance_adjustment_yellow',
+    'LuminanceSmoothing': 'luminance_smoothing',
+    'LVShootingAreaDisplay': 'lv_shooting_area_display',
+    'MacroMode': 'macro_mode',
+    'Make': 'make',
+    'MakeAndModel': 'make_and_model',
+    'ManualAFPointSelPattern': 'manual_af_point_sel_pattern',
+    'ManualFlashOutput': 'manual_flash_output',
+    'MaxAperture': 'max_aperture',
+    'MaxApertureValue': 'max_aperture_value',
+    'MaxFocalLength': 'max_focal_length',
+    'MeasuredEV': 'measured_ev',
+    'MeasuredEV2': 'measured_ev2',
+    'MeasuredRGGB': 'measured_rggb',
+    'MediaWhitePoint': 'media_white_point',
+    'Megapixels': 'megapixels',
+    'MetadataDate': 'metadata_date',
+    'MetaVersion': 'meta_version',
+    'MeteringMode': 'metering_mode',
+    'MeteringMode2': 'metering_mode_2',
+    'MIMEType': 'mime_type',
+    'MinAperture': 'min_aperture',
+    'MinFocalLength': 'min_focal_length',
+    'Model': 'model',
+    'ModelReleaseYear': 'model_release_year',
+    'ModifyDate': 'modify_date',
+    'MultiExposure': 'multi_exposure',
+    'MultiExposureControl': 'multi_exposure_control',
+    'MultiExposureShots': 'multi_exposure_shots',
+    'MultiFrameNoiseReduction': 'multi_frame_noise_reduction',
+    'MultiFrameNREffect': 'multi_frame_n_r_effect',
+    'NDFilter': 'nd_filter',
+    'NoiseProfile': 'noise_profile',
+    'NormalWhiteLevel': 'normal_white_level',
+    'NumAFPoints': 'num_af_points',
+    'NumChannels': 'num_channels',
+    'NumSlices': 'num_slices',
+    'ObjectName': 'object_name',
+    'OffsetTime': 'offset_time',
+    'OffsetTimeDigitized': 'offset_time_digitized',
+    'OffsetTimeOriginal': 'offset_time_original',
+    'OneShotAFRelease': 'one_shot_af_release',
+    'OpcodeList3': 'opcode_list_3',
+    'OpticalZoomCode': 'optical_zoom_code',
+    'Orientation': 'orientation',
+    'OrientationLinkedAF': 'orientation_linked_af',
+    'OriginalBestQualitySize': 'original_best_quality_size',
+    'OriginalDefaultCropSize': 'original_default_crop_size',
+    'OriginalDefaultFinalSize': 'original_default_final_size',
+    'OriginalDocumentID': 'original_document_id',
+    'OwnerName': 'owner_name',
+    'PaintCorrectionActive': 'paint_correction_active',
+    'PaintCorrectionAmount': 'paint_correction_amount',
+    'PaintCorrectionBrightness': 'paint_correction_brightness',
+    'PaintCorrectionClarity': 'paint_correction_clarity',
+    'PaintCorrectionClarity2012': 'paint_correction_clarity2012',
+    'PaintCorrectionContrast': 'paint_correction_contrast',
+    'PaintCorrectionContrast2012': 'paint_correction_contrast2012',
+    'PaintCorrectionCorrectionRangeMaskColorAmount': 'paint_correction_correction_range_mask_color_amount',
+    'PaintCorrectionCorrectionRangeMaskLumFeather': 'paint_correction_correction_range_mask_lum_feather',
+    'PaintCorrectionCorrectionRangeMaskLumMax': 'paint_correction_correction_range_mask_lum_max',
+    'PaintCorrectionCorrectionRangeMaskLumMin': 'paint_correction_correction_range_mask_lum_min',
+    'PaintCorrectionCorrectionRangeMaskType': 'paint_correction_correction_range_mask_type',
+    'PaintCorrectionDefringe': 'paint_correction_defringe',
+    'PaintCorrectionExposure': 'paint_correction_exposure',
+    'PaintCorrectionExposure2012': 'paint_correction_exposure2012',
+    'PaintCorrectionHighlights2012': 'paint_correction_highlights2012',
+    'PaintCorrectionHue': 'paint_correction_hue',
+    'PaintCorrectionLocalBlacks2012': 'paint_correction_local_blacks2012',
+    'PaintCorrectionLocalDehaze': 'paint_correction_local_dehaze',
+    'PaintCorrectionLocalWhites2012': 'paint_correction_local_whites2012',
+    'PaintCorrectionLuminanceNoise': 'paint_correction_luminance_noise',
+    'PaintCorrectionMaskCenterWeight': 'paint_correction_mask_center_weight',
+    'PaintCorrectionMaskDabs': 'paint_correction_mask_dabs',
+    'PaintCorrectionMaskFlow': 'paint_correction_mask_flow',
+    'PaintCorrectionMaskRadius': 'paint_correction_mask_radius',
+    'PaintCorrectionMaskValue': 'paint_correction_mask_value',
+    'PaintCorrectionMaskWhat': 'paint_correction_mask_what',
+    'PaintCorrectionMoire': 'paint_correction_moire',
+    'PaintCorrectionSaturation': 'paint_correction_saturation',
+    'PaintCorrectionShadows2012': 'paint_correction_shadows2012',
+    'PaintCorrectionSharpness': 'paint_correction_sharpness',
+    'PaintCorrectionTemperature': 'paint_correction_temperature',
+    'PaintCorrectionTint': 'paint_correction_tint',
+    'PaintCorrectionWhat': 'paint_correction_what',
+    'ParametricDarks': 'parametric_darks',
+    'ParametricHighlights': 'parametric_highlights',
+    'ParametricHighlightSplit': 'parametric_highlight_split',
+    'ParametricLights': 'parametric_lights',
+    'ParametricMidtoneSplit': 'parametric_midtone_split',
+    'ParametricShadows': 'parametric_shadows',
+    'ParametricShadowSplit': 'parametric_shadow_split',
+    'PerChannelBlackLevel': 'per_channel_black_level',
+    'PeripheralIlluminationCorr': 'peripheral_illumination_corr',
+    'PeripheralLightingSetting': 'peripheral_lighting_setting',
+    'PerspectiveAspect': 'perspective_aspect',
+    'PerspectiveHorizontal': 'perspective_horizontal',
+    'PerspectiveRotate': 'perspective_rotate',
+    'PerspectiveScale': 'perspective_scale',
+    'PerspectiveUpright': 'perspective_upright',
+    'PerspectiveVertical': 'perspective_vertical',
+    'PerspectiveX': 'perspective_x',
+    'PerspectiveY': 'perspective_y',
+    'PhotometricInterpretation': 'photometric_interpretation',
+    'PhotoshopThumbnail': 'photoshop_thumbnail',
+    'PictureEffect': 'picture_effect',
+    'PictureEffect2': 'picture_effect_2',
+    'PictureProfile': 'picture_profile',
+    'PictureStyle': 'picture_style',
+    'PictureStylePC': 'picture_style_pc',
+    'PictureStyleUserDef': 'picture_style_user_def',
+    'PixelAspectRatio': 'pixel_aspect_ratio',
+    'PlanarConfiguration': 'planar_configuration',
+    'PostCropVignetteAmount': 'post_crop_vignette_amount',
+    'PreviewImage': 'preview_image',
+    'PreviewImageLength': 'preview_image_length',
+    'PreviewImageSize': 'preview_image_size',
+    'PreviewImageStart': 'preview_image_start',
+    'PrimaryPlatform': 'primary_platform',
+    'PrintIMVersion': 'print_i_m_version',
+    'PrintPosition': 'print_position',
+    'PrintScale': 'print_scale',
+    'PrintStyle': 'print_style',
+    'PrioritySetInAWB': 'priority_set_in_awb',
+    'ProcessVersion': 'process_version',
+    'ProfileClass': 'profile_class',
+    'ProfileCMMType': 'profile_cmm_type',
+    'ProfileConnectionSpace': 'profile_connection_space',
+    'ProfileCopyright': 'profile_copyright',
+    'ProfileCreator': 'profile_creator',
+    'ProfileDateTime': 'profile_date_time',
+    'ProfileDescription': 'profile_description',
+    'ProfileEmbedPolicy': 'profile_embed_policy',
+    'ProfileFileSignature': 'profile_file_signature',
+    'ProfileHueSatMapData1': 'profile_hue_sat_map_data_1',
+    'ProfileHueSatMapData2': 'profile_hue_sat_map_data_2',
+    'ProfileHueSatMapDims': 'profile_hue_sat_map_dims',
+    'ProfileID': 'profile_id',
+    'ProfileName': 'profile_name',
+    'ProfileVersion': 'profile_version',
+    'Quality': 'quality',
+    'Quality2': 'quality_2',
+    'Rating': 'rating',
+    'RawFileName': 'raw_file_name',
+    'RAWFileType': 'raw_file_type',
+    'RawImageSegmentation': 'raw_image_segmentation',
+    'RawJpgSize': 'raw_jpg_size',
+    'ReaderName': 'reader_name',
+    'RecommendedExposureIndex': 'recommended_exposure_index',
+    'RecordMode': 'record_mode',
+    'RedBalance': 'red_balance',
+    'RedHue': 'red_hue',
+    'RedMatrixColumn': 'red_matrix_column',
+    'RedSaturation': 'red_saturation',
+    'RedTRC': 'red_trc',
+    'ReferenceBlackWhite': 'reference_black_white',
+    'RelativeAltitude': 'relative_altitude',
+    'ReleaseMode': 'release_mode',
+    'ReleaseMode2': 'release_mode_2',
+    'ReleaseMode3': 'release_mode_3',
+    'RenderingIntent': 'rendering_intent',
+    'ResolutionUnit': 'resolution_unit',
+    'RetractLensOnPowerOff': 'retract_lens_on_power_off',
+    'RowsPerStrip': 'rows_per_strip',
+    'SafetyShift': 'safety_shift',
+    'SameExposureForNewAperture': 'same_exposure_for_new_aperture',
+    'SamplesPerPixel': 'samples_per_pixel',
+    'Saturation': 'saturation',
+    'SaturationAdjustmentAqua': 'saturation_adjustment_aqua',
+    'SaturationAdjustmentBlue': 'saturation_adjustment_blue',
+    'SaturationAdjustmentGreen': 'saturation_adjustment_green',
+    'SaturationAdjustmentMagenta': 'saturation_adjustment_magenta',
+    'SaturationAdjustmentOrange': 'saturation_adjustment_orange',
+    'SaturationAdjustmentPurple': 'saturation_adjustment_purple',
+    'SaturationAdjustmentRed': 'saturation_adjustment_red',
+    'SaturationAdjustmentYellow': 'saturation_adjustment_yellow',
+    'ScaleFactor35efl': 'scale_factor_35_efl',
+    'SceneCaptureType': 'scene_capture_type',
+    'SceneMode': 'scene_mode',
+    'SceneType': 'scene_type',
+    'SelectAFAreaSelectionMode': 'select_af_area_selection_mode',
+    'SelfData': 'self_data',
+    'SelfTimer': 'self_timer',
+    'SensitivityType': 'sensitivity_type',
+    'SensorBlueLevel': 'sensor_blue_level',
+    'SensorBottomBorder': 'sensor_bottom_border',
+    'SensorHeight': 'sensor_height',
+    'SensorLeftBorder': 'sensor_left_border',
+    'SensorRedLevel': 'sensor_red_level',
+    'SensorRightBorder': 'sensor_right_border',
+    'SensorTopBorder': 'sensor_top_border',
+    'SensorWidth': 'sensor_width',
+    'SequenceFileNumber': 'sequence_file_number',
+    'SequenceImageNumber': 'sequence_image_number',
+    'SequenceLength': 'sequence_length',
+    'SequenceNumber': 'sequence_number',
+    'SerialNumber': 'serial_number',
+    'Shadows2012': 'shadows_2012',
+    'ShadowScale': 'shadow_scale',
+    'ShadowTint': 'shadow_tint',
+    'SharpenDetail': 'sharpen_detail',
+    'SharpenEdgeMasking': 'sharpen_edge_masking',
+    'SharpenRadius': 'sharpen_radius',
+    'Sharpness': 'sharpness',
+    'SharpnessFrequency': 'sharpness_frequency',
+    'ShootingMode': 'shooting_mode',
+    'ShotNumberSincePowerUp': 'shot_number_since_power_up',
+    'Shutter': 'shutter',
+    'ShutterCount': 'shutter_count',
+    'ShutterCount2': 'shutter_count2',
+    'ShutterCount3': 'shutter_count3',
+    'ShutterSpeed': 'shutter_speed',
+    'ShutterSpeedRange': 'shutter_speed_range',
+    'ShutterSpeedValue': 'shutter_speed_value',
+    'SlicesGroupName': 'slices_group_name',
+    'SlowShutter': 'slow_shutter',
+    'SoftSkinEffect': 'soft_skin_effect',
+    'Software': 'software',
+    'SonyDateTime': 'sony_date_time',
+    'SonyExposureTime': 'sony_exposure_time',
+    'SonyExposureTime2': 'sony_exposure_time_2',
+    'SonyFNumber': 'sony_f_number',
+    'SonyImageHeight': 'sony_image_height',
+    'SonyImageHeightMax': 'sony_image_height_max',
+    'SonyImageWidth': 'sony_image_width',
+    'SonyImageWidthMax': 'sony_image_width_max',
+    'SonyISO': 'sony_iso',
+    'SonyMaxApertureValue': 'sony_max_aperture_value',
+    'SonyModelID': 'sony_model_id',
+    'SonyRawFileType': 'sony_raw_file_type',
+    'SonyTimeMinSec': 'sony_time_min_sec',
+    'SonyToneCurve': 'sony_tone_curve',
+    'SpecularWhiteLevel': 'specular_white_level',
+    'SplitToningBalance': 'split_toning_balance',
+    'SplitToningHighlightHue': 'split_toning_highlight_hue',
+    'SplitToningHighlightSaturation': 'split_toning_highlight_saturation',
+    'SplitToningShadowHue': 'split_toning_shadow_hue',
+    'SplitToningShadowSaturation': 'split_toning_shadow_saturation',
+    'SR2SubIFDKey': 'sr2_sub_ifd_key',
+    'SR2SubIFDLength': 'sr2_sub_ifd_length',
+    'SR2SubIFDOffset': 'sr2_sub_ifd_offset',
+    'SRAWQuality': 's_raw_quality',
+    'SRawType': 's_raw_type',
+    'StopsAboveBaseISO': 'stops_above_base_iso',
+    'StripByteCounts': 'strip_byte_counts',
+    'StripOffsets': 'strip_offsets',
+    'SubfileType': 'subfile_type',
+    'SubSecCreateDate': 'sub_sec_create_date',
+    'SubSecDateTimeOriginal': 'sub_sec_date_time_original',
+    'SubSecModifyDate': 'sub_sec_modify_date',
+    'SubSecTime': 'sub_sec_time',
+    'SubSecTimeDigitized': 'sub_sec_time_digitized',
+    'SubSecTimeOriginal': 'sub_sec_time_original',
+    'TargetAperture': 'target_aperture',
+    'TargetExposureTime': 'target_exposure_time',
+    'ThumbnailImage': 'thumbnail_image',
+    'ThumbnailImageValidArea': 'thumbnail_image_valid_area',
+    'ThumbnailLength': 'thumbnail_length',
+    'ThumbnailOffset': 'thumbnail_offset',
+    'TiffMeteringImage': 'tiff_metering_image',
+    'TiffMeteringImageHeight': 'tiff_metering_image_height',
+    'TiffMeteringImageWidth': 'tiff_metering_image_width',
+    'TimeCreated': 'time_created',
+    'TimeZone': 'time_zone',
+    'TimeZoneCity': 'time_zone_city',
+    'Tint': 'tint',
+    'Title': 'title',
+    'ToneCurve': 'tone_curve',
+    'ToneCurveBlue': 'tone_curve_blue',
+    'ToneCurveGreen': 'tone_curve_green',
+    'ToneCurveName': 'tone_curve_name',
+    'ToneCurveName2012': 'tone_curve_name_2012',
+    'ToneCurvePV2012': 'tone_curve_pv_2012',
+    'ToneCurvePV2012Blue': 'tone_curve_pv_2012_blue',
+    'ToneCurvePV2012Green': 'tone_curve_pv_2012_green',
+    'ToneCurvePV2012Red': 'tone_curve_pv_2012_red',
+    'ToneCurveRed': 'tone_curve_red',
+    'toolkit': 'toolkit',
+    'Transformation': 'transformation',
+    'UniqueCameraModel': 'unique_camera_model',
+    'UprightCenterMode': 'upright_center_mode',
+    'UprightCenterNormX': 'upright_center_norm_x',
+    'UprightCenterNormY': 'upright_center_norm_y',
+    'UprightFocalLength35mm': 'upright_focal_length_35mm',
+    'UprightFocalMode': 'upright_focal_mode',
+    'UprightFourSegmentsCount': 'upright_four_segments_count',
+    'UprightPreview': 'upright_preview',
+    'UprightTransformCount': 'upright_transform_count',
+    'UprightVersion': 'upright_version',
+    'URL_List': 'url_list',
+    'UserComment': 'user_comment',
+    'USMLensElectronicMF': 'usm_lens_electronic_mf',
+    'ValidAFPoints': 'valid_af_points',
+    'VariableLowPassFilter': 'variable_low_pass_filter',
+    'Version': 'version',
+    'VFDisplayIllumination': 'vf_display_illumination',
+    'Vibrance': 'vibrance',
+    'ViewfinderWarnings': 'viewfinder_warnings',
+    'VignetteAmount': 'vignette_amount',
+    'VignettingCorrection': 'vignetting_correction',
+    'VignettingCorrParams': 'vignetting_corr_params',
+    'VignettingCorrVersion': 'vignetting_corr_version',
+    'VirtualFocalLength': 'virtual_focal_length',
+    'VirtualImageXCenter': 'virtual_image_x_center',
+    'VirtualImageYCenter': 'virtual_image_y_center',
+    'VRDOffset': 'vrd_offset',
+    'WB_RGBLevels': 'wb_rgb_levels',
+    'WB_RGBLevels2500K': 'wb_rgb_levels_2500k',
+    'WB_RGBLevels3200K': 'wb_rgb_levels_3200k',
+    'WB_RGBLevels4500K': 'wb_rgb_levels_4500k',
+    'WB_RGBLevels6000K': 'wb_rgb_levels_6000k',
+    'WB_RGBLevels8500K': 'wb_rgb_levels_8500k',
+    'WB_RGBLevelsCloudy': 'wb_rgb_levels_cloudy',
+    'WB_RGBLevelsDaylight': 'wb_rgb_levels_daylight',
+    'WB_RGBLevelsFlash': 'wb_rgb_levels_flash',
+    'WB_RGBLevelsFluorescent': 'wb_rgb_levels_fluorescent',
+    'WB_RGBLevelsFluorescentM1': 'wb_rgb_levels_fluorescent_m1',
+    'WB_RGBLevelsFluorescentP1': 'wb_rgb_levels_fluorescent_p1',
+    'WB_RGBLevelsFluorescentP2': 'wb_rgb_levels_fluorescent_p2',
+    'WB_RGBLevelsShade': 'wb_rgb_levels_shade',
+    'WB_RGBLevelsTungsten': 'wb_rgb_levels_tungsten',
+    'WB_RGGBLevels': 'wb_rggb_levels',
+    'WB_RGGBLevelsAsShot': 'wb_rggb_levels_as_shot',
+    'WB_RGGBLevelsAuto': 'wb_rggb_levels_auto',
+    'WB_RGGBLevelsCloudy': 'wb_rggb_levels_cloudy',
+    'WB_RGGBLevelsDaylight': 'wb_rggb_levels_daylight',
+    'WB_RGGBLevelsFlash': 'wb_rggb_levels_flash',
+    'WB_RGGBLevelsFluorescent': 'wb_rggb_levels_fluorescent',
+    'WB_RGGBLevelsKelvin': 'wb_rggb_levels_kelvin',
+    'WB_RGGBLevelsMeasured': 'wb_rggb_levels_measured',
+    'WB_RGGBLevelsShade': 'wb_rggb_levels_shade',
+    'WB_RGGBLevelsTungsten': 'wb_rggb_levels_tungsten',
+    'WBBracketMode': 'wb_bracket_mode',
+    'WBBracketValueAB': 'wb_bracket_value_ab',
+    'WBBracketValueGM': 'wb_bracket_value_gm',
+    'WBShiftAB': 'wb_shift_ab',
+    'WBShiftAB_GM': 'wb_shift_ab_gm',
+    'WBShiftAB_GM_Precise': 'wb_shift_ab_gm_precise',
+    'WBShiftGM': 'wb_shift_gm',
+    'WhiteBalance': 'white_balance',
+    'WhiteBalanceBlue': 'white_balance_blue',
+    'WhiteBalanceFineTune': 'white_balance_fine_tune',
+    'WhiteBalanceRed': 'white_balance_red',
+    'WhiteLevel': 'white_level',
+    'Whites2012': 'whites_2012',
+    'Width': 'width',
+    'WriterName': 'writer_name',
+    'XMPToolkit': 'xmp_toolkit',
+    'XResolution': 'x_resolution',
+    'YCbCrCoefficients': 'y_cb_cr_coefficients',
+    'YCbCrPositioning': 'y_cb_cr_positioning',
+    'YCbCrSubSampling': 'y_cb_cr_sub_sampling',
+    'YResolution': 'y_resolution',
+    'ZoneMatching': 'zone_matching',
+    'ZoomSourceWidth': 'zoom_source_width',
+    'ZoomTargetWidth': 'zoom_target_width',
+    'MajorBrand': 'major_brand',
+    'MinorVersion': 'minor_version',
+    'CompatibleBrands': 'compatible_brands',
+    'MovieDataSize': 'movie_data_size',
+    'MovieDataOffset': 'movie_data_offset',
+    'MovieHeaderVersion': 'movie_header_version',
+    'TimeScale': 'time_scale',
+    'Duration': 'duration',
+    'PreferredRate': 'preferred_rate',
+    'PreferredVolume': 'preferred_volume',
+    'MatrixStructure': 'matrix_structure',
+    'PreviewTime': 'preview_time',
+    'PreviewDuration': 'preview_duration',
+    'PosterTime': 'poster_time',
+    'SelectionTime': 'selection_time',
+    'SelectionDuration': 'selection_duration',
+    'CurrentTime': 'current_time',
+    'NextTrackID': 'next_track_id',
+    'HandlerType': 'handler_type',
+    'HandlerVendorID': 'handler_vendor_id',
+    'Encoder': 'encoder',
+    'TrackHeaderVersion': 'track_header_version',
+    'TrackCreateDate': 'track_create_date',
+    'TrackModifyDate': 'track_modify_date',
+    'TrackID': 'track_id',
+    'TrackDuration': 'track_duration',
+    'TrackLayer': 'track_layer',
+    'TrackVolume': 'track_volume',
+    'MediaHeaderVersion': 'media_header_version',
+    'MediaCreateDate': 'media_create_date',
+    'MediaModifyDate': 'media_modify_date',
+    'MediaTimeScale': 'media_time_scale',
+    'MediaDuration': 'media_duration',
+    'MediaLanguageCode': 'media_language_code',
+    'HandlerDescription': 'handler_description',
+    'GraphicsMode': 'graphics_mode',
+    'OpColor': 'op_color',
+    'CompressorID': 'compressor_id',
+    'SourceImageWidth': 'source_image_width',
+    'SourceImageHeight': 'source_image_height',
+    'VideoFrameRate': 'video_frame_rate',
+    'AvgBitrate': 'avg_bitrate',
+    'Rotation': 'rotation',
+})
+_exif_column_names = frozenset(_exif_column_map.values())
+_exif_unmapped_keys = set()  # Names not in `_exif_column_map` already warned about
+
+
+@functools.lru_cache(maxsize=4096)
+def _exif_snake_case(key):
+    """
+    Convert an EXIF element name not in `_exif_column_map` from ExifKeyName to exif_key_name.
+
+    :param key: EXIF element name
+    :type key: str
+    :rtype: str
+    """
+    new_key = ''.join('_' + char if i > 0 and char == char.upper() and not char.isdigit()
+                      else char for i, char in enumerate(key))
+
+    # Corrections
+    return new_key.lower().replace('i_d', 'id')
+
+
+def find_binary(bin_name,
+                bin_paths=['/usr/bin', '/usr/local/bin'],
+                abort=False,
+                return_first=False,
+                search_path=True):
     """
     Find system binary by name. If multiple binaries found, return a list of binaries unless
     `return_first` is True, in which case just return the first binary found.
 
+    Directories in `bin_paths` are searched first. If the binary is in none of them, the first
+    match on `$PATH` is returned, unless `search_path` is False.
+
+    Binaries found are cached by name, so repeated lookups touch no files. A cached result is
+    discarded when `$PATH` changes, or when running the binary fails because it no longer
+    exists. Lookups of binaries not found list directories again, but directory listings are
+    cached as well and only read again when a directory's modification time changes. Setting
+    the environment variable `PYDONI_BIN_CACHE` to a file path keeps directory listings on disk
+    for cold starts.
+
     Ex: find_binary('exiftool') will yield '/usr/local/exiftool' if exiftool installed, and
         it will return None if it's not installed
 
@@ -1739,10 +3259,11 @@ def find_binary(bin_name, bin_paths=['/usr/bin', '/usr/local/bin'], abort=False,
     :type abort: bool
     :param return_first: if multiple matches found, return first found binary as string
     :type return_first: str
+    :param search_path: fall back to searching directories on `$PATH`
+    :type search_path: bool
     :return: absolute path of found binary, else None
     :rtype: str or list if multiple matches found and `return_first` is False
     """
-
     import os
 
     logger = pydoni.logger_setup(pydoni.what_is_my_name(), pydoni.modloglev)
@@ -1751,18 +3272,17 @@ def find_binary(bin_name, bin_paths=['/usr/bin', '/usr/local/bin'], abort=False,
     assert isinstance(bin_name, str)
     assert isinstance(bin_paths, list)
 
-    owd = os.getcwd()
-    logger.var('owd', owd)
+    key = (bin_name, tuple(bin_paths), search_path)
+    path_env = os.environ.get('PATH', os.defpath)
+    cached = _bin_results.get(key)
 
-    match = []
-    for path in bin_paths:
-        os.chdir(path)
-        binaries = pydoni.listfiles()
-        for binary in binaries:
-            if bin_name == binary:
-                match_item = os.path.join(path, binary)
-                match.append(match_item)
-                logger.info("Matching binary found %s" % match_item)
+    if cached is not None and cached[0] == path_env:
+        pydoni.metrics.incr('cache_hits_total', cache='find_binary')
+        match = list(cached[1])
+    else:
+        match = _find_binary(bin_name, bin_paths, search_path, path_env, logger)
+        if match:
+            _bin_results[key] = (path_env, tuple(match))
 
     if len(match) > 1:
         if return_first:
@@ -1779,10 +3299,150 @@ def find_binary(bin_name, bin_paths=['/usr/bin', '/usr/local/bin'], abort=False,
             logger.warn("No binaries found! Returning None.")
         return None
 
-    os.chdir(owd)
     return match[0]
 
 
+def _find_binary(bin_name, bin_paths, search_path, path_env, logger):
+    """
+    Search directories for a binary for `find_binary()`, bypassing its cache of results.
+
+    :return: list of paths to matching binaries
+    :rtype: list
+    """
+    import os
+
+    if _bin_cache_file is None and os.environ.get('PYDONI_BIN_CACHE'):
+        _load_bin_cache(os.environ['PYDONI_BIN_CACHE'])
+
+    hit = True
+    match = []
+    for path in bin_paths:
+        names, cached = _list_bin_dir(path)
+        hit = hit and cached
+        if bin_name in names and os.path.isfile(os.path.join(path, bin_name)):
+            match.append(os.path.join(path, bin_name))
+            logger.debug("Matching binary found %s" % match[-1])
+
+    if not match and search_path:
+        for path in path_env.split(os.pathsep):
+            if not path or path in bin_paths:
+                continue
+
+            names, cached = _list_bin_dir(path)
+            hit = hit and cached
+            if bin_name in names and os.path.isfile(os.path.join(path, bin_name)):
+                match.append(os.path.join(path, bin_name))
+                logger.debug("Matching binary found on $PATH %s" % match[-1])
+                break
+
+    if hit:
+        pydoni.metrics.incr('cache_hits_total', cache='find_binary')
+    elif _bin_cache_file:
+        _save_bin_cache()
+
+    return match
+
+
+def _forget_binary(fpath):
+    """
+    Discard results of `find_binary()` that include a binary which turned out not to exist.
+
+    :param fpath: path to binary
+    :type fpath: str
+    """
+    for key, (path_env, match) in list(_bin_results.items()):
+        if fpath in match:
+            _bin_results.pop(key, None)
+
+
+# Results of `find_binary()` by arguments: (value of $PATH, tuple of paths to binaries found)
+_bin_results = {}
+
+# Listings of directories searched by `find_binary()`, by directory: (mtime_ns, set of names)
+_bin_dirs = {}
+_bin_cache_file = None
+
+
+def _list_bin_dir(path):
+    """
+    Get the names of files in a directory searched by `find_binary()`, listing it again only
+    if its modification time has changed.
+
+    :param path: path to directory
+    :type path: str
+    :return: tuple of set of names, and whether the cached listing was still valid
+    :rtype: tuple
+    """
+    import os
+
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return frozenset(), True
+
+    cached = _bin_dirs.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1], True
+
+    try:
+        names = frozenset(os.listdir(path))
+    except OSError:
+        names = frozenset()
+
+    _bin_dirs[path] = (mtime, names)
+    return names, False
+
+
+def _load_bin_cache(fpath):
+    """
+    Load directory listings cached on disk by a previous process. Listings are validated
+    against each directory's modification time when used, so a stale file is harmless.
+
+    :param fpath: path to JSON cache file
+    :type fpath: str
+    """
+    import json
+
+    global _bin_cache_file
+    _bin_cache_file = fpath
+    try:
+        with open(fpath, 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    for path, (mtime, names) in data.items():
+        _bin_dirs.setdefault(path, (mtime, frozenset(names)))
+
+
+def _save_bin_cache():
+    """
+    Write directory listings to the on-disk cache file, through a temporary file so that
+    concurrent processes never read a partial file.
+    """
+    import json
+    import os
+
+    fpath = _bin_cache_file
+    tmpfile = '{}.{}.tmp'.format(fpath, os.getpid())
+    try:
+        with open(tmpfile, 'w') as f:
+            json.dump({path: [mtime, sorted(names)] for path, (mtime, names)
+                       in list(_bin_dirs.items())}, f)
+        os.replace(tmpfile, fpath)
+    except OSError:
+        pydoni.logger_setup(pydoni.what_is_my_name(), pydoni.modloglev).warning(
+            'Could not write binary cache file: ' + fpath)
+
+
+def clear_binary_cache():
+    """
+    Discard binaries and directory listings cached by `find_binary()`.
+    """
+    _bin_results.clear()
+    _bin_dirs.clear()
+
+
 def adobe_dng_converter(fpath, overwrite=False):
     """
     Run Adobe DNG Converter on a file.
@@ -1797,31 +3457,30 @@ def adobe_dng_converter(fpath, overwrite=False):
 
     logger = pydoni.logger_setup(pydoni.what_is_my_name(), pydoni.modloglev)
 
-    # Check if destination file already exists
-    # Build output file with .dng extension and check if it exists
     fpath = pydoni.ensurelist(fpath)
-    destfile = os.path.join(os.path.splitext(fpath)[0], '.dng')
-    exists = True if os.path.isfile(destfile) else False
 
     logger.logvars(locals())
 
-    # Build system command
     app = os.path.join('/', 'Applications', 'Adobe DNG Converter.app',
         'Contents', 'MacOS', 'Adobe DNG Converter')
-    cmd = '"{}" "{}"'.format(app, fpath)
-
     logger.var('app', app)
-    logger.var('cmd', cmd)
 
-    # Execute command if output file does not exist, or if `overwrite` is True
-    if exists:
-        if overwrite:
-            pydoni.syscmd(cmd)
-        else:
+    cmds = []
+    for f in fpath:
+        # Check if destination file already exists
+        # Build output file with .dng extension and check if it exists
+        destfile = os.path.splitext(f)[0] + '.dng'
+        exists = True if os.path.isfile(destfile) else False
+
+        # Execute command if output file does not exist, or if `overwrite` is True
+        if exists and not overwrite:
             # File exists but `overwrite` not specified as True
-            pass
-    else:
-        pydoni.syscmd(cmd)
+            continue
+
+        cmds.append([app, f])
+
+    logger.var('cmds', cmds)
+    pydoni.syscmd_many(cmds)
 
 
 def stat(fname):
@@ -1877,8 +3536,8 @@ def stat(fname):
 
     # Get output of `stat` command and clean for python list
     bin_path = pydoni.sh.find_binary('stat')
-    cmd = '{bin_name} -x "{fname}"'.format(**locals())
-    res = pydoni.syscmd(cmd, encoding='utf-8')
+    cmd = [bin_path, '-x', fname]
+    res = run(cmd, encoding='utf-8').stdout
     res = [x.strip() for x in res.split('\n')]
 
     logger.var('cmd', cmd)
@@ -1949,9 +3608,9 @@ def mid3v2(fpath, attr_name, attr_value):
     bin = pydoni.sh.find_binary('mid3v2')
     logger.var('bin', bin)
 
-    cmd = '{} --{}="{}" "{}"'.format(bin, attr_name, attr_value, fpath)
+    cmd = [bin, '--{}={}'.format(attr_name, attr_value), fpath]
     logger.var('cmd', cmd)
-    pydoni.syscmd(cmd)
+    run(cmd)
 
 
 def convert_audible(fpath, fmt, activation_bytes):
@@ -1989,10 +3648,9 @@ def convert_audible(fpath, fmt, activation_bytes):
 
     # Convert to mp4 (regardless of `fmt` parameter)
     bin = pydoni.sh.find_binary('ffmpeg')
-    cmd = '{} -activation_bytes {} -i "{}" -vn -c:a copy "{}"'.format(
-        bin, activation_bytes, fpath, outfile)
+    cmd = [bin, '-activation_bytes', activation_bytes, '-i', fpath, '-vn', '-c:a', 'copy', outfile]
     logger.var('cmd', cmd)
-    pydoni.syscmd(cmd)
+    run(cmd)
 
     # Convert to mp3 if specified
     if fmt == 'mp3':
@@ -2022,9 +3680,10 @@ def mp4_to_mp3(fpath, bitrate):
     assert re.match(r'\d+k', bitrate)
 
     # Execute command
-    cmd = 'f="{}";ffmpeg -i "$f" -acodec libmp3lame -ab {} "${{f%.mp4}}.mp3";'.format(fpath, bitrate)
+    cmd = [pydoni.sh.find_binary('ffmpeg'), '-i', fpath, '-acodec', 'libmp3lame', '-ab', bitrate,
+           os.path.splitext(fpath)[0] + '.mp3']
     logger.var('cmd', cmd)
-    pydoni.syscmd(cmd)
+    run(cmd)
 
 
 def split_video_scenes(vfpath, outdname):
@@ -2047,11 +3706,11 @@ def split_video_scenes(vfpath, outdname):
     assert os.path.isdir(outdname)
 
     bin_path = pydoni.sh.find_binary('scenedetect')
-    cmd = '{bin_name} --input "{vpath}" --output "{outdname}" detect-content split-video'.format(**locals())
+    cmd = [bin_path, '--input', vfpath, '--output', outdname, 'detect-content', 'split-video']
     logger.var('cmd', cmd)
 
     try:
-        pydoni.syscmd(cmd)
+        run(cmd, check=True)
         return True
     except Exception as e:
         logger.exception('Failed to split video scenes')
@@ -2072,13 +3731,9 @@ def osascript(applescript):
     logger = pydoni.logger_setup(pydoni.what_is_my_name(), pydoni.modloglev)
 
     bin_name = pydoni.sh.find_binary('osascript')
-    applescript = applescript.replace("'", "\'")
-
-    cmd = "{bin_name} -e '{applescript}'".format(**locals())
-    out = pydoni.syscmd(cmd)
 
-    if isinstance(out, bytes):
-        out = out.decode('utf-8')
+    cmd = [bin_name, '-e', applescript]
+    out = run(cmd, encoding='utf-8', merge_stderr=True).stdout
 
     logger.logvars(locals())
 
@@ -0,0 +1,279 @@
+import pydoni
+
+
+class ResultSink(object):
+    """
+    Destination that scripts stream per-item results into as they go, instead of collecting
+    them in a `result` dictionary that is only registered at the end of the run. Results are
+    buffered in batches of `batch_size` items, so memory use is bounded regardless of the
+    number of items processed, except for the keys held by `completed()`.
+
+    A sink supports item assignment, so it can be used in place of a `result` dictionary:
+
+        result = pydoni.sink.JSONLSink('rename.jsonl', resume=True)
+        for file in files:
+            if file in result.completed():
+                continue
+            ...
+            result[file] = newfile
+
+    Subclasses implement `_write_batch()`, and `_read_completed()` to support resuming.
+
+    :param batch_size: number of results buffered before they are written
+    :type batch_size: int
+    :param resume: keep results already recorded by a previous run, and report their keys in
+                   `completed()` so that they may be skipped
+    :type resume: bool
+    """
+
+    def __init__(self, batch_size=100, resume=False):
+
+        self.logger = pydoni.logger_setup(
+            name=pydoni.what_is_my_name(classname=self.__class__.__name__, with_modname=True),
+            level=pydoni.modloglev)
+
+        assert isinstance(batch_size, int) and batch_size > 0
+
+        self.batch_size = batch_size
+        self.resume = resume
+        self.count = 0
+        self.closed = False
+        self._buffer = []
+        self._completed = None
+
+    def __setitem__(self, key, value):
+        self.write(key, value)
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+        return False
+
+    def write(self, key, value):
+        """
+        Record the result of a single item.
+
+        :param key: identifier of item, i.e. filename or movie name
+        :type key: str
+        :param value: result of item, must be JSON-serializable (other objects are stringified)
+        :type value: any
+        """
+        if self.closed:
+            raise Exception('Cannot write to a closed {}'.format(self.__class__.__name__))
+
+        self._buffer.append((str(key), value))
+        self.count += 1
+
+        if self._completed is not None:
+            self._completed.add(str(key))
+
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Write all buffered results.
+        """
+        if self._buffer:
+            self._write_batch(self._buffer)
+            self.logger.sample('Wrote %s results', len(self._buffer))
+            self._buffer = []
+
+    def close(self):
+        """
+        Write all buffered results and release the underlying resource.
+        """
+        if not self.closed:
+            self.flush()
+            self.closed = True
+
+    def completed(self):
+        """
+        Get the keys of items already recorded, including those recorded by a previous run if
+        `resume` is True.
+
+        Unlike the results themselves, the keys are all held in memory once this is first
+        called, and kept up to date as results are written, so memory use grows with the
+        number of items recorded by this and any previous run.
+
+        :rtype: set
+        """
+        if self._completed is None:
+            self._completed = set(self._read_completed()) if self.resume else set()
+            self._completed.update(key for key, value in self._buffer)
+
+        return self._completed
+
+    def summary(self):
+        """
+        Summarize the sink, registered as `pydoni.pydonicli_result_summary` by
+        `pydoni.pydonicli_register()` when the sink is registered as `result`.
+
+        :rtype: dict
+        """
+        return {'sink': self.__class__.__name__, 'items': self.count}
+
+    def _write_batch(self, batch):
+        """
+        Write a batch of (key, value) tuples to the destination.
+        """
+        raise NotImplementedError
+
+    def _read_completed(self):
+        """
+        Read the keys of items already recorded at the destination.
+        """
+        raise NotImplementedError
+
+
+class JSONLSink(ResultSink):
+    """
+    Stream results to a JSON Lines file, one `{"key": ..., "value": ...}` object per line.
+
+    :param fpath: path to output file
+    :type fpath: str
+    :param batch_size: number of results buffered before they are written
+    :type batch_size: int
+    :param resume: append to an existing file rather than overwriting it
+    :type resume: bool
+    """
+
+    def __init__(self, fpath, batch_size=100, resume=False):
+
+        super(JSONLSink, self).__init__(batch_size=batch_size, resume=resume)
+        self.logger.logvars(locals())
+
+        self.fpath = fpath
+        self._file = open(fpath, 'a' if resume else 'w')
+
+    def _write_batch(self, batch):
+        import json
+
+        self._file.write(''.join(
+            json.dumps({'key': key, 'value': value}, default=str) + '\n' for key, value in batch))
+        self._file.flush()
+
+    def _read_completed(self):
+        import json
+
+        with open(self.fpath, 'r') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)['key']
+                except ValueError:
+                    # Line cut short by a crashed run
+                    self.logger.warning('Skipping unreadable line in %s', self.fpath)
+
+    def close(self):
+        if not self.closed:
+            super(JSONLSink, self).close()
+            self._file.close()
+
+    def summary(self):
+        summary = super(JSONLSink, self).summary()
+        summary['fpath'] = self.fpath
+        return summary
+
+
+class PostgresSink(ResultSink):
+    """
+    Stream results to a Postgres table with columns `name`, `key`, `value` (JSON text) and
+    `recorded_ts`, creating the table if it does not exist. Each batch is written with a
+    single multi-row INSERT statement.
+
+    :param schema: name of schema
+    :type schema: str
+    :param table: name of table
+    :type table: str
+    :param name: name of the run or program recording results, used to distinguish results of
+                 different programs sharing the same table, and to resume
+    :type name: str
+    :param pg: [optional] connection to use, a new `pydoni.db.Postgres()` if not specified
+    :type pg: pydoni.db.Postgres
+    :param batch_size: number of results buffered before they are written
+    :type batch_size: int
+    :param resume: keep results already recorded for `name` rather than deleting them
+    :type resume: bool
+    """
+
+    def __init__(self, schema, table, name, pg=None, batch_size=500, resume=False):
+
+        super(PostgresSink, self).__init__(batch_size=batch_size, resume=resume)
+        self.logger.logvars(locals())
+
+        self.schema = schema
+        self.table = table
+        self.name = name
+        self.pg = pydoni.db.Postgres() if pg is None else pg
+
+        sql = ['create table if not exists {}.{} ('.format(schema, table),
+               '    name text not null,',
+               '    key text not null,',
+               '    value text,',
+               '    recorded_ts timestamp not null default now())']
+        stmts = ['\n'.join(sql)]
+
+        if not resume:
+            stmts.append('delete from {}.{} where name = {};'.format(
+                schema, table, self.pg.__single_quote__(name)))
+
+        self.pg.execute(stmts)
+
+    def _write_batch(self, batch):
+        import json
+
+        q = self.pg.__single_quote__
+        name = q(self.name)
+        rows = ['({}, {}, {})'.format(name, q(key), q(json.dumps(value, default=str)))
+                for key, value in batch]
+
+        self.pg.execute('insert into {}.{} (name, key, value) values {};'.format(
+            self.schema, self.table, ', '.join(rows)))
+
+    def _read_completed(self):
+        keys = self.pg.read_sql('select key from {}.{} where name = {}'.format(
+            self.schema, self.table, self.pg.__single_quote__(self.name)), simplify=False)
+
+        return keys['key'].tolist()
+
+    def summary(self):
+        summary = super(PostgresSink, self).summary()
+        summary['table'] = '{}.{}'.format(self.schema, self.table)
+        summary['name'] = self.name
+        return summary
+
+
+def resume_mode(sink, resume=None):
+    """
+    Get whether a script skips the items already recorded in its sink. A sink opened without
+    `resume` discards the results of a previous run as it is opened, so a script can only
+    resume from a sink opened with `resume=True`, and the two must agree.
+
+    :param sink: [optional] sink the script streams its results into
+    :type sink: ResultSink
+    :param resume: [optional] script's `resume` parameter, None to follow the sink's mode
+    :type resume: bool
+    :rtype: bool
+    """
+    logger = pydoni.logger_setup(pydoni.what_is_my_name(), pydoni.modloglev)
+
+    sink_resume = sink is not None and sink.resume
+    if resume is None:
+        return sink_resume
+
+    if bool(resume) != sink_resume:
+        if sink is None:
+            msg = 'Cannot resume without a sink'
+        else:
+            msg = '`resume={}` disagrees with {} opened with `resume={}`'.format(
+                resume, sink.__class__.__name__, sink.resume)
+
+        logger.error(msg)
+        raise Exception(msg)
+
+    return bool(resume)
@@ -0,0 +1,359 @@
+"""
+Record nested timing spans around expensive operations (subprocesses, database round trips,
+EXIF extraction, HTTP requests) and export them as Chrome `trace_event` JSON or as a flat CSV.
+
+Tracing is off by default, in which case `span()` returns a shared no-op context manager and
+`traced()` functions only check a single module flag before calling through. Turn it on with
+`pydoni.trace.enable()`, or for a whole run by setting the environment variable `PYDONI_TRACE`
+to an output path prefix, in which case `<prefix>.json` and `<prefix>.csv` are written at exit.
+
+Spans are also created while a hook is registered with `add_hook()` (i.e. by
+`pydoni.watchdog`), but they are only kept for export while tracing is on.
+
+Example:
+
+    import pydoni.trace
+    pydoni.trace.enable()
+    with pydoni.trace.span('rename', fpath=fpath):
+        ...
+    pydoni.trace.export_chrome('trace.json')
+"""
+
+import os
+import threading
+import time
+
+
+# Module variables ---------------------------------------------------------------------------------
+
+_enabled = False
+_hooks = []
+_active = False  # True if tracing is enabled or a hook is registered, checked on every span
+_spans = []
+_spans_lock = threading.Lock()
+_local = threading.local()
+_epoch = time.perf_counter()
+_output = None  # Path prefix spans are exported to at exit, if any
+
+
+# Module classes -----------------------------------------------------------------------------------
+
+class Span(object):
+    """
+    Single timed span. Use through `span()` rather than instantiating directly.
+
+    :param name: name of span, i.e. 'syscmd' or 'Postgres.execute'
+    :type name: str
+    :param attrs: arbitrary attributes recorded with the span
+    :type attrs: dict
+    """
+
+    __slots__ = ('name', 'attrs', 'start', 'end', 'depth', 'parent', 'pid', 'tid', 'thread_name')
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+        self.start = None
+        self.end = None
+        self.depth = 0
+        self.parent = None
+        self.pid = os.getpid()
+        self.tid = threading.get_ident()
+        self.thread_name = threading.current_thread().name
+
+    @property
+    def duration(self):
+        """
+        Duration of span in seconds, or None if the span has not finished.
+        """
+        if self.start is None or self.end is None:
+            return None
+
+        return self.end - self.start
+
+    def set(self, **attrs):
+        """
+        Add attributes to span after it has been opened, i.e. a row count only known at the end.
+        """
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        stack = _stack()
+        if stack:
+            self.parent = stack[-1].name
+            self.depth = len(stack)
+
+        stack.append(self)
+        self.start = time.perf_counter()
+
+        for hook in _hooks:
+            hook.span_start(self)
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.end = time.perf_counter()
+
+        if exc_type is not None:
+            self.attrs['error'] = exc_type.__name__
+
+        stack = _stack()
+        if stack and stack[-1] is self:
+            stack.pop()
+
+        for hook in _hooks:
+            hook.span_end(self)
+
+        if _enabled:
+            with _spans_lock:
+                _spans.append(self)
+
+        return False
+
+    def __repr__(self):
+        return '<Span {} {:.6f}s>'.format(self.name, self.duration or 0)
+
+
+class _NullSpan(object):
+    """
+    Span returned while tracing is off. Does nothing.
+    """
+
+    __slots__ = ()
+
+    def set(self, **attrs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        return False
+
+
+_null_span = _NullSpan()
+
+
+# Module functions ---------------------------------------------------------------------------------
+
+def _stack():
+    """
+    Get the stack of open spans for the current thread.
+    """
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+
+    return stack
+
+
+def enable(output=None):
+    """
+    Start recording spans.
+
+    :param output: [optional] path prefix to write '<output>.json' (Chrome trace) and
+                   '<output>.csv' to when the interpreter exits, replacing any path prefix
+                   set by a previous call
+    :type output: str
+    """
+    global _enabled, _output
+    _enabled = True
+    _update_active()
+
+    if output is not None:
+        if _output is None:
+            import atexit
+            atexit.register(_export_at_exit)
+
+        _output = output
+
+
+def disable():
+    """
+    Stop recording spans. Spans recorded so far are kept until `clear()` is called.
+    """
+    global _enabled
+    _enabled = False
+    _update_active()
+
+
+def add_hook(hook):
+    """
+    Register an object notified of every span, whether or not tracing is enabled. Its
+    `span_start(span)` method is called when a span is entered and `span_end(span)` when it
+    exits, both on the thread running the span.
+
+    :param hook: object with `span_start()` and `span_end()` methods
+    :type hook: object
+    """
+    if hook not in _hooks:
+        _hooks.append(hook)
+
+    _update_active()
+
+
+def remove_hook(hook):
+    """
+    Unregister an object registered with `add_hook()`.
+
+    :param hook: object to unregister
+    :type hook: object
+    """
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+    _update_active()
+
+
+def _update_active():
+    """
+    Recompute whether spans need to be created at all.
+    """
+    global _active
+    _active = _enabled or bool(_hooks)
+
+
+def is_enabled():
+    """
+    Check whether spans are being recorded.
+
+    :rtype: bool
+    """
+    return _enabled
+
+
+def clear():
+    """
+    Discard all recorded spans.
+    """
+    with _spans_lock:
+        del _spans[:]
+
+
+def spans():
+    """
+    Get a copy of all finished spans, ordered by start time.
+
+    :rtype: list
+    """
+    with _spans_lock:
+        return sorted(_spans, key=lambda s: s.start)
+
+
+def current_span():
+    """
+    Get the innermost open span of the current thread.
+
+    :return: open span, or None if there is none or tracing is off
+    :rtype: Span
+    """
+    stack = getattr(_local, 'stack', None)
+    return stack[-1] if stack else None
+
+
+def span(name, **attrs):
+    """
+    Context manager timing the enclosed block. Spans opened within the block on the same
+    thread are recorded as its children.
+
+    :param name: name of span
+    :type name: str
+    :param attrs: arbitrary attributes to record with the span
+    :return: context manager yielding the span (or a no-op object if tracing is off)
+    :rtype: Span
+    """
+    if not _active:
+        return _null_span
+
+    return Span(name, attrs)
+
+
+def traced(name=None):
+    """
+    Decorator wrapping each call of the decorated function in a span.
+
+    :param name: [optional] name of span, defaults to the function's qualified name
+    :type name: str
+    """
+    import functools
+
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _active:
+                return func(*args, **kwargs)
+
+            with Span(span_name, {}):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def export_chrome(fpath):
+    """
+    Write recorded spans as Chrome `trace_event` JSON, viewable in chrome://tracing or
+    https://ui.perfetto.dev.
+
+    :param fpath: path to output JSON file
+    :type fpath: str
+    """
+    import json
+
+    events = []
+    for s in spans():
+        events.append({
+            'name': s.name,
+            'cat': 'pydoni',
+            'ph': 'X',
+            'ts': round((s.start - _epoch) * 1e6, 3),
+            'dur': round(s.duration * 1e6, 3),
+            'pid': s.pid,
+            'tid': s.tid,
+            'args': s.attrs,
+        })
+
+    with open(fpath, 'w') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f, default=str)
+
+
+def export_csv(fpath):
+    """
+    Write recorded spans as a flat CSV with one row per span.
+
+    :param fpath: path to output CSV file
+    :type fpath: str
+    """
+    import csv
+    import json
+
+    with open(fpath, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['name', 'start', 'duration', 'depth', 'parent', 'pid', 'thread', 'attrs'])
+        for s in spans():
+            writer.writerow([
+                s.name,
+                '{:.6f}'.format(s.start - _epoch),
+                '{:.6f}'.format(s.duration),
+                s.depth,
+                s.parent or '',
+                s.pid,
+                s.thread_name,
+                json.dumps(s.attrs, default=str),
+            ])
+
+
+def _export_at_exit():
+    """
+    Export recorded spans to '<output>.json' and '<output>.csv', for the path prefix last
+    passed to `enable()`.
+    """
+    export_chrome(_output + '.json')
+    export_csv(_output + '.csv')
+
+
+if os.environ.get('PYDONI_TRACE'):
+    enable(output=os.environ['PYDONI_TRACE'])
@@ -1,5 +1,4 @@
 import pydoni
-import pydoni.os
 
 
 def echo(
@@ -0,0 +1,235 @@
+import os
+import pydoni
+import pydoni.trace
+
+
+class Watchdog(object):
+    """
+    Background thread watching operations instrumented with `pydoni.trace` spans (`syscmd`,
+    `Postgres.execute` statements, HTTP requests in `pydoni.web`, `exiftool` batches in
+    `EXIF.extract`, ...) and logging a warning for any that run past `threshold` seconds. The
+    warning includes the operation's attributes (command, SQL or URL), elapsed time and the
+    current Python stack of the blocked thread, and is repeated every further `threshold`
+    seconds the operation keeps running.
+
+    Durations of finished operations are kept in a histogram per operation, available from
+    `histograms()` and written to `pydoni.metrics` as `operation_seconds_bucket`,
+    `operation_seconds_sum` and `operation_seconds_count` counters labelled by `op`.
+
+    :param threshold: number of seconds after which an operation is reported as slow
+    :type threshold: float
+    :param interval: [optional] number of seconds between checks, defaults to a tenth of
+                     `threshold`, capped at 1 second
+    :type interval: float
+    :param ops: [optional] names of spans to watch, i.e. ['syscmd', 'sql'], defaults to all
+    :type ops: list
+    """
+
+    # Upper bounds of histogram buckets, in seconds
+    buckets = (0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 900, float('inf'))
+
+    def __init__(self, threshold=30.0, interval=None, ops=None):
+
+        import threading
+
+        self.logger = pydoni.logger_setup(
+            name=pydoni.what_is_my_name(classname=self.__class__.__name__, with_modname=True),
+            level=pydoni.modloglev)
+
+        self.logger.logvars(locals())
+
+        assert threshold > 0
+
+        self.threshold = threshold
+        self.interval = interval if interval is not None else min(1.0, threshold / 10)
+        self.ops = set(ops) if ops is not None else None
+
+        self._open = {}  # id(span) -> [span, elapsed time at which to report it next]
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """
+        Start watching spans.
+        """
+        import threading
+
+        if self._thread is not None:
+            return None
+
+        self._stop.clear()
+        pydoni.trace.add_hook(self)
+        self._thread = threading.Thread(target=self._run, name='pydoni-watchdog', daemon=True)
+        self._thread.start()
+        self.logger.info('Watchdog started with threshold %ss', self.threshold)
+
+    def stop(self):
+        """
+        Stop watching spans.
+        """
+        if self._thread is None:
+            return None
+
+        pydoni.trace.remove_hook(self)
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+        with self._lock:
+            self._open.clear()
+
+    def span_start(self, span):
+        """
+        Hook called by `pydoni.trace` when a span is entered.
+        """
+        if self.ops is None or span.name in self.ops:
+            with self._lock:
+                self._open[id(span)] = [span, self.threshold]
+
+    def span_end(self, span):
+        """
+        Hook called by `pydoni.trace` when a span exits.
+        """
+        with self._lock:
+            entry = self._open.pop(id(span), None)
+
+        if entry is None:
+            return None
+
+        duration = span.duration
+        le = next(b for b in self.buckets if duration <= b)
+
+        with self._lock:
+            hist = self._histograms.get(span.name)
+            if hist is None:
+                hist = self._histograms[span.name] = {
+                    'buckets': {b: 0 for b in self.buckets}, 'count': 0, 'sum': 0.0, 'max': 0.0}
+
+            hist['buckets'][le] += 1
+            hist['count'] += 1
+            hist['sum'] += duration
+            hist['max'] = max(hist['max'], duration)
+
+        # Prometheus histogram buckets are cumulative
+        for b in self.buckets:
+            if b >= le:
+                pydoni.metrics.incr('operation_seconds_bucket', op=span.name, le=_fmt_bound(b))
+
+        pydoni.metrics.incr('operation_seconds_sum', duration, op=span.name)
+        pydoni.metrics.incr('operation_seconds_count', op=span.name)
+
+    def histograms(self):
+        """
+        Get the histogram of durations of each operation, with the number of operations per
+        bucket keyed by bucket upper bound, and the count, sum and maximum of durations.
+
+        :rtype: dict
+        """
+        import copy
+
+        with self._lock:
+            return copy.deepcopy(self._histograms)
+
+    def check(self):
+        """
+        Report all watched operations running past the threshold. Called periodically by the
+        watchdog thread.
+        """
+        import sys
+        import time
+
+        now = time.perf_counter()
+        due = []
+
+        with self._lock:
+            for entry in self._open.values():
+                span, report_at = entry
+                elapsed = now - span.start
+                if elapsed >= report_at:
+                    due.append((span, elapsed))
+                    while entry[1] <= elapsed:
+                        entry[1] += self.threshold
+
+        if due:
+            frames = sys._current_frames()
+            for span, elapsed in due:
+                self._report(span, elapsed, frames.get(span.tid))
+
+    def _report(self, span, elapsed, frame):
+        """
+        Log a slow operation with its attributes and the stack of its thread.
+        """
+        import traceback
+
+        attrs = ', '.join('{}={}'.format(k, pydoni._BoundedRepr(v, 2, 10, 500))
+                          for k, v in span.attrs.items())
+        stack = ''.join(traceback.format_stack(frame)) if frame is not None \
+            else '  <thread no longer running>\n'
+
+        self.logger.warning('Slow operation %s running for %.1fs in thread %s (%s)\n%s',
+                            span.name, elapsed, span.thread_name, attrs, stack.rstrip('\n'))
+        pydoni.metrics.incr('slow_operations_total', op=span.name)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception:
+                self.logger.exception('Watchdog check failed')
+
+
+def _fmt_bound(bound):
+    """
+    Format a histogram bucket upper bound as a Prometheus `le` label value.
+    """
+    return '+Inf' if bound == float('inf') else str(bound)
+
+
+_watchdog = None
+
+
+def start(threshold=30.0, interval=None, ops=None):
+    """
+    Start the process-wide watchdog, replacing any watchdog already running. Also started by
+    setting the environment variable `PYDONI_WATCHDOG` to a threshold in seconds.
+
+    :param threshold: number of seconds after which an operation is reported as slow
+    :type threshold: float
+    :param interval: [optional] number of seconds between checks
+    :type interval: float
+    :param ops: [optional] names of spans to watch, defaults to all
+    :type ops: list
+    :rtype: Watchdog
+    """
+    global _watchdog
+
+    stop()
+    _watchdog = Watchdog(threshold=threshold, interval=interval, ops=ops)
+    _watchdog.start()
+    return _watchdog
+
+
+def stop():
+    """
+    Stop the process-wide watchdog, if running.
+    """
+    global _watchdog
+
+    if _watchdog is not None:
+        _watchdog.stop()
+        _watchdog = None
+
+
+def histograms():
+    """
+    Get duration histograms of the process-wide watchdog, see `Watchdog.histograms()`.
+
+    :rtype: dict
+    """
+    return _watchdog.histograms() if _watchdog is not None else {}
+
+
+if os.environ.get('PYDONI_WATCHDOG'):
+    start(threshold=float(os.environ['PYDONI_WATCHDOG']))
@@ -1,4 +1,5 @@
 import pydoni
+import pydoni.trace
 
 
 class Goodreads_Scrape(object):
@@ -152,17 +153,32 @@ class Goodreads_Scrape(object):
         return None
 
 
-def test_url(url, quiet=False):
+def _get(url, **kwargs):
     """
-    Test if a url is available using the requests library.
+    Make an HTTP GET request with `requests`, counted in `pydoni.metrics` and timed as a
+    `pydoni.trace` span.
+
+    :param url: URL to request
+    :type url: str
+    :return: response
+    :rtype: requests.Response
     """
     import requests
 
+    pydoni.metrics.incr('http_requests_total')
+    with pydoni.trace.span('http', url=url):
+        return requests.get(url, **kwargs)
+
+
+def test_url(url, quiet=False):
+    """
+    Test if a url is available using the requests library.
+    """
     logger = pydoni.logger_setup(pydoni.what_is_my_name(), pydoni.modloglev)
     logger.logvars(locals())
 
     try:
-        requests.get(url)
+        _get(url)
         return True
     except Exception as e:
         if not quiet:
@@ -206,13 +222,12 @@ def get_element_by_selector(url, selector, attr=None):
     :rtype: str or list ir `attr` is specified
     """
 
-    import requests
     from bs4 import BeautifulSoup
 
     logger = pydoni.logger_setup(pydoni.what_is_my_name(), pydoni.modloglev)
     logger.logvars(locals())
 
-    page = requests.get(url)
+    page = _get(url)
     soup = BeautifulSoup(page.content, 'html.parser')
 
 
@@ -236,12 +251,12 @@ def get_element_by_xpath(url, xpath):
     :return: element value
     :rtype: str or list ir `attr` is specified
     """
-    import requests, html
+    import html
 
     logger = pydoni.logger_setup(pydoni.what_is_my_name(), pydoni.modloglev)
     logger.logvars(locals())
 
-    page = requests.get(url)
+    page = _get(url)
     tree = html.fromstring(page.content)
     return tree.xpath(xpath)
 
@@ -259,7 +274,7 @@ def downloadfile(url, destfile=None, method='requests'):
     :param method: method to use in downloading file, one of ['requests', 'curl']
     :type method: str
     """
-    import shutil, requests
+    import shutil
 
     logger = pydoni.logger_setup(pydoni.what_is_my_name(), pydoni.modloglev)
     logger.logvars(locals())
@@ -269,18 +284,18 @@ def downloadfile(url, destfile=None, method='requests'):
     if method == 'requests':
         assert isinstance(destfile, str)
 
-        r = requests.get(url, stream=True)
+        r = _get(url, stream=True)
         with open(destfile, 'wb') as f:
             r.raw.decode_content = True
             shutil.copyfileobj(r.raw, f)
 
     elif method == 'curl':
         if isinstance(destfile, str):
-            cmd = 'curl -o "{}" "{}"'.format(destfile, url)
+            cmd = ['curl', '-o', destfile, url]
         else:
-            cmd = 'curl -O "{}"'.format(url)
+            cmd = ['curl', '-O', url]
 
-        pydoni.syscmd(cmd)
+        pydoni.sh.run(cmd)
 
 
 def download_audiobookslab(url, targetdir):
@@ -315,6 +330,7 @@ def download_audiobookslab(url, targetdir):
         raise Exception(error_msg)
 
 
+@pydoni.trace.traced()
 def simple_get(url):
     """
     Attempts to get the content at `url` by making an HTTP GET request.
@@ -327,14 +343,13 @@ def simple_get(url):
     :return: {resp.content}
     """
     import contextlib
-    import requests
     from requests.exceptions import RequestException
 
     logger = pydoni.logger_setup(pydoni.what_is_my_name(), pydoni.modloglev)
     logger.logvars(locals())
 
     try:
-        with contextlib.closing(requests.get(url, stream=True)) as resp:
+        with contextlib.closing(_get(url, stream=True)) as resp:
             if pydoni.web.is_good_response(resp):
                 return resp.content
             else:
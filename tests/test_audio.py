@@ -0,0 +1,59 @@
+"""
+Tests of `pydoni.audio`. EXIF metadata is given directly rather than extracted by `exiftool`.
+"""
+
+import pydoni
+import pydoni.audio
+import pydoni.sh
+import pytest
+
+
+@pytest.fixture
+def exif(monkeypatch):
+    """
+    Set the cleaned EXIF metadata `pydoni.sh.EXIF.extract()` returns for any file.
+    """
+    tags = {}
+
+    class EXIF(object):
+        def __init__(self, fpath):
+            self.fpath = fpath
+
+        def extract(self, **kwargs):
+            return {self.fpath: dict(tags)}
+
+    monkeypatch.setattr(pydoni.sh, 'EXIF', EXIF)
+    return tags
+
+
+def test_song_with_numeric_tags(exif, tmp_path):
+    pytest.importorskip('titlecase')
+
+    # `exiftool -json` outputs numeric-looking values as numbers
+    exif.update(title=1989, artist=311, album=25, genre=80, track=3, part_of_set=1)
+    fpath = tmp_path / '03 Song.mp3'
+    fpath.touch()
+
+    song = pydoni.audio.Song(str(fpath))
+
+    assert song.title == '1989'
+    assert song.artist == '311'
+    assert song.album == '25'
+    assert song.genre == '80'
+    assert song.track_idx == 3
+    assert song.disc_raw == '1'
+    assert song.disc_idx == 1
+
+
+def test_song_with_disc_of_set(exif, tmp_path):
+    pytest.importorskip('titlecase')
+
+    exif.update(title='Hound Dog', track='2/12', part_of_set='2/2')
+    fpath = tmp_path / 'Hound Dog.mp3'
+    fpath.touch()
+
+    song = pydoni.audio.Song(str(fpath))
+
+    assert song.title == 'Hound Dog'
+    assert song.track_idx == 2
+    assert song.disc_idx == '2'
@@ -0,0 +1,66 @@
+"""
+Tests of `pydoni.cache`.
+"""
+
+import pydoni.cache
+import pytest
+import sqlite3
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    pydoni.cache.enable(maxsize=1, store=path, store_maxsize=3)
+    pydoni.cache.clear()
+    yield path
+    pydoni.cache.clear()
+    pydoni.cache.enable()
+
+
+def stored(path):
+    with sqlite3.connect(path) as db:
+        return db.execute('select count(*) from cache').fetchone()[0]
+
+
+def test_store_evicts_least_recently_used(store):
+    calls = []
+
+    @pydoni.cache.cacheable()
+    def square(x):
+        calls.append(x)
+        return x * x
+
+    for x in [1, 2, 3]:
+        square(x)
+
+    # Found in the store, as the in-memory LRU holds only the last result, and marked as used
+    assert square(1) == 1
+    assert calls == [1, 2, 3]
+
+    square(4)
+    assert stored(store) == 3
+
+    # 2 was the least recently used
+    for x in [1, 3, 4, 2]:
+        square(x)
+    assert calls == [1, 2, 3, 4, 2]
+
+
+def test_store_without_used_column_is_migrated(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    with sqlite3.connect(path) as db:
+        db.execute('create table cache (key text primary key, value blob, created real)')
+        db.execute("insert into cache values ('key', x'00', 1.0)")
+
+    pydoni.cache.enable(store=path, store_maxsize=1)
+    try:
+        @pydoni.cache.cacheable()
+        def double(x):
+            return x * 2
+
+        assert double(2) == 4
+        assert stored(path) == 1
+
+    finally:
+        pydoni.cache.clear()
+        pydoni.cache.enable()
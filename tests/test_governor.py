@@ -0,0 +1,49 @@
+"""
+Tests of `pydoni.governor`, configured with a single token.
+"""
+
+import pydoni
+import pydoni.governor
+import pytest
+import threading
+
+
+@pytest.fixture
+def one_token():
+    pydoni.governor.configure(tokens=1)
+    yield
+    pydoni.governor.configure(tokens=None)
+
+
+def test_command_started_while_streaming_runs_under_held_token(one_token):
+    outputs = []
+
+    def stream_and_run():
+        for line in pydoni.syscmd_stream(['printf', 'a\\nb\\n'], encoding='utf-8'):
+            outputs.append((line.strip(), pydoni.syscmd(['echo', 'x'], encoding='utf-8').strip()))
+
+    thread = threading.Thread(target=stream_and_run, daemon=True)
+    thread.start()
+    thread.join(timeout=10)
+
+    assert not thread.is_alive(), 'Deadlocked waiting for the token held by the stream'
+    assert outputs == [('a', 'x'), ('b', 'x')]
+    assert pydoni.governor._used == 0
+    assert not pydoni.governor._holders
+
+
+def test_other_thread_waits_for_held_token(one_token):
+    lease = pydoni.governor.acquire(1)
+    acquired = threading.Event()
+
+    def acquire():
+        with pydoni.governor.acquire(1):
+            acquired.set()
+
+    thread = threading.Thread(target=acquire, daemon=True)
+    thread.start()
+
+    assert not acquired.wait(timeout=0.2)
+    lease.release()
+    assert acquired.wait(timeout=10)
+    thread.join(timeout=10)
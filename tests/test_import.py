@@ -0,0 +1,76 @@
+"""
+Import-time regression check of `import pydoni`, which loads submodules lazily on first
+attribute access (PEP 562). Runs `python -X importtime` in a fresh interpreter, and reports the
+slowest imports if a budget is exceeded.
+"""
+
+import os
+import subprocess
+import sys
+
+
+# Budgets in microseconds, the best of `RUNS` runs. pydoni's own modules take ~1 ms, most of
+# the cumulative time is the stdlib `logging` import
+SELF_BUDGET_US = 10000
+CUMULATIVE_BUDGET_US = 100000
+RUNS = 3
+
+# Modules `import pydoni` must not load
+HEAVY_MODULES = ('colorlog', 'numpy', 'pandas', 'requests', 'sqlalchemy', 'tqdm')
+
+
+def importtime(statement='import pydoni'):
+    """
+    Run a statement with `python -X importtime` in a fresh interpreter, without environment
+    variables that make pydoni load submodules on import.
+
+    :return: list of tuples of module name, self and cumulative import time in microseconds
+    :rtype: list
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = {k: v for k, v in os.environ.items() if not k.startswith('PYDONI_')}
+    env['PYTHONPATH'] = os.pathsep.join([root, env.get('PYTHONPATH', '')]).rstrip(os.pathsep)
+
+    res = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                         env=env, stderr=subprocess.PIPE, universal_newlines=True, check=True)
+
+    modules = []
+    for line in res.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+
+    return modules
+
+
+def report(modules, top=10):
+    """
+    Format the slowest imports by self time.
+    """
+    lines = ['{:>10} {:>12}  {}'.format('self [us]', 'cumul [us]', 'module')]
+    for name, self_us, cumulative_us in sorted(modules, key=lambda m: -m[1])[:top]:
+        lines.append('{:>10} {:>12}  {}'.format(self_us, cumulative_us, name))
+
+    return '\n'.join(lines)
+
+
+def test_import_pydoni_is_lazy():
+    modules = importtime()
+    names = [name for name, self_us, cumulative_us in modules]
+
+    assert 'pydoni' in names
+    assert [n for n in names if n.startswith('pydoni.')] == [], report(modules)
+    assert [n for n in names if n.split('.')[0] in HEAVY_MODULES] == [], report(modules)
+
+
+def test_import_pydoni_within_budget():
+    runs = [importtime() for _ in range(RUNS)]
+
+    self_us = min(sum(s for name, s, c in modules if name.split('.')[0] == 'pydoni')
+                  for modules in runs)
+    cumulative_us = min(c for modules in runs for name, s, c in modules if name == 'pydoni')
+
+    assert self_us <= SELF_BUDGET_US, report(runs[0])
+    assert cumulative_us <= CUMULATIVE_BUDGET_US, report(runs[0])
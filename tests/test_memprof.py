@@ -0,0 +1,35 @@
+"""
+Tests of `pydoni.memprof`.
+"""
+
+import pydoni.memprof
+import resource
+import sys
+
+
+def test_rss_reader_falls_back_to_getrusage(monkeypatch):
+    def no_proc():
+        raise OSError('No /proc')
+
+    monkeypatch.setattr(pydoni.memprof, '_statm_rss', no_proc)
+    monkeypatch.setitem(sys.modules, 'psutil', None)  # Import raises ImportError
+
+    rss = pydoni.memprof._find_rss_reader()()
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    assert rss == maxrss * (1 if sys.platform == 'darwin' else 1024)
+
+
+def test_profile_records_rss_peak(monkeypatch):
+    monkeypatch.setattr(pydoni.memprof, '_rss_reader', lambda: 100 * 1024 ** 2)
+
+    pydoni.memprof.enable()
+    try:
+        with pydoni.memprof.profile('operation'):
+            pass
+
+        assert pydoni.memprof.results()['operation']['rss_peak'] == 100 * 1024 ** 2
+
+    finally:
+        pydoni.memprof.disable()
+        pydoni.memprof.clear()
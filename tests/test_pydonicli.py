@@ -0,0 +1,43 @@
+"""
+Tests of the registration of script variables for the CLI's backend.
+"""
+
+import json
+import pydoni
+import pydoni.sink
+
+
+def test_register_result_keeps_metrics_out_of_it():
+    result = {'IMG_0001.jpg': 'renamed'}
+    pydoni.pydonicli_register({'result': result})
+
+    assert result == {'IMG_0001.jpg': 'renamed'}
+    assert pydoni.pydonicli_result is result
+    assert isinstance(pydoni.pydonicli_metrics, dict)
+
+
+def test_register_sink_result_flushes_it(tmp_path):
+    fpath = tmp_path / 'result.jsonl'
+    with pydoni.sink.JSONLSink(str(fpath)) as sink:
+        sink['IMG_0001.jpg'] = 'renamed'
+        pydoni.pydonicli_register({'result': sink})
+
+        assert pydoni.pydonicli_result is sink
+        assert pydoni.pydonicli_result_summary['items'] == 1
+        assert [json.loads(line)['key'] for line in fpath.read_text().splitlines()] == \
+            ['IMG_0001.jpg']
+
+
+def test_script_closes_sink_and_leaves_it_out_of_args(tmp_path):
+    import pydoni.scripts.photo
+
+    fpath = tmp_path / 'result.jsonl'
+    fpath.write_text(json.dumps({'key': 'IMG_0001.jpg', 'value': 'renamed'}) + '\n')
+    sink = pydoni.sink.JSONLSink(str(fpath), resume=True)
+
+    # Already recorded, so skipped without reading its metadata
+    pydoni.scripts.photo.rename_mediafile(str(tmp_path / 'IMG_0001.jpg'), sink=sink)
+
+    assert sink.closed
+    assert 'sink' not in pydoni.pydonicli_args
+    assert pydoni.pydonicli_result is sink
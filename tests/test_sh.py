@@ -0,0 +1,271 @@
+"""
+Tests of `pydoni.sh`. `exiftool` is replaced by a minimal stand-in implementing the
+`-stay_open` protocol, which never finishes a command on a file named 'hang.jpg', and fails to
+write files named 'corrupt*'.
+"""
+
+import asyncio
+import pydoni
+import pydoni.sh
+import pytest
+import sys
+import time
+
+
+FAKE_EXIFTOOL = """#!{python}
+import json, sys, time
+
+args = []
+for line in sys.stdin:
+    line = line.rstrip('\\n')
+    if line.startswith('-execute'):
+        files, marker, i = [], None, 0
+        while i < len(args):
+            if args[i] == '-echo4':
+                marker = args[i + 1]
+                i += 2
+                continue
+            if not args[i].startswith('-'):
+                files.append(args[i])
+            i += 1
+
+        if any(f.endswith('hang.jpg') for f in files):
+            time.sleep(3600)
+
+        if '-overwrite_original' in args:
+            failed = [f for f in files if f.rsplit('/', 1)[-1].startswith('corrupt')]
+            for f in failed:
+                sys.stderr.write('Error: Not a valid JPG (looks more like a MP3) - ' + f + '\\n')
+            sys.stdout.write('    %d image files updated\\n' % (len(files) - len(failed)))
+            if failed:
+                sys.stdout.write("    %d files weren't updated due to errors\\n" % len(failed))
+            sys.stdout.write(marker + '\\n')
+        else:
+            sys.stdout.write(json.dumps([{{'SourceFile': f}} for f in files]) + '\\n' + marker + '\\n')
+        sys.stderr.write(marker + '\\n')
+        sys.stdout.flush()
+        sys.stderr.flush()
+        args = []
+    elif line == 'False' and args[-1:] == ['-stay_open']:
+        break
+    else:
+        args.append(line)
+"""
+
+
+@pytest.fixture
+def exiftool(tmp_path, monkeypatch):
+    fpath = tmp_path / 'exiftool'
+    fpath.write_text(FAKE_EXIFTOOL.format(python=sys.executable))
+    fpath.chmod(0o755)
+    monkeypatch.setattr(pydoni.sh, 'find_binary', lambda *args, **kwargs: str(fpath))
+    return str(fpath)
+
+
+def test_cancel_pooled_async_extract_kills_session(exiftool, tmp_path):
+    hang = tmp_path / 'hang.jpg'
+    photo = tmp_path / 'photo.jpg'
+    hang.touch()
+    photo.touch()
+
+    pool = pydoni.sh.ExifToolPool(size=1, bin=exiftool)
+    session = pool.sessions[0]
+
+    async def main():
+        exif = pydoni.sh.AsyncEXIF(str(hang), pool=pool)
+        task = asyncio.ensure_future(exif.extract(clean=False, cache=False))
+
+        deadline = time.monotonic() + 10
+        while session.running is None:
+            assert time.monotonic() < deadline, 'Command never started'
+            await asyncio.sleep(0.01)
+
+        proc = session.proc
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(task, 10)
+
+        assert proc.poll() is not None
+        assert session.running is None
+
+        # The session restarts on its next command
+        exif = pydoni.sh.AsyncEXIF(str(photo), pool=pool)
+        exifd = await asyncio.wait_for(exif.extract(clean=False, cache=False), 10)
+        assert list(exifd) == [str(photo)]
+
+    try:
+        asyncio.run(main())
+    finally:
+        pool.close()
+
+
+def test_write_reports_failed_file_with_separator_in_name(exiftool, tmp_path):
+    good = tmp_path / 'Elvis - Hound Dog.jpg'
+    corrupt = tmp_path / 'corrupt - Hound Dog.jpg'
+    good.touch()
+    corrupt.touch()
+
+    pool = pydoni.sh.ExifToolPool(size=1, bin=exiftool)
+    try:
+        exif = pydoni.sh.EXIF([str(good), str(corrupt)], pool=pool)
+        assert exif.write('Title', 'Hound Dog') is False
+        assert exif.written == {str(good): True, str(corrupt): False}
+
+        exif = pydoni.sh.EXIF(str(good), pool=pool)
+        assert exif.remove('Title') is True
+        assert exif.written == {str(good): True}
+
+    finally:
+        pool.close()
+
+
+def test_find_binary_repeated_lookups_do_no_filesystem_work(tmp_path, monkeypatch):
+    import os
+
+    bin_dir = tmp_path / 'bin'
+    bin_dir.mkdir()
+    fpath = bin_dir / 'pydoni-test-tool'
+    fpath.write_text('#!/bin/sh\n')
+    fpath.chmod(0o755)
+
+    monkeypatch.setenv('PATH', str(bin_dir))
+    pydoni.sh.clear_binary_cache()
+    assert pydoni.sh.find_binary('pydoni-test-tool', bin_paths=[]) == str(fpath)
+
+    calls = []
+    for name in ['stat', 'lstat', 'listdir', 'scandir', 'access']:
+        def counted(*args, _name=name, _func=getattr(os, name), **kwargs):
+            calls.append(_name)
+            return _func(*args, **kwargs)
+
+        monkeypatch.setattr(os, name, counted)
+
+    for _ in range(3):
+        assert pydoni.sh.find_binary('pydoni-test-tool', bin_paths=[]) == str(fpath)
+    assert calls == []
+
+    # A change of $PATH discards the cached result
+    monkeypatch.setenv('PATH', os.pathsep.join([str(tmp_path), str(bin_dir)]))
+    assert pydoni.sh.find_binary('pydoni-test-tool', bin_paths=[]) == str(fpath)
+    assert calls != []
+
+
+def test_find_binary_forgets_binary_that_no_longer_exists(tmp_path, monkeypatch):
+    bin_dir = tmp_path / 'bin'
+    bin_dir.mkdir()
+    fpath = bin_dir / 'pydoni-test-tool'
+    fpath.write_text('#!/bin/sh\n')
+    fpath.chmod(0o755)
+
+    monkeypatch.setenv('PATH', str(bin_dir))
+    pydoni.sh.clear_binary_cache()
+    assert pydoni.sh.find_binary('pydoni-test-tool', bin_paths=[]) == str(fpath)
+
+    fpath.unlink()
+    assert pydoni.sh.find_binary('pydoni-test-tool', bin_paths=[]) == str(fpath)
+    with pytest.raises(FileNotFoundError):
+        pydoni.sh.run([str(fpath)])
+
+    assert pydoni.sh.find_binary('pydoni-test-tool', bin_paths=[]) is None
+
+
+def test_session_streams_stdout_in_chunks(exiftool, tmp_path):
+    files = []
+    for i in range(2000):
+        files.append(str(tmp_path / 'photo-{:04d}.jpg'.format(i)))
+
+    with pydoni.sh.ExifToolSession(bin=exiftool) as session:
+        whole = session.execute(['-json'] + files, encoding=None).stdout
+
+        chunks = []
+        res = session.execute(['-json'] + files, encoding=None, on_stdout=chunks.append)
+
+    assert res.stdout == b''
+    assert len(chunks) > 1
+    assert b''.join(chunks) == whole
+
+
+def test_pooled_extract_parses_streamed_output(exiftool, tmp_path):
+    files = []
+    for i in range(300):
+        fpath = tmp_path / 'photo - {:03d}.jpg'.format(i)
+        fpath.touch()
+        files.append(str(fpath))
+
+    pool = pydoni.sh.ExifToolPool(size=1, bin=exiftool)
+    try:
+        exifd = pydoni.sh.EXIF(files, pool=pool).extract(clean=False, cache=False)
+        assert list(exifd) == files
+        assert [d['about'] for d in exifd.values()] == files
+
+    finally:
+        pool.close()
+
+
+@pytest.mark.parametrize('arg, safe', [
+    ('/photos/IMG_0001.jpg', True),
+    ('-Title=Hound Dog', True),
+    ('-Title=', True),
+    ('-Title= foo', False),
+    ('-Title=foo ', False),
+    ('-Title =foo', False),
+    ('-Title=#1', False),
+    ('#1.jpg', False),
+    (' foo.jpg', False),
+    ('', False),
+    ('-Title=two\nlines', False),
+    ('-Title=carriage\r', False),
+])
+def test_argfile_safe(arg, safe):
+    assert pydoni.sh._argfile_safe(arg) is safe
+
+
+def test_write_runs_values_an_argfile_would_change_on_the_command_line(exiftool, tmp_path,
+                                                                      monkeypatch):
+    photo = tmp_path / 'photo.jpg'
+    photo.touch()
+
+    commands = []
+
+    def run(argv, **kwargs):
+        import subprocess
+        commands.append(argv)
+        stdout, stderr = '    1 image files updated\n', ''
+        if not kwargs.get('encoding'):
+            stdout, stderr = stdout.encode(), stderr.encode()
+
+        return subprocess.CompletedProcess(argv, 0, stdout, stderr)
+
+    monkeypatch.setattr(pydoni.sh, 'run', run)
+
+    pool = pydoni.sh.ExifToolPool(size=1, bin=exiftool)
+    try:
+        exif = pydoni.sh.EXIF(str(photo), pool=pool)
+        assert exif.write('Title', 'Hound Dog') is True
+        assert commands == []
+
+        assert exif.write('Title', ' Hound Dog') is True
+        assert commands == [[exiftool, '-overwrite_original', '-Title= Hound Dog', str(photo)]]
+
+    finally:
+        pool.close()
+
+
+def test_git_commands_go_through_run(monkeypatch):
+    import subprocess
+
+    argvs = []
+
+    def fake_run(argv, **kwargs):
+        argvs.append(argv)
+        return subprocess.CompletedProcess(argv, 0, 'done\n', None)
+
+    monkeypatch.setattr(pydoni.sh, 'run', fake_run)
+    git = pydoni.sh.Git()
+    git.commit('Fix "quoted" $msg')
+    git.push()
+    git.pull()
+
+    assert argvs == [['git', 'commit', '-m', 'Fix "quoted" $msg'],
+                     ['git', 'push'],
+                     ['git', 'pull']]
@@ -0,0 +1,45 @@
+"""
+Tests of the command runners of `pydoni`.
+"""
+
+import pydoni
+
+
+VM_STAT = """Mach Virtual Memory Statistics: (page size of 16384 bytes)
+Pages free:                               12345.
+Pages active:                            456789.
+Pages inactive:                          234567.
+Pages speculative:                         3456.
+Pages throttled:                              0.
+Pages wired down:                        123456.
+Pages purgeable:                            777.
+"""
+
+
+def test_parse_vm_stat():
+    assert pydoni._parse_vm_stat(VM_STAT) == (12345 + 234567 + 3456) * 16384
+    assert pydoni._parse_vm_stat('vm_stat: command not found') is None
+
+
+def test_memory_below_warns_once_if_unknown(monkeypatch):
+    warnings = []
+    warn = pydoni._warn_memory_unknown
+
+    def counted():
+        warnings.append(1)
+        warn()
+
+    monkeypatch.setattr(pydoni, '_available_memory', lambda: None)
+    monkeypatch.setattr(pydoni, '_memory_unknown_warned', False)
+    monkeypatch.setattr(pydoni, '_warn_memory_unknown', counted)
+
+    assert [pydoni._memory_below(1024 ** 3) for _ in range(3)] == [False] * 3
+    assert warnings == [1]
+
+
+def test_memory_below(monkeypatch):
+    monkeypatch.setattr(pydoni, '_available_memory', lambda: 512 * 1024 ** 2)
+
+    assert pydoni._memory_below(1024 ** 3)
+    assert not pydoni._memory_below(256 * 1024 ** 2)
+    assert not pydoni._memory_below(None)